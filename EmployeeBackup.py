@@ -0,0 +1,266 @@
+"""Backup dan restore online data_pegawai.db lewat SQLite backup API.
+
+Backup menyalin BACKUP_PAGES halaman per langkah dari koneksi sendiri, sehingga
+bisa berjalan di thread latar belakang tanpa membekukan UI; pada mode WAL
+penulis lain tetap bisa menulis selama backup berjalan. File backup ditulis ke
+berkas sementara dan baru dipindahkan ke nama akhirnya setelah lolos
+PRAGMA quick_check. Restore hanya menerima backup yang lolos integrity_check
+dan selalu menyimpan salinan database saat ini lebih dulu.
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from EmployeeRepository import DB_FILE, EmployeeRepository
+
+# Halaman yang disalin per langkah (4 MiB untuk page size 4096) dan jeda antar langkah
+BACKUP_PAGES = 1024
+BACKUP_STEP_SLEEP = 0.005
+
+# Folder backup (relatif terhadap folder database) dan jumlah backup yang disimpan
+BACKUP_DIR = 'backups'
+DEFAULT_KEEP = 10
+TIMESTAMP_FORMAT = '%Y%m%d-%H%M%S'
+
+class BackupError(Exception):
+    """File backup tidak valid atau backup/restore gagal diverifikasi"""
+
+class _Cancelled(Exception):
+    pass
+
+class BackupResult:
+    """Ringkasan hasil backup/restore"""
+    def __init__(self, path):
+        self.path = path
+        self.pages = 0
+        self.total_pages = 0
+        self.rows = None
+        self.elapsed_ms = 0.0
+        self.cancelled = False
+        # File backup lama yang dihapus oleh rotasi
+        self.removed = []
+        # Salinan database sebelum restore (hanya untuk restore)
+        self.safety_copy = None
+
+def backup_dir(db_path):
+    """Folder backup default untuk database db_path"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), BACKUP_DIR)
+
+def backup_path(db_path, directory=None, label=None, now=None):
+    """Nama file backup baru: <nama-db>-<YYYYmmdd-HHMMSS>[-label].db, tidak menimpa file lain"""
+    directory = directory or backup_dir(db_path)
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    name = f"{stem}-{(now or datetime.now()).strftime(TIMESTAMP_FORMAT)}"
+    if label:
+        name += f'-{label}'
+    path = os.path.join(directory, f'{name}.db')
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f'{name}-{counter}.db')
+        counter += 1
+    return path
+
+def _backup_name_pattern(db_path, labeled=False):
+    """Nama file buatan backup_path(): <nama-db>-<YYYYmmdd-HHMMSS>[-label][-N].db"""
+    stem = re.escape(os.path.splitext(os.path.basename(db_path))[0])
+    label = r'(-[a-z]+(-[a-z]+)*)?' if labeled else ''
+    return re.compile(rf'^{stem}-(?P<ts>\d{{8}}-\d{{6}}){label}(-(?P<n>\d+))?\.db$')
+
+def list_backups(db_path, directory=None, labeled=False):
+    """File backup milik db_path, terbaru dulu (urut timestamp lalu nomor urut di nama file).
+
+    Tanpa labeled hanya backup biasa yang diikutkan; salinan berlabel
+    (mis. 'sebelum-restore') tidak ikut dirotasi.
+    """
+    directory = directory or backup_dir(db_path)
+    pattern = _backup_name_pattern(db_path, labeled)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            found.append(((match['ts'], int(match['n'] or 0)), name))
+    return [os.path.join(directory, name) for _, name in sorted(found, reverse=True)]
+
+def rotate_backups(db_path, keep=DEFAULT_KEEP, directory=None):
+    """Hapus backup terlama sehingga tersisa keep file; kembalikan path yang dihapus"""
+    removed = []
+    for path in list_backups(db_path, directory)[max(keep, 1):]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # Dihapus proses lain / sedang dipakai: coba lagi di rotasi berikutnya
+        removed.append(path)
+    return removed
+
+def verify_backup(path, full=False):
+    """Periksa file backup (quick_check, atau integrity_check jika full); kembalikan jumlah pegawai"""
+    if not os.path.isfile(path):
+        raise BackupError(f"File backup tidak ditemukan: {path}")
+    try:
+        conn = sqlite3.connect(path)
+    except sqlite3.Error as e:
+        raise BackupError(f"File backup tidak bisa dibuka: {e}")
+    try:
+        check = conn.execute('PRAGMA integrity_check' if full else 'PRAGMA quick_check').fetchone()[0]
+        if check != 'ok':
+            raise BackupError(f"File backup rusak: {check}")
+        return conn.execute('SELECT COUNT(*) FROM pegawai').fetchone()[0]
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"Bukan backup data pegawai yang valid: {e}")
+    finally:
+        conn.close()
+
+def _copy(source, target, result, pages, progress, cancel):
+    """Salin source ke target per langkah pages halaman; False jika dibatalkan lewat cancel"""
+    def on_step(status, remaining, total):
+        result.total_pages = total
+        result.pages = total - remaining
+        if progress is not None:
+            progress(result, result.pages / total if total else 1.0)
+        if cancel is not None and cancel.is_set():
+            raise _Cancelled()
+
+    try:
+        source.backup(target, pages=pages, progress=on_step, sleep=BACKUP_STEP_SLEEP)
+    except _Cancelled:
+        return False
+    return True
+
+def backup_database(db_path=DB_FILE, path=None, pages=BACKUP_PAGES, progress=None, cancel=None,
+                    busy_timeout_ms=5000):
+    """Backup online db_path ke path (default: file baru di backup_dir).
+
+    progress(result, fraksi) dipanggil setiap langkah; cancel (threading.Event)
+    menghentikan backup tanpa meninggalkan file setengah jadi. File yang sudah
+    jadi diverifikasi dengan quick_check; jika gagal, BackupError dan file dibuang.
+    """
+    path = path or backup_path(db_path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f'{path}.part'
+    result = BackupResult(path)
+    start = time.perf_counter()
+
+    try:
+        source = sqlite3.connect(db_path, timeout=busy_timeout_ms / 1000)
+        target = sqlite3.connect(temp_path)
+        try:
+            result.cancelled = not _copy(source, target, result, pages, progress, cancel)
+            if not result.cancelled:
+                # Backup satu file utuh (tanpa -wal/-shm), meski sumbernya WAL
+                target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+            source.close()
+        if not result.cancelled:
+            result.rows = verify_backup(temp_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if result.cancelled:
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, path)
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+def restore_database(path, db_path=DB_FILE, pages=BACKUP_PAGES, progress=None, safety_copy=True,
+                     busy_timeout_ms=5000, journal_mode='WAL'):
+    """Timpa db_path dengan isi backup path lewat backup API (koneksi lain tetap valid).
+
+    Backup diperiksa penuh (integrity_check) sebelum apa pun ditimpa; dengan
+    safety_copy, database saat ini dibackup dulu (label 'sebelum-restore').
+    Skema hasil restore dimigrasikan ke versi terbaru.
+    """
+    expected_rows = verify_backup(path, full=True)
+    result = BackupResult(path)
+    start = time.perf_counter()
+    if safety_copy and os.path.exists(db_path):
+        result.safety_copy = backup_database(
+            db_path, backup_path(db_path, label='sebelum-restore'), busy_timeout_ms=busy_timeout_ms).path
+
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(db_path, timeout=busy_timeout_ms / 1000)
+    try:
+        _copy(source, target, result, pages, progress, None)
+    finally:
+        target.close()
+        source.close()
+
+    repo = EmployeeRepository(db_path, busy_timeout_ms=busy_timeout_ms, journal_mode=journal_mode)
+    try:
+        repo.init_schema()
+        result.rows = repo.count_rows()
+    finally:
+        repo.close()
+    if result.rows != expected_rows:
+        raise BackupError(f"Restore tidak lengkap: {result.rows} dari {expected_rows} pegawai")
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backup / restore online database pegawai")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('backup', help="buat backup baru lalu rotasi backup lama")
+    p.add_argument('file', nargs='?', help="file tujuan (default: folder backups/ di samping database)")
+    p.add_argument('--keep', type=int, default=DEFAULT_KEEP,
+                   help="jumlah backup yang disimpan di folder default (default: %(default)s)")
+    p.add_argument('--pages', type=int, default=BACKUP_PAGES,
+                   help="halaman per langkah backup (default: %(default)s)")
+
+    commands.add_parser('list', help="daftar backup (termasuk salinan sebelum restore), terbaru dulu")
+
+    p = commands.add_parser('verify', help="periksa integritas file backup")
+    p.add_argument('file')
+
+    p = commands.add_parser('restore', help="timpa database dengan isi file backup")
+    p.add_argument('file')
+    p.add_argument('--no-safety-copy', action='store_true',
+                   help="jangan backup database saat ini sebelum restore")
+    args = parser.parse_args(argv)
+
+    def report(result, fraction):
+        sys.stderr.write(f"\r💾 {result.pages}/{result.total_pages} halaman ({fraction:.0%})")
+        sys.stderr.flush()
+
+    try:
+        if args.command == 'list':
+            for path in list_backups(args.db, labeled=True):
+                print(path)
+            return 0
+        if args.command == 'verify':
+            print(f"✅ Backup valid: {verify_backup(args.file, full=True)} pegawai")
+            return 0
+        if args.command == 'restore':
+            result = restore_database(args.file, args.db, progress=report,
+                                      safety_copy=not args.no_safety_copy)
+            sys.stderr.write('\n')
+            if result.safety_copy:
+                print(f"💾 Database sebelumnya disimpan di {result.safety_copy}")
+            print(f"✅ {result.rows} pegawai dipulihkan dari {result.path}")
+            return 0
+        result = backup_database(args.db, args.file, args.pages, progress=report)
+        if args.file is None:
+            result.removed = rotate_backups(args.db, args.keep)
+    except (OSError, sqlite3.Error, BackupError) as e:
+        sys.stderr.write(f"\n❌ {args.command.capitalize()} gagal: {e}\n")
+        return 1
+
+    sys.stderr.write('\n')
+    print(f"✅ {result.rows} pegawai dibackup ke {result.path} ({result.elapsed_ms:.0f} ms)")
+    for path in result.removed:
+        print(f"🗑️ backup lama dihapus: {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
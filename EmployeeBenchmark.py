@@ -0,0 +1,423 @@
+"""Benchmark jalur panas aplikasi pegawai di atas dataset sintetis yang deterministik.
+
+    python EmployeeBenchmark.py --sizes 1000,100000 --output bench.json
+    python EmployeeBenchmark.py --baseline bench.json   # exit 1 jika ada regresi
+    xvfb-run python EmployeeBenchmark.py --sizes 100000 --startup-budget 1500
+    python EmployeeBenchmark.py --sizes 100000 --no-gui --api-requests 5000 --api-concurrency 32
+
+Benchmark GUI (Treeview) hanya jalan jika ada display, mis. lewat xvfb-run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from EmployeeMetrics import percentile
+from EmployeeRepository import COLUMNS, EmployeeRepository, SQL_CREATE_TABLE, SQL_INSERT
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (1000, 100000, 1000000)
+DEFAULT_SEED = 2024
+DATA_DIR = 'bench_data'
+# Load test API HTTP lokal: jumlah request baca dan klien keep-alive paralel
+DEFAULT_API_REQUESTS = 2000
+DEFAULT_API_CONCURRENCY = 16
+
+# Anggaran cold start GUI (proses baru sampai data awal tampil), dicek dengan --startup-budget
+DEFAULT_STARTUP_BUDGET_MS = 2000
+
+# Pembanding: jendela tabel lewat LIMIT/OFFSET seperti sebelum keyset pager (biaya naik dengan offset)
+SQL_OFFSET_WINDOW = f'SELECT {COLUMNS} FROM pegawai ORDER BY id LIMIT ? OFFSET ?'
+
+FIRST_NAMES = ['Agus', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hadi', 'Indah', 'Joko',
+               'Kartika', 'Lestari', 'Made', 'Nur', 'Oka', 'Putri', 'Rizky', 'Sari', 'Teguh',
+               'Utami', 'Wahyu', 'Yogi', 'Zahra', 'Andi', 'Bayu', 'Dian', 'Ayu', 'Rina']
+LAST_NAMES = ['Saputra', 'Wijaya', 'Siregar', 'Nasution', 'Hidayat', 'Lubis', 'Pratama',
+              'Santoso', 'Kusuma', 'Harahap', 'Simanjuntak', 'Setiawan', 'Gunawan', 'Susanto',
+              'Hakim', 'Purnomo', 'Rahmawati', 'Wibowo', 'Sihombing', 'Permana']
+CITIES = ['Jambi', 'Yogyakarta', 'Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Makassar',
+          'Semarang', 'Palembang', 'Denpasar', 'Padang', 'Pontianak', 'Manado', 'Malang']
+STREETS = ['Sudirman', 'Thamrin', 'Diponegoro', 'Gatot Subroto', 'Ahmad Yani', 'Merdeka',
+           'Pahlawan', 'Veteran', 'Gajah Mada', 'Hayam Wuruk']
+POSITIONS = ['Staf Administrasi', 'Staf Keuangan', 'Akuntan', 'Kepala Bagian', 'Manajer',
+             'Programmer', 'Analis Sistem', 'Sekretaris', 'Kasir', 'Auditor', 'Dosen',
+             'Kaprodi', 'Teknisi', 'Satpam', 'Resepsionis', 'Marketing', 'HRD', 'Direktur']
+
+def synthetic_rows(count, seed=DEFAULT_SEED):
+    """Baris pegawai sintetis yang selalu sama untuk seed yang sama (nama dijamin unik)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        nama = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i + 1}"
+        alamat = f"Jl. {rng.choice(STREETS)} No. {rng.randint(1, 300)}, {rng.choice(CITIES)}"
+        yield nama, alamat, rng.choice(POSITIONS), rng.randint(1990, 2024)
+
+def generate_database(path, count, seed=DEFAULT_SEED, batch_size=50000):
+    """Buat data_pegawai.db sintetis; indeks FTS dan NOCASE dibangun sekali lewat migrasi"""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute(SQL_CREATE_TABLE)
+    rows = synthetic_rows(count, seed)
+    while True:
+        batch = [row for _, row in zip(range(batch_size), rows)]
+        if not batch:
+            break
+        with conn:
+            conn.executemany(SQL_INSERT, batch)
+    conn.close()
+
+    repo = EmployeeRepository(path)
+    repo.init_schema()
+    repo.close()
+
+def dataset_path(count, seed=DEFAULT_SEED, data_dir=DATA_DIR):
+    """Lokasi dataset untuk ukuran tertentu; dibuat jika belum ada"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'pegawai_{count}_s{seed}.db')
+    if not os.path.exists(path):
+        generate_database(path, count, seed)
+    return path
+
+def measure(fn, repeat):
+    """Jalankan fn beberapa kali dan kembalikan statistik waktu (ms)"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'runs': repeat,
+        'min_ms': round(samples[0], 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'max_ms': round(samples[-1], 3),
+    }
+
+def bench_storage(path, count, repeat):
+    """Operasi penyimpanan yang dipakai load_data, search_employee dan CRUD"""
+    results = {}
+    results['open_repository'] = measure(lambda: EmployeeRepository(path).close(), repeat)
+
+    repo = EmployeeRepository(path)
+    repo.init_schema()
+    window = 112  # tinggi Treeview + overscan VirtualTable
+
+    def collect(term):
+        return sum(len(batch) for batch in repo.iter_search_ids(term))
+
+    def offset_window(offset):
+        return repo.conn.execute(SQL_OFFSET_WINDOW, (window, offset)).fetchall()
+
+    results['count_all'] = measure(repo.count_rows, repeat)
+    results['offset_window_first'] = measure(lambda: offset_window(0), repeat)
+    results['offset_window_middle'] = measure(lambda: offset_window(count // 2), repeat)
+    results['keyset_page_first'] = measure(lambda: repo.list_page(0, window), repeat)
+    results['keyset_page_middle'] = measure(lambda: repo.list_page(count // 2, window), repeat)
+    results['pager_first'] = measure(lambda: repo.pager(), repeat)
+    results['pager_last'] = measure(lambda: repo.pager().last(), repeat)
+    results['stats_dashboard'] = measure(lambda: (repo.stats_by_posisi(), repo.stats_by_tahun()), repeat)
+    results['get_by_id'] = measure(lambda: repo.get(count // 2), repeat)
+    results['search_common'] = measure(lambda: collect('Jakarta'), repeat)
+    results['search_rare'] = measure(lambda: collect(f'Saputra {count // 3}'), repeat)
+    results['search_short_like'] = measure(lambda: collect('ag'), repeat)
+    results['search_fuzzy'] = measure(lambda: repo.fuzzy_search('Bdui Santso'), repeat)
+    # Autocomplete: bangun indeks prefiks sekali dari database, lalu saran per ketikan dari memori
+    results['autocomplete_build'] = measure(
+        lambda: (repo.reset_value_indexes(), repo.value_index('alamat'), repo.value_index('posisi')), repeat)
+    results['autocomplete_suggest'] = measure(
+        lambda: (repo.suggest('alamat', 'Jl. A'), repo.suggest('posisi', 'S')), repeat)
+
+    # add_employee: insert satu baris unik lalu hapus lagi supaya dataset tetap sama
+    counter = iter(range(10 ** 9))
+    added = []
+    results['add_employee'] = measure(
+        lambda: added.append(repo.add(f'Benchmark Pegawai {next(counter)}', 'Jambi', 'Staf', 2020)),
+        repeat)
+    for employee_id in added:
+        repo.delete(employee_id)
+    repo.close()
+    return results
+
+def bench_startup(path, repeat, gui=True):
+    """Waktu start proses: CLI headless, import modul GUI dan cold start GUI sampai data tampil"""
+    def run(code_or_args):
+        subprocess.run([sys.executable] + code_or_args, cwd=PACKAGE_DIR, check=True,
+                       stdout=subprocess.DEVNULL)
+    path = os.path.abspath(path)
+    results = {
+        'cli_count': measure(lambda: run(['EmployeeCLI.py', '--db', path, 'count']), repeat),
+        'gui_module_import': measure(lambda: run(['-c', 'import ManagementTools']), repeat),
+    }
+    if gui:
+        results.update(bench_gui_cold_start(path, repeat))
+    return results
+
+def bench_gui_cold_start(path, repeat):
+    """Jalankan GUI di proses baru dengan --profile-startup; butuh display seperti bench_gui"""
+    args = [sys.executable, 'ManagementTools.py', '--db', path, '--profile-startup']
+    profiles = []
+
+    def run():
+        done = subprocess.run(args, cwd=PACKAGE_DIR, capture_output=True, text=True)
+        if done.returncode != 0:
+            raise RuntimeError(done.stderr.strip().splitlines()[-1] if done.stderr else 'gagal')
+        profiles.append(json.loads(done.stdout)['marks_ms'])
+
+    try:
+        stats = measure(run, repeat)
+    except RuntimeError as e:
+        return {'gui_cold_start': {'skipped': f'tidak ada display: {e}'}}
+    # Median setiap tanda startup di dalam proses (sejak EmployeeManagement dibuat)
+    marks = {name: round(statistics.median(profile[name] for profile in profiles), 3)
+             for name in profiles[0]}
+    return {'gui_cold_start': stats, 'gui_startup_marks_ms': marks}
+
+def bench_gui(path, count, repeat):
+    """Jalur refresh Treeview; butuh display (mis. xvfb-run), jika tidak ada dilewati"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        return {'skipped': f'tidak ada display: {e}'}
+
+    from ManagementTools import PAGE_SIZE, EmployeeManagement
+    results = {}
+    start = time.perf_counter()
+    app = EmployeeManagement(root, path)
+    # Data awal dimuat setelah jendela tampil: tunggu sampai startup selesai
+    while not app.ready:
+        root.update()
+    results['startup_ready_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    results['startup_first_paint_ms'] = app.startup.marks['first_paint']
+
+    def refresh():
+        app.load_data()
+        root.update_idletasks()
+
+    ids = [i for batch in app.repo.iter_search_ids('Jakarta') for i in batch]
+
+    def render_search():
+        app.table.set_source(app.repo.search_source('Jakarta', ids))
+        root.update_idletasks()
+
+    rng = random.Random(DEFAULT_SEED)
+    pages = max(1, -(-count // PAGE_SIZE))
+
+    def jump_page():
+        # Lompat ke halaman acak lewat pager (data lengkap tampil per halaman, bukan satu daftar panjang)
+        app.show_page(app.pager.jump, rng.randint(1, pages))
+        root.update_idletasks()
+
+    def scroll_search():
+        # Scroll acak di seluruh hasil pencarian yang sedang tampil
+        app.table.scroll_to(rng.randrange(max(1, len(ids))))
+        root.update_idletasks()
+
+    def search_end_to_end():
+        app.search_var.set(f'Saputra {count // 3}')
+        app.start_search()
+        while app._search_poll_id is not None:
+            root.update()
+            time.sleep(0.001)
+
+    results['load_data'] = measure(refresh, repeat)
+    results['page_jump_random'] = measure(jump_page, repeat)
+    results['render_search_results'] = measure(render_search, repeat)
+    results['scroll_search_random'] = measure(scroll_search, repeat)
+    results['search_end_to_end'] = measure(search_end_to_end, repeat)
+
+    app.close()
+    root.destroy()
+    return results
+
+async def _http_load(host, port, requests, concurrency):
+    """Kirim requests [(method, target, body)] lewat concurrency koneksi keep-alive.
+
+    Kembalikan (statistik latensi/throughput, daftar (status, body) sesuai urutan request).
+    """
+    latencies = []
+    responses = [None] * len(requests)
+    pending = iter(enumerate(requests))
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for index, (method, target, body) in pending:
+                payload = (body or '').encode('utf-8')
+                start = time.perf_counter()
+                writer.write(f'{method} {target} HTTP/1.1\r\nHost: {host}\r\n'
+                             f'Content-Length: {len(payload)}\r\n\r\n'.encode('latin-1') + payload)
+                status = int((await reader.readline()).split()[1])
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                data = await reader.readexactly(length) if length else b''
+                latencies.append((time.perf_counter() - start) * 1000)
+                responses[index] = (status, json.loads(data) if data else None)
+                if status >= 500:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = {
+        'requests': len(requests),
+        'concurrency': concurrency,
+        'throughput_rps': round(len(requests) / elapsed, 1),
+        'median_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(max(latencies), 3),
+        'errors': errors,
+    }
+    return stats, responses
+
+def bench_api(path, count, requests=DEFAULT_API_REQUESTS, concurrency=DEFAULT_API_CONCURRENCY,
+              seed=DEFAULT_SEED):
+    """Load test EmployeeServer di localhost: campuran baca, lalu tulis lewat antrean penulis.
+
+    Server dan klien berbagi satu event loop, jadi angka ini batas bawah throughput
+    (klien ikut memakai CPU yang sama). Baris yang ditambahkan dihapus lagi di akhir.
+    """
+    from EmployeeServer import EmployeeServer
+
+    rng = random.Random(seed)
+    reads = []
+    for _ in range(requests):
+        choice = rng.random()
+        if choice < 0.6:
+            reads.append(('GET', f'/pegawai/{rng.randint(1, count)}', None))
+        elif choice < 0.85:
+            reads.append(('GET', f'/pegawai?after={rng.randint(0, count)}&limit=50', None))
+        else:
+            reads.append(('GET', f'/pegawai/search?q={rng.choice(CITIES)}&limit=50', None))
+    writes = [('POST', '/pegawai', json.dumps({'nama': f'Benchmark API {i}', 'alamat': 'Jambi',
+                                               'posisi': 'Staf', 'tahun_masuk': 2020}))
+              for i in range(max(1, requests // 10))]
+
+    async def run():
+        server = EmployeeServer(path)
+        host, port = await server.start('127.0.0.1', 0)
+        try:
+            results = {}
+            results['api_read_mix'], _ = await _http_load(host, port, reads, concurrency)
+            results['api_create'], created = await _http_load(host, port, writes, concurrency)
+            ids = [body['id'] for status, body in created if status == 201]
+            deletes = [('DELETE', '/pegawai/batch',
+                        json.dumps({'versions': {str(row_id): 1 for row_id in ids[start:start + 500]}}))
+                       for start in range(0, len(ids), 500)]
+            await _http_load(host, port, deletes, 1)
+            return results
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+def run_benchmarks(sizes, repeat, seed, data_dir, gui=True, api_requests=DEFAULT_API_REQUESTS,
+                   api_concurrency=DEFAULT_API_CONCURRENCY):
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'seed': seed,
+        'repeat': repeat,
+        'sizes': {},
+    }
+    for count in sizes:
+        path = dataset_path(count, seed, data_dir)
+        entry = {'storage': bench_storage(path, count, repeat),
+                 'startup': bench_startup(path, min(repeat, 3), gui)}
+        if api_requests:
+            entry['api'] = bench_api(path, count, api_requests, api_concurrency, seed)
+        if gui:
+            entry['gui'] = bench_gui(path, count, repeat)
+        report['sizes'][str(count)] = entry
+    return report
+
+def find_regressions(report, baseline, tolerance, floor_ms=1.0):
+    """Bandingkan median dengan baseline; regresi = lebih lambat dari tolerance x baseline"""
+    regressions = []
+    for size, groups in report['sizes'].items():
+        for group, operations in groups.items():
+            old_group = baseline.get('sizes', {}).get(size, {}).get(group, {})
+            for name, stats in operations.items():
+                old = old_group.get(name)
+                if not isinstance(stats, dict) or not isinstance(old, dict):
+                    continue
+                now_ms, old_ms = stats['median_ms'], old['median_ms']
+                if now_ms > floor_ms and now_ms > old_ms * tolerance:
+                    regressions.append(f"{size}/{group}/{name}: {old_ms} ms -> {now_ms} ms")
+    return regressions
+
+def check_startup_budget(report, budget_ms):
+    """Cold start GUI yang melewati anggaran (median, per ukuran dataset)"""
+    failures = []
+    for size, groups in report['sizes'].items():
+        stats = groups.get('startup', {}).get('gui_cold_start', {})
+        if 'median_ms' in stats and stats['median_ms'] > budget_ms:
+            failures.append(f"{size}/startup/gui_cold_start: {stats['median_ms']} ms > {budget_ms} ms")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data pegawai (hasil dalam JSON)")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="ukuran dataset dipisah koma (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--data-dir', default=DATA_DIR, help="folder cache dataset sintetis")
+    parser.add_argument('--no-gui', action='store_true', help="lewati benchmark Treeview")
+    parser.add_argument('--output', help="tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument('--baseline', help="hasil JSON sebelumnya untuk deteksi regresi")
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help="rasio median yang dianggap regresi (default: %(default)s)")
+    parser.add_argument('--startup-budget', type=float, nargs='?', const=DEFAULT_STARTUP_BUDGET_MS,
+                        metavar='MS', help="exit 1 jika cold start GUI melewati anggaran ini "
+                                           "(tanpa nilai: %(const)s ms)")
+    parser.add_argument('--api-requests', type=int, default=DEFAULT_API_REQUESTS,
+                        help="jumlah request load test API lokal, 0 = lewati (default: %(default)s)")
+    parser.add_argument('--api-concurrency', type=int, default=DEFAULT_API_CONCURRENCY,
+                        help="klien keep-alive paralel untuk load test API (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    report = run_benchmarks(sizes, args.repeat, args.seed, args.data_dir, gui=not args.no_gui,
+                            api_requests=args.api_requests, api_concurrency=args.api_concurrency)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures += [f"REGRESI {line}" for line in
+                         find_regressions(report, json.load(f), args.tolerance)]
+    if args.startup_budget is not None:
+        failures += [f"ANGGARAN {line}" for line in check_startup_budget(report, args.startup_budget)]
+    for line in failures:
+        print(line, file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
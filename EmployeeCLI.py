@@ -0,0 +1,238 @@
+"""Mode headless untuk data pegawai: query dan ubah data tanpa membuka jendela Tk.
+
+Contoh:
+    python -m EmployeeCLI list --limit 20
+    python -m EmployeeCLI search yogya
+    python -m EmployeeCLI add --nama "Aldi" --alamat Jambi --posisi Staf --tahun 2021
+    python -m EmployeeCLI backup --keep 7
+    python -m EmployeeCLI serve --port 8765
+
+Modul ini sengaja tidak mengimpor tkinter (juga tidak secara tidak langsung),
+sehingga bisa dipakai dari script/cron tanpa display dan start jauh lebih cepat.
+"""
+import argparse
+import itertools
+import sqlite3
+import sys
+from EmployeeRepository import (DB_FILE, JOURNAL_MODES, EmployeeRepository, ConflictError,
+                                DuplicateNamesError, ValidationError, SORT_COLLATIONS, validate_employee)
+
+def _print_rows(rows, as_json=False):
+    if as_json:
+        import json
+        for row in rows:
+            print(json.dumps(row._asdict(), ensure_ascii=False))
+        return
+    for row in rows:
+        print('\t'.join(str(value) for value in row))
+
+def cmd_list(repo, args):
+    rows = repo.list_page(args.after, args.limit)
+    _print_rows(rows, args.json)
+    return 0
+
+def cmd_search(repo, args):
+    if args.fuzzy:
+        # Urut kemiripan nama; skor dicetak di kolom terakhir
+        matches = repo.fuzzy_search(args.term, args.limit)
+        rows = {row.id: row for row in repo.get_many([row_id for row_id, _ in matches])} if matches else {}
+        if args.json:
+            import json
+            for row_id, score in matches:
+                print(json.dumps(dict(rows[row_id]._asdict(), skor=round(score, 3)), ensure_ascii=False))
+            return 0
+        for row_id, score in matches:
+            print('\t'.join(str(value) for value in rows[row_id]) + f'\t{score:.2f}')
+        return 0
+    sort = (args.sort, args.desc) if args.sort else None
+    rows = itertools.islice(itertools.chain.from_iterable(
+        repo.iter_rows(args.term, batch_size=min(args.limit, 5000), sort=sort)), args.limit)
+    _print_rows(rows, args.json)
+    return 0
+
+def cmd_count(repo, args):
+    print(repo.count_rows(args.term))
+    return 0
+
+def cmd_stats(repo, args):
+    groups = repo.stats_by_tahun() if args.by == 'tahun' else repo.stats_by_posisi()
+    if args.json:
+        import json
+        key = 'tahun_masuk' if args.by == 'tahun' else 'posisi'
+        for group, count in groups:
+            print(json.dumps({key: group, 'jumlah': count}, ensure_ascii=False))
+        return 0
+    for group, count in groups:
+        print(f"{group}\t{count}")
+    return 0
+
+def cmd_get(repo, args):
+    employee = repo.get(args.id)
+    if employee is None:
+        print(f"Pegawai dengan ID {args.id} tidak ditemukan", file=sys.stderr)
+        return 1
+    _print_rows([employee], args.json)
+    return 0
+
+def cmd_add(repo, args):
+    values = validate_employee(args.nama, args.alamat, args.posisi, args.tahun)
+    new_id = repo.add(*values)
+    print(new_id)
+    return 0
+
+def cmd_update(repo, args):
+    employee, version = repo.get_versioned(args.id)
+    if employee is None:
+        print(f"Pegawai dengan ID {args.id} tidak ditemukan", file=sys.stderr)
+        return 1
+    # Field yang tidak diisi tetap memakai nilai lama
+    values = validate_employee(
+        args.nama if args.nama is not None else employee.nama,
+        args.alamat if args.alamat is not None else employee.alamat,
+        args.posisi if args.posisi is not None else employee.posisi,
+        args.tahun if args.tahun is not None else employee.tahun_masuk)
+    # Gagal dengan ConflictError jika baris diubah proses lain di antara baca dan tulis
+    repo.update(args.id, *values, expected_version=version)
+    return 0
+
+def cmd_delete(repo, args):
+    if not repo.delete(args.id):
+        print(f"Pegawai dengan ID {args.id} tidak ditemukan", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_dedupe_names(repo, args):
+    # Dipanggil sebelum init_schema: justru untuk database yang migrasi nama uniknya tertahan
+    if args.list:
+        for nama in repo.duplicate_names():
+            print(nama)
+        return 0
+    renamed = repo.dedupe_names()
+    for row_id, old, new in renamed:
+        print(f"{row_id}\t{old}\t{new}")
+    repo.init_schema()
+    print(f"✅ {len(renamed)} nama ganda diberi akhiran", file=sys.stderr)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='EmployeeCLI', description="Kelola data pegawai tanpa GUI")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    parser.add_argument('--journal-mode', default='WAL', choices=JOURNAL_MODES, type=str.upper,
+                        help="journal SQLite; pakai DELETE untuk database di network drive "
+                             "(default: %(default)s)")
+    parser.add_argument('--busy-timeout', type=int, default=5000, metavar='MS',
+                        help="lama menunggu database yang dikunci penulis lain (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('list', help="tampilkan pegawai urut ID")
+    p.add_argument('--after', type=int, default=0, help="mulai setelah ID ini")
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--json', action='store_true', help="output JSON Lines")
+    p.set_defaults(handler=cmd_list)
+
+    p = commands.add_parser('search', help="cari nama/alamat/posisi")
+    p.add_argument('term')
+    p.add_argument('--limit', type=int, default=50)
+    p.add_argument('--sort', choices=sorted(SORT_COLLATIONS), help="urutkan menurut kolom (default: relevansi)")
+    p.add_argument('--desc', action='store_true', help="urutan menurun (bersama --sort)")
+    p.add_argument('--fuzzy', action='store_true',
+                   help="cari nama yang mirip (toleran salah ketik), urut kemiripan")
+    p.add_argument('--json', action='store_true', help="output JSON Lines")
+    p.set_defaults(handler=cmd_search)
+
+    p = commands.add_parser('count', help="jumlah pegawai (opsional: hasil pencarian)")
+    p.add_argument('term', nargs='?')
+    p.set_defaults(handler=cmd_count)
+
+    p = commands.add_parser('stats', help="jumlah pegawai per posisi atau per tahun masuk")
+    p.add_argument('--by', choices=('posisi', 'tahun'), default='posisi')
+    p.add_argument('--json', action='store_true', help="output JSON Lines")
+    p.set_defaults(handler=cmd_stats)
+
+    p = commands.add_parser('get', help="tampilkan satu pegawai")
+    p.add_argument('id', type=int)
+    p.add_argument('--json', action='store_true', help="output JSON")
+    p.set_defaults(handler=cmd_get)
+
+    p = commands.add_parser('add', help="tambah pegawai, mencetak ID baru")
+    p.add_argument('--nama', required=True)
+    p.add_argument('--alamat', required=True)
+    p.add_argument('--posisi', required=True)
+    p.add_argument('--tahun', required=True, help="tahun masuk")
+    p.set_defaults(handler=cmd_add)
+
+    p = commands.add_parser('update', help="ubah sebagian/seluruh data pegawai")
+    p.add_argument('id', type=int)
+    p.add_argument('--nama')
+    p.add_argument('--alamat')
+    p.add_argument('--posisi')
+    p.add_argument('--tahun', help="tahun masuk")
+    p.set_defaults(handler=cmd_update)
+
+    p = commands.add_parser('delete', help="hapus pegawai")
+    p.add_argument('id', type=int)
+    p.set_defaults(handler=cmd_delete)
+
+    p = commands.add_parser('dedupe-names',
+                            help="rapikan nama yang hanya beda huruf besar/kecil dengan akhiran (2), (3), ...")
+    p.add_argument('--list', action='store_true', help="hanya tampilkan nama yang bentrok")
+    p.set_defaults(handler=cmd_dedupe_names)
+
+    # import/export/backup/restore/serve diteruskan ke CLI modul masing-masing
+    commands.add_parser('import', help="import CSV/JSON (lihat EmployeeImport --help)", add_help=False)
+    commands.add_parser('export', help="export CSV/JSON (lihat EmployeeExport --help)", add_help=False)
+    commands.add_parser('backup', help="backup online database (lihat EmployeeBackup backup --help)",
+                        add_help=False)
+    commands.add_parser('restore', help="pulihkan dari file backup (lihat EmployeeBackup restore --help)",
+                        add_help=False)
+    commands.add_parser('serve', help="API HTTP/JSON lokal (lihat EmployeeServer --help)", add_help=False)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    # Argumen import/export/backup/restore/serve milik modul tujuan, diteruskan apa adanya
+    args, unknown = parser.parse_known_args(argv)
+    if unknown and args.command not in ('import', 'export', 'backup', 'restore', 'serve'):
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+
+    if args.command in ('import', 'export'):
+        # Diimpor saat dibutuhkan saja supaya perintah lain tetap ringan
+        if args.command == 'import':
+            from EmployeeImport import main as delegate
+        else:
+            from EmployeeExport import main as delegate
+        return delegate(['--db', args.db] + unknown)
+    if args.command in ('backup', 'restore'):
+        from EmployeeBackup import main as delegate
+        return delegate(['--db', args.db, args.command] + unknown)
+    if args.command == 'serve':
+        from EmployeeServer import main as delegate
+        return delegate(['--db', args.db, '--busy-timeout', str(args.busy_timeout)] + unknown)
+
+    repo = EmployeeRepository(args.db, journal_mode=args.journal_mode,
+                              busy_timeout_ms=args.busy_timeout)
+    try:
+        if args.handler is not cmd_dedupe_names:
+            repo.init_schema()
+        return args.handler(repo, args)
+    except ValidationError as e:
+        print(f"Data tidak valid ({e.field}): {e.message}", file=sys.stderr)
+        return 1
+    except DuplicateNamesError as e:
+        print(f"{e}\nJalankan 'EmployeeCLI dedupe-names' untuk merapikannya.", file=sys.stderr)
+        return 1
+    except ConflictError as e:
+        print(f"{e.message}, coba lagi", file=sys.stderr)
+        return 1
+    except sqlite3.IntegrityError:
+        print("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", file=sys.stderr)
+        return 1
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        repo.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from EmployeeRepository import DB_FILE, EmployeeRepository, Employee
+
+DEFAULT_CHUNK_SIZE = 5000
+
+class ExportResult:
+    """Ringkasan hasil export"""
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.cancelled = False
+
+def export_format(path):
+    """Format export berdasarkan ekstensi: 'jsonl', 'json' (array) atau 'csv'"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.json':
+        return 'json'
+    return 'csv'
+
+def export_employees(repo, path, term=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     total=None, progress=None, cancel=None, ids=None, sort=None):
+    """Export seluruh tabel (atau hasil pencarian term) ke CSV / JSON secara streaming.
+
+    Baris dibaca per chunk dengan fetchmany sehingga memori tetap konstan.
+    File ditulis ke berkas sementara dan baru dipindahkan ke path jika selesai;
+    export yang dibatalkan (cancel: threading.Event) tidak meninggalkan file setengah jadi.
+    progress(result, fraksi) dipanggil setiap chunk (fraksi None jika total tidak diketahui).
+    ids (mis. daftar ID yang sedang tampil di tabel) menggantikan term: baris diexport
+    sesuai urutan daftar itu.
+    sort (kolom, menurun) mengikuti urutan tabel yang sedang tampil (tanpa ids).
+    """
+    result = ExportResult(path)
+    fmt = export_format(path)
+    temp_path = f'{path}.part'
+
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='') as output:
+            writer = csv.writer(output) if fmt == 'csv' else None
+            if writer is not None:
+                writer.writerow(Employee._fields)
+            elif fmt == 'json':
+                output.write('[\n')
+
+            batches = repo.iter_rows(term, chunk_size, sort) if ids is None else repo.iter_rows_by_ids(ids)
+            for batch in batches:
+                if cancel is not None and cancel.is_set():
+                    result.cancelled = True
+                    break
+                if writer is not None:
+                    writer.writerows(batch)
+                elif fmt == 'json':
+                    # Array JSON ditulis bertahap: koma sebelum setiap objek kecuali yang pertama
+                    separator = ',\n' if result.written else ''
+                    output.write(separator + ',\n'.join(
+                        json.dumps(row._asdict(), ensure_ascii=False) for row in batch))
+                else:
+                    output.writelines(json.dumps(row._asdict(), ensure_ascii=False) + '\n'
+                                      for row in batch)
+                result.written += len(batch)
+                if progress is not None:
+                    progress(result, min(1.0, result.written / total) if total else None)
+
+            if fmt == 'json':
+                output.write('\n]\n')
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if result.cancelled:
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, path)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export data pegawai ke CSV / JSON / JSON Lines")
+    parser.add_argument('file', help="file tujuan .csv, .json atau .jsonl")
+    parser.add_argument('--search', default=None, help="hanya export hasil pencarian kata kunci ini")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="jumlah baris per fetch (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    def report(result, fraction):
+        sys.stderr.write(f"\r📤 {result.written} baris ditulis")
+        sys.stderr.flush()
+
+    repo = EmployeeRepository(args.db)
+    try:
+        repo.init_schema()
+        result = export_employees(repo, args.file, args.search, args.chunk_size, progress=report)
+    except (OSError, sqlite3.Error) as e:
+        sys.stderr.write(f"\n❌ Export gagal: {e}\n")
+        return 1
+    finally:
+        repo.close()
+
+    sys.stderr.write('\n')
+    print(f"✅ {result.written} pegawai diexport ke {result.path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
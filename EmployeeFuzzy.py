@@ -0,0 +1,94 @@
+"""Pencocokan nama yang toleran salah ketik (edit distance) untuk pencarian fuzzy.
+
+Kandidat dipersempit dulu oleh indeks trigram di database (lihat
+EmployeeRepository.fuzzy_search); modul ini hanya menilai dan mengurutkan
+kandidat tersebut, sehingga tidak pernah menilai seluruh tabel.
+"""
+import string
+
+# Kemiripan minimum (0..1) supaya nama masuk hasil
+DEFAULT_MIN_SIMILARITY = 0.5
+
+# NOCASE di SQLite hanya menyamakan huruf ASCII
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def nama_key(nama):
+    """Kunci perbandingan nama yang setara dengan COLLATE NOCASE"""
+    return nama.translate(_NOCASE)
+
+def _fold(text):
+    # Sama dengan normalisasi trigram (nama_key), supaya penilaian cocok dengan kandidat dari indeks
+    return ' '.join(nama_key(text).split())
+
+def edit_distance(a, b, limit=None):
+    """Jarak Damerau-Levenshtein (OSA): sisip, hapus, ganti dan tukar dua huruf bersebelahan.
+
+    Dengan limit, berhenti lebih awal dan kembalikan limit + 1 begitu jaraknya pasti lebih besar.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def _similarity(a, b, floor):
+    """1 - jarak/panjang, atau 0 jika pasti di bawah floor (tanpa menghitung jarak penuh)"""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    limit = int((1.0 - floor) * longest)
+    distance = edit_distance(a, b, limit)
+    return 1.0 - distance / longest if distance <= limit else 0.0
+
+def name_similarity(term, nama, floor=0.0, cache=None):
+    """Kemiripan 0..1 antara kata kunci dan nama.
+
+    Kata kunci dibandingkan dengan setiap potongan kata berurutan sepanjang
+    kata kunci (nama lengkap jika namanya lebih pendek), sehingga 'budi' cocok dengan 'Budi Santoso'
+    dan 'bdui santso' tetap cocok dengan 'Budi Santoso 12'. Hasil di bawah floor
+    dilaporkan 0; cache (dict) menyimpan skor potongan yang sering berulang
+    (nama depan/belakang yang sama) antar pemanggilan.
+    """
+    term, nama = _fold(term), _fold(nama)
+    words = nama.split()
+    width = len(term.split())
+    pieces = [' '.join(words[start:start + width])
+              for start in range(len(words) - width + 1)] or [nama]
+    best = 0.0
+    for piece in pieces:
+        if cache is not None and piece in cache:
+            score = cache[piece]
+        else:
+            score = _similarity(term, piece, floor)
+            if cache is not None:
+                cache[piece] = score
+        best = max(best, score)
+        if best == 1.0:
+            break
+    return best
+
+def rank_names(term, candidates, limit, min_similarity=DEFAULT_MIN_SIMILARITY):
+    """Urutkan kandidat (id, nama, trigram_sama) menurut kemiripan; kembalikan [(id, skor)]"""
+    scored = []
+    cache = {}
+    for row_id, nama, shared in candidates:
+        score = name_similarity(term, nama, min_similarity, cache)
+        if score >= min_similarity:
+            scored.append((-score, -shared, len(nama), row_id))
+    scored.sort()
+    return [(row_id, -score) for score, _, _, row_id in scored[:limit]]
@@ -0,0 +1,213 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+from EmployeeRepository import (DB_FILE, EmployeeRepository, ValidationError,
+                                validate_employee, nama_key)
+
+# Kolom yang dibaca dari file (header CSV / key JSON, tidak peka huruf besar/kecil)
+FIELDS = ('nama', 'alamat', 'posisi', 'tahun_masuk')
+FIELD_ALIASES = {'tahun': 'tahun_masuk'}
+
+DEFAULT_BATCH_SIZE = 1000
+JSON_CHUNK_SIZE = 64 * 1024
+
+class ImportResult:
+    """Ringkasan hasil import: jumlah baris masuk dan daftar baris yang ditolak"""
+    def __init__(self):
+        self.processed = 0
+        self.inserted = 0
+        self.rejected = []
+        self.cancelled = False
+
+    def reject(self, line_no, reason):
+        self.rejected.append((line_no, reason))
+
+def _normalize(record):
+    """Samakan nama key (huruf kecil, alias) untuk satu record"""
+    if not isinstance(record, dict):
+        raise ValidationError('record', "Baris bukan objek data pegawai")
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        key = str(key).strip().lower()
+        normalized[FIELD_ALIASES.get(key, key)] = value
+    return normalized
+
+def iter_csv(raw):
+    """Baca CSV baris demi baris; hasilkan (nomor_baris, record)"""
+    text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    for record in reader:
+        yield reader.line_num, record
+
+def iter_jsonl(raw):
+    """Baca JSON Lines (satu objek per baris); baris rusak dilaporkan, bukan menghentikan import"""
+    text = io.TextIOWrapper(raw, encoding='utf-8-sig')
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, ValidationError('record', f"JSON tidak valid: {e}")
+
+def iter_json_array(raw):
+    """Baca array JSON besar secara bertahap tanpa memuat seluruh file"""
+    text = io.TextIOWrapper(raw, encoding='utf-8-sig')
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    index = 0
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != '[':
+                    raise ValueError("File JSON harus berisi array objek pegawai")
+                buffer = buffer[1:]
+                started = True
+                continue
+        elif buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        elif buffer.startswith(']'):
+            return
+        elif buffer:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except ValueError:
+                # Objek terpotong di batas chunk: baca chunk berikutnya dulu
+                if eof:
+                    raise
+            else:
+                index += 1
+                yield index, record
+                buffer = buffer[end:]
+                continue
+
+        if eof:
+            if started:
+                raise ValueError("Array JSON tidak ditutup")
+            return
+        chunk = text.read(JSON_CHUNK_SIZE)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+def iter_records(path, raw):
+    """Pilih pembaca berdasarkan ekstensi file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return iter_jsonl(raw)
+    if extension == '.json':
+        return iter_json_array(raw)
+    return iter_csv(raw)
+
+def _flush(repo, batch, result):
+    """Simpan satu batch dalam satu transaksi; fallback per baris jika ada bentrok nama"""
+    existing = repo.existing_names([values[0] for _, values in batch])
+    rows = []
+    for line_no, values in batch:
+        if nama_key(values[0]) in existing:
+            result.reject(line_no, f"Nama '{values[0]}' sudah terdaftar")
+        else:
+            rows.append((line_no, values))
+
+    try:
+        result.inserted += repo.add_many([values for _, values in rows])
+    except sqlite3.IntegrityError:
+        # Ada penulis lain yang menyisipkan nama yang sama: ulangi per baris
+        for line_no, values in rows:
+            try:
+                repo.add(*values)
+                result.inserted += 1
+            except sqlite3.IntegrityError:
+                result.reject(line_no, f"Nama '{values[0]}' sudah terdaftar")
+
+def import_employees(repo, path, batch_size=DEFAULT_BATCH_SIZE, progress=None, cancel=None):
+    """Import pegawai dari CSV/JSON/JSON Lines secara streaming.
+
+    Setiap baris divalidasi dengan validate_employee, lalu disimpan per batch
+    (executemany, satu transaksi per batch). progress(result, fraksi) dipanggil
+    setelah setiap batch; cancel adalah threading.Event opsional.
+    """
+    result = ImportResult()
+    seen = set()
+    batch = []
+    size = os.path.getsize(path) or 1
+
+    with open(path, 'rb') as raw:
+        for line_no, record in iter_records(path, raw):
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                break
+
+            result.processed += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                record = _normalize(record)
+                values = validate_employee(*(record.get(field) for field in FIELDS))
+            except ValidationError as e:
+                result.reject(line_no, e.message)
+                continue
+
+            key = nama_key(values[0])
+            if key in seen:
+                result.reject(line_no, f"Nama '{values[0]}' muncul lebih dari sekali di file")
+                continue
+            seen.add(key)
+            batch.append((line_no, values))
+
+            if len(batch) >= batch_size:
+                _flush(repo, batch, result)
+                batch = []
+                if progress is not None:
+                    progress(result, min(1.0, raw.tell() / size))
+
+        if batch and not result.cancelled:
+            _flush(repo, batch, result)
+
+    if progress is not None:
+        progress(result, 1.0)
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import data pegawai dari CSV / JSON / JSON Lines")
+    parser.add_argument('file', help="file .csv, .json atau .jsonl")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help="jumlah baris per transaksi (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    def report(result, fraction):
+        sys.stderr.write(f"\r📥 {result.processed} baris dibaca, {result.inserted} masuk "
+                         f"({fraction:.0%})")
+        sys.stderr.flush()
+
+    repo = EmployeeRepository(args.db)
+    try:
+        repo.init_schema()
+        result = import_employees(repo, args.file, args.batch_size, progress=report)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        sys.stderr.write(f"\n❌ Import gagal: {e}\n")
+        return 1
+    finally:
+        repo.close()
+
+    sys.stderr.write('\n')
+    for line_no, reason in result.rejected:
+        print(f"baris {line_no}: {reason}")
+    print(f"✅ {result.inserted} pegawai ditambahkan, {len(result.rejected)} baris ditolak")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
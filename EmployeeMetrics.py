@@ -0,0 +1,163 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Jumlah catatan terakhir yang disimpan (ring buffer)
+DEFAULT_CAPACITY = 1024
+
+def percentile(values, fraction):
+    """Persentil nearest-rank dari daftar angka (0 jika kosong)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+class Span:
+    """Satu pengukuran operasi; waktu per fase (query, render, ...) dijumlahkan"""
+    def __init__(self, operation):
+        self.operation = operation
+        self.rows = 0
+        self.phases = {}
+        self.start = time.perf_counter()
+
+    def add(self, phase, ms):
+        self.phases[phase] = self.phases.get(phase, 0.0) + ms
+
+    def merge(self, phases):
+        for phase, ms in phases.items():
+            self.add(phase, ms)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+class OperationMetrics:
+    """Ring buffer latensi per operasi: waktu total, query, render dan jumlah baris.
+
+    Aman dipakai dari thread mana pun; memori dibatasi oleh capacity.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.records = deque(maxlen=capacity)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        """Tambah penghitung sederhana (mis. jumlah event yang digabung)"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, operation, total_ms, rows=0, **phases):
+        entry = {
+            'op': operation,
+            'ts': time.time(),
+            'total_ms': round(total_ms, 3),
+            'rows': rows,
+        }
+        for phase, ms in phases.items():
+            entry[f'{phase}_ms'] = round(ms, 3)
+        with self._lock:
+            self.records.append(entry)
+
+    @contextmanager
+    def measure(self, operation):
+        """Ukur blok kode sebagai satu operasi; fase diisi lewat span.phase()/span.add()"""
+        span = Span(operation)
+        try:
+            yield span
+        finally:
+            total_ms = (time.perf_counter() - span.start) * 1000
+            self.record(operation, total_ms, span.rows, **span.phases)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+    def summary(self):
+        """Ringkasan per operasi: jumlah, p50/p95 total dan p50 per fase"""
+        grouped = {}
+        for entry in self.snapshot():
+            grouped.setdefault(entry['op'], []).append(entry)
+
+        result = {}
+        for operation, entries in grouped.items():
+            totals = [entry['total_ms'] for entry in entries]
+            stats = {
+                'count': len(entries),
+                'p50_ms': percentile(totals, 0.50),
+                'p95_ms': percentile(totals, 0.95),
+                'last_rows': entries[-1]['rows'],
+            }
+            for key in ('query_ms', 'render_ms'):
+                values = [entry[key] for entry in entries if key in entry]
+                if values:
+                    stats[f'p50_{key}'] = percentile(values, 0.50)
+            result[operation] = stats
+        return result
+
+    def recent_operations(self, limit=3):
+        """Nama operasi yang paling baru dijalankan (tanpa duplikat)"""
+        seen = []
+        for entry in reversed(self.snapshot()):
+            if entry['op'] not in seen:
+                seen.append(entry['op'])
+                if len(seen) == limit:
+                    break
+        return seen
+
+    def to_json(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return json.dumps({'summary': self.summary(), 'counters': counters,
+                           'records': self.snapshot()}, indent=2)
+
+    def dump(self, path):
+        """Tulis ringkasan dan semua catatan ke file JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json() + '\n')
+
+    def overlay_text(self, limit=3):
+        """Teks ringkas p50/p95 untuk status bar"""
+        summary = self.summary()
+        parts = []
+        for operation in self.recent_operations(limit):
+            stats = summary[operation]
+            parts.append(f"{operation} p50 {stats['p50_ms']:.1f} / p95 {stats['p95_ms']:.1f} ms")
+        collapsed = sum(value for name, value in self.counters.items() if name.endswith('.collapsed'))
+        if collapsed:
+            parts.append(f"{collapsed} event digabung")
+        return "⏱ " + " · ".join(parts) if parts else "⏱ belum ada data"
+
+class StartupProfile:
+    """Titik waktu tahap-tahap startup (ms sejak objek dibuat), mis. theme, widgets, first_paint"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.start) * 1000, 3)
+        return self.marks[name]
+
+    def phases(self):
+        """Durasi setiap tahap (selisih dengan tanda sebelumnya)"""
+        result = {}
+        previous = 0.0
+        for name, ms in self.marks.items():
+            result[name] = round(ms - previous, 3)
+            previous = ms
+        return result
+
+    def record(self, metrics, operation='startup'):
+        """Simpan sebagai satu operasi di OperationMetrics (fase = durasi tiap tahap)"""
+        total = max(self.marks.values(), default=0.0)
+        metrics.record(operation, total, **self.phases())
+
+    def to_json(self):
+        return json.dumps({'marks_ms': self.marks, 'phases_ms': self.phases()}, indent=2)
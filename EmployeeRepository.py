@@ -0,0 +1,1394 @@
+import sqlite3
+import bisect
+import random
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+from EmployeeFuzzy import DEFAULT_MIN_SIMILARITY, nama_key, rank_names
+
+# Lokasi default file database
+DB_FILE = 'data_pegawai.db'
+
+# Journal mode yang boleh dipilih; WAL butuh shared memory lokal (bukan network drive)
+JOURNAL_MODES = ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST')
+
+# Satu baris data pegawai (urutan kolom sama dengan kolom Treeview)
+Employee = namedtuple('Employee', 'id nama alamat posisi tahun_masuk')
+
+COLUMNS = 'id, nama, alamat, posisi, tahun_masuk'
+# Kolom tampilan + versi baris (untuk cache baris dan update compare-and-swap)
+VERSIONED_COLUMNS = f'{COLUMNS}, version'
+
+# Trigram FTS5 hanya bisa mencocokkan kata kunci minimal 3 karakter
+FTS_MIN_TERM = 3
+
+# Indeks trigram nama untuk pencarian fuzzy: nama diberi spasi '  ' di depan dan ' ' di belakang,
+# hanya NAMA_TRIGRAM_MAX trigram pertama yang diindeks
+NAMA_TRIGRAM_MAX = 128
+FUZZY_MIN_TERM = 3
+# Batas kandidat dari indeks trigram yang dinilai dengan edit distance
+FUZZY_CANDIDATES = 200
+# Minimal bagian trigram kata kunci yang harus sama supaya nama jadi kandidat
+FUZZY_MIN_SHARED = 0.25
+
+# Kolom form yang punya autocomplete; saran maksimal per ketikan dan batas nilai yang dinilai
+AUTOCOMPLETE_COLUMNS = ('alamat', 'posisi')
+SUGGEST_LIMIT = 8
+SUGGEST_SCAN = 200
+# Perubahan log maksimal yang diterapkan ke indeks autocomplete per sinkronisasi; lebih dari itu
+# (mis. import dari proses lain) indeks dibuang dan dibangun ulang
+VALUE_SYNC_LIMIT = 5000
+
+# SQL tetap (string identik dipakai ulang dari cache prepared statement sqlite3)
+SQL_CREATE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS pegawai (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT NOT NULL UNIQUE,
+        alamat TEXT NOT NULL,
+        posisi TEXT NOT NULL,
+        tahun_masuk INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+SQL_GET_NAME = 'SELECT nama FROM pegawai WHERE id = ?'
+SQL_INSERT = 'INSERT INTO pegawai (nama, alamat, posisi, tahun_masuk) VALUES (?, ?, ?, ?)'
+SQL_GET_VERSIONED = f'SELECT {VERSIONED_COLUMNS} FROM pegawai WHERE id = ?'
+SQL_UPDATE = 'UPDATE pegawai SET nama=?, alamat=?, posisi=?, tahun_masuk=?, version=version+1 WHERE id=?'
+SQL_UPDATE_CAS = ('UPDATE pegawai SET nama=?, alamat=?, posisi=?, tahun_masuk=?, version=version+1 '
+                  'WHERE id=? AND version=?')
+SQL_DELETE = 'DELETE FROM pegawai WHERE id=?'
+SQL_DELETE_CAS = 'DELETE FROM pegawai WHERE id=? AND version=?'
+SQL_PAGE_AFTER = f'SELECT {COLUMNS} FROM pegawai WHERE id > ? ORDER BY id LIMIT ?'
+SQL_COUNT = 'SELECT COUNT(*) FROM pegawai'
+SQL_CHANGES_SINCE = 'SELECT seq, pegawai_id, op FROM pegawai_changes WHERE seq > ? ORDER BY seq LIMIT ?'
+SQL_LAST_CHANGE = 'SELECT COALESCE(MAX(seq), 0) FROM pegawai_changes'
+SQL_PRUNE_CHANGES = 'DELETE FROM pegawai_changes WHERE seq <= ?'
+SQL_STATS_POSISI = 'SELECT posisi, jumlah FROM pegawai_stats_posisi ORDER BY jumlah DESC, posisi'
+SQL_STATS_TAHUN = 'SELECT tahun_masuk, jumlah FROM pegawai_stats_tahun ORDER BY tahun_masuk'
+SQL_STATS_TOTAL = 'SELECT COALESCE(SUM(jumlah), 0) FROM pegawai_stats_tahun'
+# Nilai unik per kolom autocomplete (dibaca sekali saat indeks prefiks dibangun)
+SQL_DISTINCT_VALUES = {column: f'SELECT {column}, COUNT(*) FROM pegawai GROUP BY {column}'
+                       for column in AUTOCOMPLETE_COLUMNS}
+# Nilai lama/baru kolom autocomplete di log perubahan (migrasi 8), untuk menjaga indeks prefiks
+SQL_VALUE_CHANGES = (
+    'SELECT seq, ' + ', '.join(f'{column}_lama, {column}_baru' for column in AUTOCOMPLETE_COLUMNS) +
+    ' FROM pegawai_changes WHERE seq > ? ORDER BY seq LIMIT ?')
+
+# Log perubahan dipangkas oleh trigger setiap CHANGE_LOG_PRUNE_EVERY entri,
+# menyisakan CHANGE_LOG_KEEP entri terakhir (tidak bergantung pada GUI yang berjalan)
+CHANGE_LOG_KEEP = 100000
+CHANGE_LOG_PRUNE_EVERY = 1000
+
+# Batas tahun masuk yang diterima
+MIN_TAHUN_MASUK = 1950
+
+class ConflictError(Exception):
+    """Baris sudah diubah/dihapus penulis lain sejak versinya dibaca.
+
+    current berisi data terbaru (Employee) dan current_version versinya,
+    atau keduanya None jika baris sudah dihapus.
+    """
+    def __init__(self, employee_id, current=None, current_version=None):
+        if current is None:
+            message = "Data pegawai sudah dihapus oleh pengguna lain"
+        else:
+            message = "Data pegawai telah diubah oleh pengguna lain"
+        super().__init__(message)
+        self.employee_id = employee_id
+        self.current = current
+        self.current_version = current_version
+        self.message = message
+
+def is_busy_error(error):
+    """Apakah error SQLite berarti database sedang dikunci penulis lain"""
+    text = str(error)
+    return 'locked' in text or 'busy' in text
+
+class ValidationError(ValueError):
+    """Data pegawai tidak valid; field menunjukkan kolom yang bermasalah"""
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+def _required(field, value, message):
+    value = str(value or '').strip()
+    if not value:
+        raise ValidationError(field, message)
+    return value
+
+def _validate_tahun(tahun_masuk):
+    try:
+        tahun = int(str(tahun_masuk).strip())
+    except ValueError:
+        raise ValidationError('tahun_masuk', "Tahun masuk harus berupa angka yang valid!")
+    current_year = datetime.now().year
+    if tahun < MIN_TAHUN_MASUK or tahun > current_year:
+        raise ValidationError('tahun_masuk',
+                              f"Tahun masuk harus antara {MIN_TAHUN_MASUK} - {current_year}!")
+    return tahun
+
+# Field yang boleh diubah sekaligus untuk banyak pegawai (nama harus unik, jadi tidak termasuk)
+BATCH_FIELDS = ('alamat', 'posisi', 'tahun_masuk')
+
+_FIELD_VALIDATORS = {
+    'alamat': lambda value: _required('alamat', value, "Alamat wajib diisi!"),
+    'posisi': lambda value: _required('posisi', value, "Posisi/Jabatan wajib diisi!"),
+    'tahun_masuk': _validate_tahun,
+}
+
+def validate_employee(nama, alamat, posisi, tahun_masuk):
+    """Validasi data pegawai (aturan yang sama dengan form) dan kembalikan nilai yang sudah dirapikan"""
+    # Validasi nama
+    nama = _required('nama', nama, "Nama lengkap wajib diisi!")
+    if len(nama) < 3:
+        raise ValidationError('nama', "Nama minimal 3 karakter!")
+
+    alamat = _FIELD_VALIDATORS['alamat'](alamat)
+    posisi = _FIELD_VALIDATORS['posisi'](posisi)
+    return nama, alamat, posisi, _validate_tahun(tahun_masuk)
+
+def validate_fields(fields):
+    """Validasi sebagian field untuk edit massal (lihat BATCH_FIELDS); kembalikan dict yang dirapikan"""
+    cleaned = {}
+    for field, value in fields.items():
+        if field not in _FIELD_VALIDATORS:
+            raise ValidationError(field, f"Field '{field}' tidak bisa diubah massal")
+        cleaned[field] = _FIELD_VALIDATORS[field](value)
+    if not cleaned:
+        raise ValidationError('record', "Tidak ada field yang diubah")
+    return cleaned
+
+def nama_trigrams(nama):
+    """Trigram nama seperti yang disimpan trigger di nama_trigram (huruf kecil ASCII, diberi spasi)"""
+    padded = '  ' + nama_key(nama) + ' '
+    return {padded[i:i + 3] for i in range(min(len(padded) - 2, NAMA_TRIGRAM_MAX))}
+
+def search_clause(term):
+    """Klausa WHERE dan parameter untuk kata kunci pencarian (LIKE, tanpa indeks)"""
+    pattern = f'%{term}%'
+    return 'nama LIKE ? OR alamat LIKE ? OR posisi LIKE ?', (pattern, pattern, pattern)
+
+def stats_available(conn):
+    """Cek apakah tabel ringkasan statistik (migrasi 6) sudah ada"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='pegawai_stats_tahun'").fetchone()
+    return row is not None
+
+def fuzzy_available(conn):
+    """Cek apakah indeks trigram nama (migrasi 7) sudah ada"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='nama_trigram'").fetchone()
+    return row is not None
+
+def fts_available(conn):
+    """Cek apakah indeks FTS5 pegawai_fts sudah dibangun di database ini"""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='pegawai_fts'").fetchone()
+    return row is not None
+
+# Kolom yang bisa diurutkan; teks dibandingkan tanpa beda huruf besar/kecil (sesuai indeksnya)
+SORT_COLLATIONS = {
+    'id': '',
+    'nama': ' COLLATE NOCASE',
+    'alamat': ' COLLATE NOCASE',
+    'posisi': ' COLLATE NOCASE',
+    'tahun_masuk': '',
+}
+
+def sort_key_columns(sort):
+    """Kolom kunci urutan untuk sort (kolom, menurun); id selalu jadi pemutus seri"""
+    column = sort[0] if sort else 'id'
+    if column not in SORT_COLLATIONS:
+        raise ValueError(f"Kolom tidak bisa diurutkan: {column}")
+    return ('id',) if column == 'id' else (column, 'id')
+
+def order_by(sort, prefix='', reverse=False):
+    """Isi klausa ORDER BY untuk sort; reverse membalik arah (untuk halaman sebelumnya)"""
+    descending = bool(sort and sort[1]) != reverse
+    direction = 'DESC' if descending else 'ASC'
+    return ', '.join(f'{prefix}{column}{SORT_COLLATIONS[column]} {direction}'
+                     for column in sort_key_columns(sort))
+
+def _fts_phrase(term):
+    # Kutip sebagai frasa supaya karakter khusus FTS tidak ditafsirkan sebagai operator
+    return '"' + term.replace('"', '""') + '"'
+
+def search_ids_query(term, use_fts, sort=None):
+    """Query ID hasil pencarian: FTS5 berperingkat bila bisa, LIKE sebagai cadangan.
+
+    Dengan sort (kolom, menurun) hasil diurutkan di SQL menurut kolom tersebut.
+    """
+    if use_fts and len(term) >= FTS_MIN_TERM:
+        if sort is None:
+            return ('SELECT rowid FROM pegawai_fts WHERE pegawai_fts MATCH ? ORDER BY rank',
+                    (_fts_phrase(term),))
+        return (f'''
+            SELECT p.id FROM pegawai_fts JOIN pegawai p ON p.id = pegawai_fts.rowid
+            WHERE pegawai_fts MATCH ? ORDER BY {order_by(sort, 'p.')}
+        ''', (_fts_phrase(term),))
+    where, params = search_clause(term)
+    return f'SELECT id FROM pegawai WHERE {where} ORDER BY {order_by(sort)}', params
+
+def search_rows_query(term, use_fts, sort=None):
+    """Query baris lengkap untuk seluruh tabel atau hasil pencarian (urutan sama dengan tampilan)"""
+    if not term:
+        return f'SELECT {COLUMNS} FROM pegawai ORDER BY {order_by(sort)}', ()
+    if use_fts and len(term) >= FTS_MIN_TERM:
+        order = 'rank' if sort is None else order_by(sort, 'p.')
+        return (f'''
+            SELECT p.id, p.nama, p.alamat, p.posisi, p.tahun_masuk
+            FROM pegawai_fts JOIN pegawai p ON p.id = pegawai_fts.rowid
+            WHERE pegawai_fts MATCH ? ORDER BY {order}
+        ''', (_fts_phrase(term),))
+    where, params = search_clause(term)
+    return f'SELECT {COLUMNS} FROM pegawai WHERE {where} ORDER BY {order_by(sort)}', params
+
+def search_probe_query(term, use_fts):
+    """Query untuk mengecek satu ID terhadap kata kunci (pasangan search_ids_query)"""
+    if use_fts and len(term) >= FTS_MIN_TERM:
+        return ('SELECT 1 FROM pegawai_fts WHERE rowid = ? AND pegawai_fts MATCH ?',
+                (_fts_phrase(term),))
+    where, params = search_clause(term)
+    return f'SELECT 1 FROM pegawai WHERE id = ? AND ({where})', params
+
+def _migrate_fts_index(conn):
+    """Indeks bayangan FTS5 (trigram) atas nama, alamat, posisi + trigger sinkronisasi"""
+    try:
+        conn.execute('''
+            CREATE VIRTUAL TABLE pegawai_fts USING fts5(
+                nama, alamat, posisi,
+                content='pegawai', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        # SQLite tanpa FTS5/trigram: pencarian tetap memakai LIKE
+        return
+
+    conn.execute('''
+        CREATE TRIGGER pegawai_fts_ai AFTER INSERT ON pegawai BEGIN
+            INSERT INTO pegawai_fts(rowid, nama, alamat, posisi)
+            VALUES (new.id, new.nama, new.alamat, new.posisi);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_fts_ad AFTER DELETE ON pegawai BEGIN
+            INSERT INTO pegawai_fts(pegawai_fts, rowid, nama, alamat, posisi)
+            VALUES ('delete', old.id, old.nama, old.alamat, old.posisi);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_fts_au AFTER UPDATE OF nama, alamat, posisi ON pegawai BEGIN
+            INSERT INTO pegawai_fts(pegawai_fts, rowid, nama, alamat, posisi)
+            VALUES ('delete', old.id, old.nama, old.alamat, old.posisi);
+            INSERT INTO pegawai_fts(rowid, nama, alamat, posisi)
+            VALUES (new.id, new.nama, new.alamat, new.posisi);
+        END
+    ''')
+    # Bangun indeks untuk data yang sudah ada
+    conn.execute("INSERT INTO pegawai_fts(pegawai_fts) VALUES ('rebuild')")
+
+class DuplicateNamesError(sqlite3.IntegrityError):
+    """Nama yang hanya beda huruf besar/kecil menghalangi indeks unik NOCASE (lihat dedupe_names)"""
+    def __init__(self, names):
+        self.names = names
+        shown = ', '.join(names[:5])
+        if len(names) > 5:
+            shown += f" (dan {len(names) - 5} lainnya)"
+        super().__init__(f"Nama ganda (beda huruf besar/kecil) harus dirapikan dulu: {shown}")
+
+def duplicate_names(conn):
+    """Satu nama per kelompok nama yang sama bila huruf besar/kecil diabaikan"""
+    return [row[0] for row in conn.execute('''
+        SELECT MIN(nama) FROM pegawai
+        GROUP BY nama COLLATE NOCASE HAVING COUNT(*) > 1 ORDER BY 1
+    ''')]
+
+def dedupe_names(conn):
+    """Rapikan nama ganda beda huruf dengan akhiran ' (2)', ' (3)', ...; ID terkecil tetap.
+
+    Kembalikan daftar (id, nama lama, nama baru).
+    """
+    renamed = []
+    with conn:
+        rows = conn.execute('''
+            SELECT p.id, p.nama FROM pegawai p
+            JOIN (SELECT nama, MIN(id) AS keep FROM pegawai
+                  GROUP BY nama COLLATE NOCASE HAVING COUNT(*) > 1) g
+              ON p.nama = g.nama COLLATE NOCASE AND p.id <> g.keep
+            ORDER BY p.id
+        ''').fetchall()
+        for row_id, nama in rows:
+            suffix = 2
+            while conn.execute('SELECT 1 FROM pegawai WHERE nama = ? COLLATE NOCASE',
+                               (f"{nama} ({suffix})",)).fetchone():
+                suffix += 1
+            conn.execute('UPDATE pegawai SET nama = ? WHERE id = ?', (f"{nama} ({suffix})", row_id))
+            renamed.append((row_id, nama, f"{nama} ({suffix})"))
+    return renamed
+
+def _migrate_nama_nocase(conn):
+    """Indeks unik case-insensitive untuk nama, sehingga cek duplikat jadi probe indeks"""
+    duplicates = duplicate_names(conn)
+    if duplicates:
+        raise DuplicateNamesError(duplicates)
+    conn.execute('CREATE UNIQUE INDEX idx_pegawai_nama_nocase ON pegawai(nama COLLATE NOCASE)')
+
+def ensure_fts_index(conn):
+    """Bangun indeks FTS yang belum ada walau migrasi 1 sudah tercatat.
+
+    Migrasi 1 tetap dicatat di SQLite tanpa FTS5/trigram; setelah SQLite-nya
+    diperbarui, indeks dibangun saat database dibuka berikutnya.
+    """
+    if fts_available(conn):
+        return True
+    conn.execute('BEGIN')
+    try:
+        _migrate_fts_index(conn)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return fts_available(conn)
+
+def _migrate_row_version(conn):
+    """Nomor versi per baris untuk update/delete compare-and-swap"""
+    conn.execute('ALTER TABLE pegawai ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+
+def _migrate_change_log(conn):
+    """Log perubahan (insert/update/delete) yang diisi trigger, untuk auto-refresh antar proses"""
+    conn.execute('''
+        CREATE TABLE pegawai_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            pegawai_id INTEGER NOT NULL,
+            op TEXT NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_ai AFTER INSERT ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op) VALUES (new.id, 'I');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_au AFTER UPDATE ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op) VALUES (new.id, 'U');
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_ad AFTER DELETE ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op) VALUES (old.id, 'D');
+        END
+    ''')
+    # Satu DELETE per CHANGE_LOG_PRUNE_EVERY tulisan, di proses mana pun yang menulis
+    conn.execute(f'''
+        CREATE TRIGGER pegawai_changes_prune AFTER INSERT ON pegawai_changes
+        WHEN new.seq % {CHANGE_LOG_PRUNE_EVERY} = 0 BEGIN
+            DELETE FROM pegawai_changes WHERE seq <= new.seq - {CHANGE_LOG_KEEP};
+        END
+    ''')
+
+def _migrate_sort_indexes(conn):
+    """Indeks untuk klik-urut kolom (nama sudah punya indeks NOCASE dari migrasi 2)"""
+    conn.execute('CREATE INDEX idx_pegawai_alamat_nocase ON pegawai(alamat COLLATE NOCASE)')
+    conn.execute('CREATE INDEX idx_pegawai_posisi_nocase ON pegawai(posisi COLLATE NOCASE)')
+    conn.execute('CREATE INDEX idx_pegawai_tahun_masuk ON pegawai(tahun_masuk)')
+
+def _stats_triggers(table, column):
+    """Trigger yang menjaga jumlah pegawai per nilai column di tabel ringkasan"""
+    increment = f'''
+            INSERT INTO {table}({column}, jumlah) VALUES (new.{column}, 1)
+            ON CONFLICT({column}) DO UPDATE SET jumlah = jumlah + 1;'''
+    decrement = f'''
+            UPDATE {table} SET jumlah = jumlah - 1 WHERE {column} = old.{column};
+            DELETE FROM {table} WHERE {column} = old.{column} AND jumlah <= 0;'''
+    return [
+        f'CREATE TRIGGER {table}_ai AFTER INSERT ON pegawai BEGIN {increment} END',
+        f'CREATE TRIGGER {table}_ad AFTER DELETE ON pegawai BEGIN {decrement} END',
+        f'''CREATE TRIGGER {table}_au AFTER UPDATE OF {column} ON pegawai
+            WHEN old.{column} IS NOT new.{column} BEGIN {decrement} {increment} END''',
+    ]
+
+def _migrate_stats_tables(conn):
+    """Tabel ringkasan jumlah pegawai per posisi dan per tahun masuk, dijaga oleh trigger.
+
+    Dashboard cukup membaca satu baris per kelompok, tanpa agregasi ulang tabel pegawai.
+    """
+    conn.execute('''
+        CREATE TABLE pegawai_stats_posisi (
+            posisi TEXT PRIMARY KEY,
+            jumlah INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE pegawai_stats_tahun (
+            tahun_masuk INTEGER PRIMARY KEY,
+            jumlah INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    for sql in _stats_triggers('pegawai_stats_posisi', 'posisi') + \
+            _stats_triggers('pegawai_stats_tahun', 'tahun_masuk'):
+        conn.execute(sql)
+    # Isi awal dari data yang sudah ada (satu-satunya agregasi penuh, sekali saja)
+    conn.execute('''
+        INSERT INTO pegawai_stats_posisi(posisi, jumlah)
+        SELECT posisi, COUNT(*) FROM pegawai GROUP BY posisi
+    ''')
+    conn.execute('''
+        INSERT INTO pegawai_stats_tahun(tahun_masuk, jumlah)
+        SELECT tahun_masuk, COUNT(*) FROM pegawai GROUP BY tahun_masuk
+    ''')
+
+def _nama_trigram_grams(row, tables='nama_trigram_pos'):
+    # Trigram nama milik row ('new'/'old' di trigger, 'pegawai' saat isi awal). Trigger tidak
+    # boleh memakai CTE, jadi posisi karakter diambil dari tabel nama_trigram_pos
+    padded = f"'  ' || lower({row}.nama) || ' '"
+    return (f"SELECT substr({padded}, pos, 3) AS gram, {row}.id AS pegawai_id "
+            f"FROM {tables} WHERE pos <= length({padded}) - 2")
+
+def _migrate_nama_trigrams(conn):
+    """Indeks trigram nama (gram, id) untuk mempersempit kandidat pencarian fuzzy, dijaga trigger"""
+    conn.execute('CREATE TABLE nama_trigram_pos (pos INTEGER PRIMARY KEY)')
+    conn.executemany('INSERT INTO nama_trigram_pos(pos) VALUES (?)',
+                     [(pos,) for pos in range(1, NAMA_TRIGRAM_MAX + 1)])
+    conn.execute('''
+        CREATE TABLE nama_trigram (
+            gram TEXT NOT NULL,
+            pegawai_id INTEGER NOT NULL,
+            PRIMARY KEY (gram, pegawai_id)
+        ) WITHOUT ROWID
+    ''')
+    # Hapus lewat trigram nama lama sehingga cukup primary key, tanpa indeks pegawai_id
+    delete = (f"DELETE FROM nama_trigram WHERE pegawai_id = old.id AND gram IN "
+              f"(SELECT gram FROM ({_nama_trigram_grams('old')}));")
+    insert = f"INSERT OR IGNORE INTO nama_trigram(gram, pegawai_id) {_nama_trigram_grams('new')};"
+    conn.execute(f'CREATE TRIGGER nama_trigram_ai AFTER INSERT ON pegawai BEGIN {insert} END')
+    conn.execute(f'CREATE TRIGGER nama_trigram_ad AFTER DELETE ON pegawai BEGIN {delete} END')
+    conn.execute(f'''CREATE TRIGGER nama_trigram_au AFTER UPDATE OF nama ON pegawai
+                     WHEN old.nama IS NOT new.nama BEGIN {delete} {insert} END''')
+    # Isi awal dari data yang sudah ada
+    conn.execute(f"INSERT OR IGNORE INTO nama_trigram(gram, pegawai_id) "
+                 f"{_nama_trigram_grams('pegawai', 'pegawai, nama_trigram_pos')}")
+
+def _migrate_change_values(conn):
+    """Nilai alamat/posisi lama dan baru di log perubahan.
+
+    Indeks autocomplete di memori bisa diperbarui per baris dari log, termasuk
+    untuk perubahan proses lain, tanpa membangun ulang dari seluruh tabel.
+    """
+    for column in ('alamat_lama', 'alamat_baru', 'posisi_lama', 'posisi_baru'):
+        conn.execute(f'ALTER TABLE pegawai_changes ADD COLUMN {column} TEXT')
+    for trigger in ('pegawai_changes_ai', 'pegawai_changes_au', 'pegawai_changes_ad'):
+        conn.execute(f'DROP TRIGGER {trigger}')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_ai AFTER INSERT ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op, alamat_baru, posisi_baru)
+            VALUES (new.id, 'I', new.alamat, new.posisi);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_au AFTER UPDATE ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op, alamat_lama, alamat_baru, posisi_lama, posisi_baru)
+            VALUES (new.id, 'U', old.alamat, new.alamat, old.posisi, new.posisi);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER pegawai_changes_ad AFTER DELETE ON pegawai BEGIN
+            INSERT INTO pegawai_changes(pegawai_id, op, alamat_lama, posisi_lama)
+            VALUES (old.id, 'D', old.alamat, old.posisi);
+        END
+    ''')
+
+# Migrasi skema berurutan; versi yang sudah diterapkan disimpan di PRAGMA user_version
+SCHEMA_MIGRATIONS = [
+    (1, _migrate_fts_index),
+    (2, _migrate_nama_nocase),
+    (3, _migrate_row_version),
+    (4, _migrate_change_log),
+    (5, _migrate_sort_indexes),
+    (6, _migrate_stats_tables),
+    (7, _migrate_nama_trigrams),
+    (8, _migrate_change_values),
+]
+
+def migrate_database(conn):
+    """Terapkan migrasi yang belum dijalankan, masing-masing dalam satu transaksi"""
+    conn.commit()
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, migrate in SCHEMA_MIGRATIONS:
+        if target <= version:
+            continue
+        conn.execute('BEGIN')
+        try:
+            migrate(conn)
+            conn.execute(f'PRAGMA user_version = {target}')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        version = target
+    if version >= 1:
+        ensure_fts_index(conn)
+    return version
+
+class PegawaiIdList:
+    """Sumber data tabel dari daftar ID hasil pencarian (disimpan sebagai array ringkas)"""
+    def __init__(self, repo, ids, term, use_fts, sort=None, fuzzy=False):
+        self.repo = repo
+        self.ids = ids
+        self.fuzzy = fuzzy
+        if fuzzy:
+            # Hasil fuzzy urut kemiripan; baris tetap di daftar selama masih ada
+            self.probe_sql, self.probe_params = 'SELECT 1 FROM pegawai WHERE id = ?', ()
+            self.id_ordered = False
+        else:
+            self.probe_sql, self.probe_params = search_probe_query(term, use_fts)
+            # Tanpa sort: hasil FTS urut peringkat, hasil LIKE urut ID
+            ranked = use_fts and len(term) >= FTS_MIN_TERM
+            self.id_ordered = sort == ('id', False) or (sort is None and not ranked)
+        self._id_set = None
+
+    def count(self):
+        return len(self.ids)
+
+    def fetch(self, offset, limit):
+        """Ambil baris untuk potongan ID, urutan mengikuti daftar ID"""
+        window = self.ids[offset:offset + limit]
+        if not window:
+            return []
+        rows = {row[0]: row for row in self.repo.get_many(window)}
+        return [rows[i] for i in window if i in rows]
+
+    def refresh_row(self, row_id):
+        # Urutan daftar ID tetap sampai pencarian diulang
+        return self.repo.get(row_id), False
+
+    def contains(self, row_id):
+        """Cek apakah baris cocok dengan kata kunci pencarian aktif"""
+        if self.fuzzy and not self.has_id(row_id):
+            return False
+        row = self.repo.conn.execute(self.probe_sql, (row_id,) + self.probe_params).fetchone()
+        return row is not None
+
+    def has_id(self, row_id):
+        """Apakah ID ada di daftar hasil saat ini (tanpa query ke database)"""
+        if not self.id_ordered:
+            # Daftar tidak urut ID: bangun set sekali saat pertama dibutuhkan
+            if self._id_set is None:
+                self._id_set = set(self.ids)
+            return row_id in self._id_set
+        index = bisect.bisect_left(self.ids, row_id)
+        return index < len(self.ids) and self.ids[index] == row_id
+
+    def insert_id(self, row_id):
+        if not self.id_ordered:
+            # Posisi baris baru (peringkat/urutan kolom) tidak diketahui tanpa query ulang: taruh di akhir
+            self.ids.append(row_id)
+            if self._id_set is not None:
+                self._id_set.add(row_id)
+        else:
+            self.ids.insert(bisect.bisect_left(self.ids, row_id), row_id)
+
+    def remove_id(self, row_id):
+        if not self.id_ordered:
+            try:
+                index = self.ids.index(row_id)
+            except ValueError:
+                return
+            if self._id_set is not None:
+                self._id_set.discard(row_id)
+        else:
+            index = bisect.bisect_left(self.ids, row_id)
+        if index < len(self.ids) and self.ids[index] == row_id:
+            del self.ids[index]
+
+    def apply_changes(self, inserted, removed):
+        for row_id in removed:
+            self.remove_id(row_id)
+        for row_id in inserted:
+            self.insert_id(row_id)
+
+class KeysetPager:
+    """Sumber data tabel per halaman dengan keyset (WHERE kunci > ? LIMIT n), bukan OFFSET.
+
+    Kunci halaman adalah (kolom urut, id), atau id saja tanpa sort. Halaman pertama,
+    berikutnya, sebelumnya dan terakhir selalu berupa pencarian rentang di indeks,
+    jadi biayanya tidak bergantung pada ukuran tabel. Jumlah total tidak dihitung
+    di sini; pemanggil mengisinya lewat set_total() bila sudah tersedia.
+    """
+    def __init__(self, repo, page_size=100, sort=None):
+        self.repo = repo
+        self.page_size = page_size
+        self.sort = sort
+        self.descending = bool(sort and sort[1])
+        self.key_columns = sort_key_columns(sort)
+        self.rows = []
+        self.page = 1           # None jika nomor halaman belum diketahui (mis. setelah last())
+        self.has_prev = False
+        self.has_next = False
+        self.total = None
+
+        # SQL dibangun sekali per pager sehingga tetap dipakai ulang dari cache statement
+        forward, backward = order_by(sort), order_by(sort, reverse=True)
+        after, before = ('<', '>') if self.descending else ('>', '<')
+        select = f'SELECT {VERSIONED_COLUMNS} FROM pegawai'
+        self.sql_first = f'{select} ORDER BY {forward} LIMIT :limit'
+        self.sql_last = f'{select} ORDER BY {backward} LIMIT :limit'
+        self.sql_after = f'{select} WHERE {self._seek(after)} ORDER BY {forward} LIMIT :limit'
+        self.sql_from = f'{select} WHERE {self._seek(after, True)} ORDER BY {forward} LIMIT :limit'
+        self.sql_before = f'{select} WHERE {self._seek(before)} ORDER BY {backward} LIMIT :limit'
+        self.sql_key_at = (f'SELECT {", ".join(self.key_columns)} FROM pegawai '
+                           f'ORDER BY {forward} LIMIT 1 OFFSET :offset')
+
+    def _seek(self, op, inclusive=False):
+        """Kondisi keyset (kolom, id) op (:k, :id) yang tetap bisa memakai rentang indeks"""
+        id_op = op + '=' if inclusive else op
+        if self.key_columns == ('id',):
+            return f'id {id_op} :id'
+        column = self.key_columns[0]
+        key = f'{column}{SORT_COLLATIONS[column]}'
+        # Bentuk row value (k, id) > (?, ?) tidak dipakai SQLite sebagai rentang indeks
+        return f'{key} {op}= :k AND ({key} {op} :k OR id {id_op} :id)'
+
+    def _cursor(self, values):
+        """Parameter keyset dari nilai kolom kunci (urutan key_columns)"""
+        if len(values) == 1:
+            return {'id': values[0]}
+        return {'k': values[0], 'id': values[1]}
+
+    def _row_cursor(self, row):
+        return self._cursor([getattr(row, column) for column in self.key_columns])
+
+    def _sort_key(self, row):
+        """Kunci urut di Python yang setara dengan urutan SQL (NOCASE = lipat huruf ASCII)"""
+        return tuple(nama_key(value) if isinstance(value, str) else value
+                     for value in (getattr(row, column) for column in self.key_columns))
+
+    @property
+    def pages(self):
+        """Jumlah halaman, atau None jika total belum dihitung"""
+        if self.total is None:
+            return None
+        return max(1, -(-self.total // self.page_size))
+
+    def set_total(self, total):
+        self.total = total
+        if self.page is None and not self.has_next:
+            self.page = self.pages
+
+    def _query(self, sql, params, backward=False):
+        """Ambil satu halaman plus satu baris ekstra untuk mengetahui ada/tidaknya halaman lanjutan"""
+        params = dict(params, limit=self.page_size + 1)
+        rows = self.repo.remember_rows(self.repo.conn.execute(sql, params))
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backward:
+            rows.reverse()
+        return rows, more
+
+    def first(self):
+        self.rows, self.has_next = self._query(self.sql_first, {})
+        self.has_prev = False
+        self.page = 1
+        return self.rows
+
+    def next(self):
+        if not self.has_next:
+            return self.rows
+        rows, more = self._query(self.sql_after, self._row_cursor(self.rows[-1]))
+        if rows:
+            self.rows, self.has_next, self.has_prev = rows, more, True
+            if self.page is not None:
+                self.page += 1
+        else:
+            self.has_next = False
+        return self.rows
+
+    def prev(self):
+        if not self.has_prev or not self.rows:
+            return self.first()
+        rows, more = self._query(self.sql_before, self._row_cursor(self.rows[0]), backward=True)
+        if not rows:
+            return self.first()
+        self.rows, self.has_prev, self.has_next = rows, more, True
+        if not more:
+            self.page = 1
+        elif self.page is not None:
+            self.page -= 1
+        return self.rows
+
+    def last(self):
+        self.rows, self.has_prev = self._query(self.sql_last, {}, backward=True)
+        self.has_next = False
+        self.page = self.pages if self.has_prev else 1
+        if self.total is not None and self.rows:
+            # Halaman terakhir dari keyset selalu penuh; samakan dengan pembagian per nomor halaman
+            self.rows = self.rows[max(0, len(self.rows) - (self.total - 1) % self.page_size - 1):]
+        return self.rows
+
+    def jump(self, page):
+        """Lompat ke nomor halaman tertentu.
+
+        Mencari kunci awal halaman butuh OFFSET atas indeks kolom urut saja (tanpa
+        membaca isi baris); setelah itu halaman diambil dengan keyset seperti biasa.
+        """
+        page = max(1, int(page))
+        if page == 1:
+            return self.first()
+        row = self.repo.conn.execute(self.sql_key_at, {'offset': (page - 1) * self.page_size}).fetchone()
+        if row is None:
+            return self.last()
+        self.rows, self.has_next = self._query(self.sql_from, self._cursor(row))
+        self.has_prev = True
+        self.page = page
+        return self.rows
+
+    def reload(self):
+        """Baca ulang halaman saat ini mulai dari kunci pertamanya (setelah insert/delete)"""
+        if not self.rows or not self.has_prev:
+            return self.first()
+        rows, self.has_next = self._query(self.sql_from, self._row_cursor(self.rows[0]))
+        if not rows:
+            return self.prev()
+        self.rows = rows
+        return self.rows
+
+    # --- Antarmuka sumber data VirtualTable ---
+
+    def count(self):
+        return len(self.rows)
+
+    def fetch(self, offset, limit):
+        return self.rows[offset:offset + limit]
+
+    def refresh_row(self, row_id):
+        """Baca ulang satu baris di halaman; (baris, True) jika halaman ikut dibaca ulang.
+
+        Jika nilai kolom urut berubah, posisi baris di halaman ikut berubah walaupun
+        masih di rentang halaman ini, jadi halaman dibaca ulang dari kunci awalnya.
+        """
+        row = self.repo.get(row_id)
+        for index, cached in enumerate(self.rows):
+            if cached.id == row_id:
+                if row is not None and self._sort_key(row) != self._sort_key(cached):
+                    self.reload()
+                    return row, True
+                self.rows[index] = row
+                break
+        return row, False
+
+    def contains(self, row_id):
+        """Apakah baris (masih) ada dan kuncinya jatuh di rentang halaman ini"""
+        row = self.repo.get(row_id)
+        if row is None:
+            return False
+        if not self.rows:
+            return True
+        key = self._sort_key(row)
+        first, last = self._sort_key(self.rows[0]), self._sort_key(self.rows[-1])
+        if self.descending:
+            after_first, before_last = key <= first, key >= last
+        else:
+            after_first, before_last = key >= first, key <= last
+        # Sebelum baris pertama hanya masuk di halaman pertama
+        if not after_first:
+            return not self.has_prev
+        # Setelah baris terakhir hanya masuk di halaman terakhir yang belum penuh
+        return before_last or (not self.has_next and len(self.rows) < self.page_size)
+
+    def has_id(self, row_id):
+        return any(row.id == row_id for row in self.rows)
+
+    def insert_id(self, row_id):
+        self.reload()
+
+    def remove_id(self, row_id):
+        self.reload()
+
+    def apply_changes(self, inserted, removed):
+        # Satu kali baca ulang halaman untuk seluruh batch
+        self.reload()
+
+class RowCache:
+    """Cache baris pegawai per ID untuk jalur seleksi/edit/status, beserta versi barisnya.
+
+    Ukurannya dibatasi (LRU); setiap entri hanya (Employee, version) sehingga
+    tipe data tetap utuh, tidak lewat string Tcl. Repository memperbarui atau
+    membuang entri pada setiap tulis; perubahan dari proses lain dibuang lewat
+    invalidate() oleh pemanggil (change feed).
+    """
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, row_id):
+        """(Employee, version) atau None jika tidak ada di cache"""
+        entry = self.entries.get(row_id)
+        if entry is not None:
+            self.entries.move_to_end(row_id)
+        return entry
+
+    def put(self, row, version):
+        self.entries[row.id] = (row, version)
+        self.entries.move_to_end(row.id)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, row_ids):
+        for row_id in row_ids:
+            self.entries.pop(row_id, None)
+
+    def clear(self):
+        self.entries.clear()
+
+def _prefix_key(value):
+    return ' '.join(value.casefold().split())
+
+class PrefixIndex:
+    """Indeks prefiks nilai unik satu kolom untuk autocomplete (array terurut + bisect).
+
+    Kunci dibandingkan tanpa beda huruf besar/kecil dan spasi berlebih; setiap
+    kunci menyimpan jumlah pemakaian per ejaan, sehingga saran memakai ejaan
+    yang paling sering dan diurutkan dari nilai yang paling banyak dipakai.
+    """
+    def __init__(self, counts=()):
+        self.variants = {}
+        for value, count in counts:
+            self._count(value, count)
+        self.keys = sorted(self.variants)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _count(self, value, amount):
+        """Ubah jumlah pemakaian value; kembalikan kuncinya dan apakah kunci masih dipakai"""
+        key = _prefix_key(value)
+        variants = self.variants.setdefault(key, {})
+        total = variants.get(value, 0) + amount
+        if total > 0:
+            variants[value] = total
+        else:
+            variants.pop(value, None)
+        if not variants:
+            del self.variants[key]
+            return key, False
+        return key, True
+
+    def add(self, value, amount=1):
+        if not value:
+            return
+        key, _ = self._count(value, amount)
+        index = bisect.bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            self.keys.insert(index, key)
+
+    def discard(self, value, amount=1):
+        if not value or _prefix_key(value) not in self.variants:
+            return
+        key, used = self._count(value, -amount)
+        if not used:
+            index = bisect.bisect_left(self.keys, key)
+            if index < len(self.keys) and self.keys[index] == key:
+                del self.keys[index]
+
+    def suggest(self, prefix, limit=SUGGEST_LIMIT, scan=SUGGEST_SCAN):
+        """Nilai yang diawali prefix, terbanyak dipakai dulu.
+
+        Hanya scan kunci pertama (urut abjad) yang dinilai, sehingga prefiks
+        pendek pada kolom dengan puluhan ribu nilai tetap murah.
+        """
+        prefix = _prefix_key(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.keys, prefix)
+        matches = []
+        for key in self.keys[start:start + scan]:
+            if not key.startswith(prefix):
+                break
+            variants = self.variants[key]
+            value = max(variants, key=variants.get)
+            matches.append((-sum(variants.values()), key, value))
+        matches.sort()
+        return [value for _, _, value in matches[:limit]]
+
+class EmployeeRepository:
+    """Lapisan akses data pegawai: memegang koneksi, pragma, migrasi, CRUD dan pencarian.
+
+    Semua SQL aplikasi lewat kelas ini sehingga jalur penyimpanan bisa di-tuning
+    dan di-benchmark tanpa Tk. Satu instance hanya dipakai oleh satu thread;
+    thread lain (mis. worker pencarian) membuka instance sendiri.
+    """
+    def __init__(self, db_path=DB_FILE, journal_mode='WAL', synchronous='NORMAL',
+                 cache_size_kb=16384, mmap_size=256 * 1024 * 1024, busy_timeout_ms=5000,
+                 write_retries=3, retry_backoff_ms=50, row_cache_size=10000, check_same_thread=True):
+        self.db_path = db_path
+        self.row_cache = RowCache(row_cache_size)
+        self.write_retries = write_retries
+        self.retry_backoff_ms = retry_backoff_ms
+        # check_same_thread=False hanya untuk pemilik yang menjamin satu thread per waktu
+        # (mis. pool EmployeeServer yang menutup koneksinya setelah thread pool berhenti)
+        self.conn = sqlite3.connect(db_path, timeout=busy_timeout_ms / 1000,
+                                    cached_statements=256, check_same_thread=check_same_thread)
+        self.configure(journal_mode, synchronous, cache_size_kb, mmap_size, busy_timeout_ms)
+        self._use_fts = None
+        self._use_stats = None
+        self._use_fuzzy = None
+        # Indeks prefiks autocomplete per kolom dan nomor log perubahan terakhir yang sudah diterapkan
+        self.value_indexes = {}
+        self._value_seq = 0
+
+    def configure(self, journal_mode, synchronous, cache_size_kb, mmap_size, busy_timeout_ms):
+        """Terapkan pragma koneksi (WAL, synchronous, cache, mmap, busy timeout)"""
+        # WAL butuh shared memory lokal; untuk file di network drive pakai journal_mode='DELETE'
+        self.journal_mode = self.conn.execute(f'PRAGMA journal_mode = {journal_mode}').fetchone()[0]
+        self.conn.execute(f'PRAGMA synchronous = {synchronous}')
+        # Nilai negatif = ukuran dalam KiB, bukan jumlah halaman
+        self.conn.execute(f'PRAGMA cache_size = {-int(cache_size_kb)}')
+        self.conn.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+        self.conn.execute(f'PRAGMA busy_timeout = {int(busy_timeout_ms)}')
+        self.conn.execute('PRAGMA temp_store = MEMORY')
+
+    def init_schema(self):
+        """Buat tabel pegawai bila belum ada lalu jalankan migrasi skema"""
+        self.conn.execute(SQL_CREATE_TABLE)
+        self.conn.commit()
+        version = migrate_database(self.conn)
+        self._use_fts = None
+        self._use_stats = None
+        self._use_fuzzy = None
+        return version
+
+    def duplicate_names(self):
+        """Nama yang bentrok bila huruf besar/kecil diabaikan (satu per kelompok)"""
+        return duplicate_names(self.conn)
+
+    def dedupe_names(self):
+        """Rapikan nama ganda beda huruf besar/kecil (lihat dedupe_names); kembalikan (id, lama, baru)"""
+        return dedupe_names(self.conn)
+
+    @property
+    def use_fts(self):
+        """Apakah pencarian bisa memakai indeks FTS5"""
+        if self._use_fts is None:
+            self._use_fts = fts_available(self.conn)
+        return self._use_fts
+
+    def _write(self, sql, params, many=False):
+        """Jalankan satu transaksi tulis; ulangi dengan backoff jika database terkunci.
+
+        busy_timeout sudah menunggu kunci dilepas, tapi SQLite bisa langsung
+        mengembalikan SQLITE_BUSY (mis. snapshot WAL kedaluwarsa); kasus itu
+        diulang beberapa kali dengan jeda acak yang makin panjang.
+        """
+        if many:
+            return self._transaction(lambda conn: conn.executemany(sql, params))
+        return self._transaction(lambda conn: conn.execute(sql, params))
+
+    def _transaction(self, work):
+        """Jalankan work(conn) dalam satu transaksi, dengan retry yang sama seperti _write"""
+        delay = self.retry_backoff_ms / 1000
+        for attempt in range(self.write_retries + 1):
+            try:
+                with self.conn:
+                    return work(self.conn)
+            except sqlite3.OperationalError as e:
+                if attempt == self.write_retries or not is_busy_error(e):
+                    raise
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+
+    def _conflict(self, employee_id):
+        """Bangun ConflictError dengan data terbaru baris (dibaca ulang, bukan dari cache)"""
+        current, version = self.get_versioned(employee_id, cached=False)
+        return ConflictError(employee_id, current, version)
+
+    @property
+    def use_fuzzy(self):
+        """Apakah indeks trigram untuk pencarian fuzzy tersedia"""
+        if self._use_fuzzy is None:
+            self._use_fuzzy = fuzzy_available(self.conn)
+        return self._use_fuzzy
+
+    @property
+    def use_stats(self):
+        """Apakah tabel ringkasan statistik tersedia"""
+        if self._use_stats is None:
+            self._use_stats = stats_available(self.conn)
+        return self._use_stats
+
+    # --- CRUD ---
+
+    def remember_rows(self, rows):
+        """Ubah baris mentah (VERSIONED_COLUMNS) menjadi Employee dan simpan di row_cache"""
+        result = []
+        for row in rows:
+            employee = Employee(*row[:-1])
+            self.row_cache.put(employee, row[-1])
+            result.append(employee)
+        return result
+
+    def get(self, employee_id):
+        """Ambil satu pegawai sebagai Employee (selalu dari database), atau None"""
+        row = self.conn.execute(SQL_GET_VERSIONED, (employee_id,)).fetchone()
+        if row is None:
+            self.row_cache.invalidate((employee_id,))
+            return None
+        return self.remember_rows((row,))[0]
+
+    def get_versioned(self, employee_id, cached=True):
+        """Ambil (Employee, version) untuk edit optimistik, atau (None, None).
+
+        Dengan cached=True baris dari row_cache dipakai tanpa query; jika ternyata
+        sudah basi, update/delete compare-and-swap akan menolaknya dengan ConflictError.
+        """
+        if cached:
+            entry = self.row_cache.get(employee_id)
+            if entry is not None:
+                return entry
+        row = self.conn.execute(SQL_GET_VERSIONED, (employee_id,)).fetchone()
+        if row is None:
+            self.row_cache.invalidate((employee_id,))
+            return None, None
+        return self.remember_rows((row,))[0], row[-1]
+
+    def get_many(self, ids):
+        """Ambil beberapa pegawai sekaligus (urutan tidak dijamin)"""
+        placeholders = ','.join('?' * len(ids))
+        rows = self.conn.execute(
+            f'SELECT {VERSIONED_COLUMNS} FROM pegawai WHERE id IN ({placeholders})', tuple(ids))
+        return self.remember_rows(rows)
+
+    def get_name(self, employee_id):
+        """Ambil nama pegawai (dari row_cache bila ada), atau None jika tidak ada"""
+        entry = self.row_cache.get(employee_id)
+        if entry is not None:
+            return entry[0].nama
+        row = self.conn.execute(SQL_GET_NAME, (employee_id,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, nama, alamat, posisi, tahun_masuk):
+        """Tambah pegawai dan kembalikan ID barunya.
+
+        Nama ganda (tanpa beda huruf besar/kecil) memunculkan sqlite3.IntegrityError.
+        """
+        cursor = self._write(SQL_INSERT, (nama, alamat, posisi, int(tahun_masuk)))
+        row = Employee(cursor.lastrowid, nama, alamat, posisi, int(tahun_masuk))
+        self.row_cache.put(row, 1)
+        return cursor.lastrowid
+
+    def update(self, employee_id, nama, alamat, posisi, tahun_masuk, expected_version=None):
+        """Update pegawai; kembalikan True jika barisnya ada.
+
+        Dengan expected_version, update hanya terjadi jika versi baris masih sama
+        (compare-and-swap); jika tidak, ConflictError berisi data terbaru.
+        """
+        values = (nama, alamat, posisi, int(tahun_masuk), employee_id)
+        row = Employee(employee_id, nama, alamat, posisi, int(tahun_masuk))
+        if expected_version is None:
+            # Versi baru tidak diketahui tanpa membaca ulang: buang dari cache
+            self.row_cache.invalidate((employee_id,))
+            if self._write(SQL_UPDATE, values).rowcount == 0:
+                return False
+        else:
+            if self._write(SQL_UPDATE_CAS, values + (expected_version,)).rowcount == 0:
+                raise self._conflict(employee_id)
+            self.row_cache.put(row, expected_version + 1)
+        return True
+
+    def add_many(self, rows):
+        """Tambah banyak pegawai dalam satu transaksi (executemany).
+
+        Jika satu baris melanggar constraint, seluruh batch dibatalkan dan
+        sqlite3.IntegrityError diteruskan ke pemanggil.
+        """
+        self._write(SQL_INSERT, rows, many=True)
+        return len(rows)
+
+    def get_versioned_many(self, ids, chunk_size=500):
+        """{id: (Employee, version)} untuk banyak ID: dari row_cache, sisanya satu query per chunk.
+
+        ID yang sudah tidak ada tidak muncul di hasil.
+        """
+        result = {}
+        missing = []
+        for row_id in ids:
+            entry = self.row_cache.get(row_id)
+            if entry is None:
+                missing.append(row_id)
+            else:
+                result[row_id] = entry
+        for start in range(0, len(missing), chunk_size):
+            chunk = tuple(missing[start:start + chunk_size])
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT {VERSIONED_COLUMNS} FROM pegawai WHERE id IN ({placeholders})', chunk).fetchall()
+            for employee, row in zip(self.remember_rows(rows), rows):
+                result[employee.id] = (employee, row[-1])
+        return result
+
+    def delete_many(self, versions):
+        """Hapus banyak pegawai dalam satu transaksi; versions adalah {id: version}.
+
+        Baris yang versinya sudah berubah (atau sudah dihapus) dilewati, bukan
+        membatalkan batch. Kembalikan (ID terhapus, ID konflik).
+        """
+        def work(conn):
+            deleted, conflicts = [], []
+            for row_id, version in versions.items():
+                changed = conn.execute(SQL_DELETE_CAS, (row_id, version)).rowcount
+                (deleted if changed else conflicts).append(row_id)
+            return deleted, conflicts
+
+        self.row_cache.invalidate(versions)
+        return self._transaction(work)
+
+    def update_many(self, versions, fields):
+        """Ubah field yang sama (lihat BATCH_FIELDS) untuk banyak pegawai dalam satu transaksi.
+
+        versions adalah {id: version}; compare-and-swap per baris seperti delete_many.
+        Kembalikan (ID terupdate, ID konflik).
+        """
+        fields = validate_fields(fields)
+        assignments = ', '.join(f'{field}=?' for field in fields)
+        sql = f'UPDATE pegawai SET {assignments}, version=version+1 WHERE id=? AND version=?'
+        values = tuple(fields.values())
+
+        def work(conn):
+            updated, conflicts = [], []
+            for row_id, version in versions.items():
+                changed = conn.execute(sql, values + (row_id, version)).rowcount
+                (updated if changed else conflicts).append(row_id)
+            return updated, conflicts
+
+        cached = {row_id: self.row_cache.get(row_id) for row_id in versions}
+        self.row_cache.invalidate(versions)
+        updated, conflicts = self._transaction(work)
+        for row_id in updated:
+            entry = cached[row_id]
+            if entry is not None and entry[1] == versions[row_id]:
+                self.row_cache.put(entry[0]._replace(**fields), entry[1] + 1)
+        return updated, conflicts
+
+    def existing_names(self, names, chunk_size=500):
+        """Nama (tanpa beda huruf besar/kecil) yang sudah terdaftar, lewat probe indeks NOCASE"""
+        found = set()
+        for start in range(0, len(names), chunk_size):
+            chunk = tuple(names[start:start + chunk_size])
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT nama FROM pegawai WHERE nama COLLATE NOCASE IN ({placeholders})',
+                chunk).fetchall()
+            found.update(nama_key(row[0]) for row in rows)
+        return found
+
+    def delete(self, employee_id, expected_version=None):
+        """Hapus pegawai; kembalikan True jika barisnya ada.
+
+        Dengan expected_version, baris yang sudah diubah penulis lain tidak
+        dihapus dan ConflictError dimunculkan.
+        """
+        self.row_cache.invalidate((employee_id,))
+        if expected_version is None:
+            if self._write(SQL_DELETE, (employee_id,)).rowcount == 0:
+                return False
+        elif self._write(SQL_DELETE_CAS, (employee_id, expected_version)).rowcount == 0:
+            raise self._conflict(employee_id)
+        return True
+
+    # --- Query untuk tabel dan pencarian ---
+
+    def list_page(self, after_id=0, limit=50):
+        """Satu halaman pegawai setelah ID tertentu (keyset, tanpa OFFSET)"""
+        rows = self.conn.execute(SQL_PAGE_AFTER, (after_id, limit)).fetchall()
+        return [Employee(*row) for row in rows]
+
+    def pager(self, page_size=100, sort=None):
+        """Sumber data tabel per halaman (keyset), dimulai dari halaman pertama"""
+        pager = KeysetPager(self, page_size, sort)
+        pager.first()
+        return pager
+
+    def search_source(self, term, ids, sort=None, fuzzy=False):
+        """Sumber data tabel dari hasil iter_search_ids (atau fuzzy_search) untuk kata kunci yang sama"""
+        return PegawaiIdList(self, ids, term, self.use_fts, sort, fuzzy)
+
+    def fuzzy_search(self, term, limit=100, min_similarity=DEFAULT_MIN_SIMILARITY):
+        """Nama yang mirip term (toleran salah ketik), urut kemiripan: [(id, skor 0..1)].
+
+        Indeks nama_trigram mempersempit kandidat (nama yang berbagi cukup banyak
+        trigram) dengan satu query GROUP BY; hanya kandidat itu yang dinilai
+        dengan edit distance di Python.
+        """
+        term = ' '.join(term.split())
+        if len(term) < FUZZY_MIN_TERM or not self.use_fuzzy:
+            return []
+        grams = sorted(nama_trigrams(term))
+        placeholders = ','.join('?' * len(grams))
+        min_shared = max(1, round(len(grams) * FUZZY_MIN_SHARED))
+        candidates = self.conn.execute(f'''
+            SELECT p.id, p.nama, c.shared FROM (
+                SELECT pegawai_id, COUNT(*) AS shared FROM nama_trigram
+                WHERE gram IN ({placeholders})
+                GROUP BY pegawai_id HAVING shared >= ?
+                ORDER BY shared DESC, pegawai_id LIMIT ?
+            ) AS c JOIN pegawai p ON p.id = c.pegawai_id
+        ''', grams + [min_shared, FUZZY_CANDIDATES]).fetchall()
+        return rank_names(term, candidates, limit, min_similarity)
+
+    def iter_search_ids(self, term, batch_size=5000, sort=None):
+        """Hasilkan ID pegawai yang cocok per batch (berperingkat bila memakai FTS5 tanpa sort)"""
+        sql, params = search_ids_query(term, self.use_fts, sort)
+        cursor = self.conn.execute(sql, params)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield [row[0] for row in batch]
+
+    def iter_rows(self, term=None, batch_size=5000, sort=None):
+        """Hasilkan baris Employee per batch (fetchmany), untuk seluruh tabel atau hasil pencarian"""
+        sql, params = search_rows_query(term, self.use_fts, sort)
+        cursor = self.conn.execute(sql, params)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            yield [Employee(*row) for row in batch]
+
+    def iter_rows_by_ids(self, ids, chunk_size=500):
+        """Hasilkan baris Employee per batch untuk daftar ID, dengan urutan daftar itu.
+
+        ID yang barisnya sudah dihapus dilewati; batch kosong tidak dihasilkan.
+        """
+        for start in range(0, len(ids), chunk_size):
+            window = ids[start:start + chunk_size]
+            rows = {row.id: row for row in self.get_many(window)}
+            batch = [rows[i] for i in window if i in rows]
+            if batch:
+                yield batch
+
+    def search_page(self, term, limit=50, offset=0, sort=None):
+        """Satu halaman hasil pencarian (LIMIT/OFFSET) dengan urutan yang sama seperti iter_rows"""
+        sql, params = search_rows_query(term, self.use_fts, sort)
+        rows = self.conn.execute(f'{sql} LIMIT ? OFFSET ?', tuple(params) + (limit, offset)).fetchall()
+        return [Employee(*row) for row in rows]
+
+    def count_rows(self, term=None):
+        """Jumlah pegawai untuk seluruh tabel atau hasil pencarian"""
+        if not term:
+            # Jumlah total dibaca dari ringkasan per tahun: O(jumlah tahun), bukan O(baris)
+            sql = SQL_STATS_TOTAL if self.use_stats else SQL_COUNT
+            return self.conn.execute(sql).fetchone()[0]
+        sql, params = search_rows_query(term, self.use_fts)
+        return self.conn.execute(f'SELECT COUNT(*) FROM ({sql})', params).fetchone()[0]
+
+    # --- Statistik ---
+
+    def stats_by_posisi(self):
+        """Jumlah pegawai per posisi [(posisi, jumlah)], terbanyak dulu"""
+        return self.conn.execute(SQL_STATS_POSISI).fetchall()
+
+    def stats_by_tahun(self):
+        """Jumlah pegawai per tahun masuk [(tahun_masuk, jumlah)], urut tahun"""
+        return self.conn.execute(SQL_STATS_TAHUN).fetchall()
+
+    # --- Autocomplete form ---
+
+    def build_value_indexes(self):
+        """Bangun PrefixIndex semua kolom autocomplete dari satu snapshot baca.
+
+        Kembalikan (indeks, seq) dengan seq nomor log perubahan terakhir di snapshot
+        itu; aman dijalankan di thread lain dengan instance repository sendiri,
+        hasilnya dipasang lewat install_value_indexes().
+        """
+        self.conn.execute('BEGIN')
+        try:
+            seq = self.last_change_seq()
+            indexes = {}
+            for column in AUTOCOMPLETE_COLUMNS:
+                if column == 'posisi' and self.use_stats:
+                    # Tabel ringkasan sudah berisi jumlah per posisi
+                    counts = self.conn.execute(SQL_STATS_POSISI)
+                else:
+                    counts = self.conn.execute(SQL_DISTINCT_VALUES[column])
+                indexes[column] = PrefixIndex(counts)
+        finally:
+            self.conn.rollback()
+        return indexes, seq
+
+    def install_value_indexes(self, indexes, seq):
+        """Pasang indeks hasil build_value_indexes(); perubahan setelah seq diterapkan dari log"""
+        self.value_indexes = indexes
+        self._value_seq = seq
+
+    def sync_value_indexes(self):
+        """Terapkan log perubahan sejak indeks dibangun (tulis sendiri maupun proses lain).
+
+        Jika log tertinggal lebih dari VALUE_SYNC_LIMIT entri atau sebagian sudah
+        dipangkas, indeks dibuang dan harus dibangun ulang.
+        """
+        if not self.value_indexes:
+            return
+        rows = self.conn.execute(SQL_VALUE_CHANGES, (self._value_seq, VALUE_SYNC_LIMIT + 1)).fetchall()
+        if not rows:
+            return
+        if len(rows) > VALUE_SYNC_LIMIT or rows[0][0] != self._value_seq + 1:
+            self.reset_value_indexes()
+            return
+        for row in rows:
+            for position, column in enumerate(AUTOCOMPLETE_COLUMNS):
+                index = self.value_indexes[column]
+                index.discard(row[1 + 2 * position])
+                index.add(row[2 + 2 * position])
+        self._value_seq = rows[-1][0]
+
+    def value_index(self, column, build=True):
+        """PrefixIndex column yang sudah sinkron dengan log perubahan.
+
+        Jika indeks belum ada, dibangun di sini (build=True) atau None dikembalikan
+        supaya pemanggil bisa membangunnya di latar belakang.
+        """
+        self.sync_value_indexes()
+        if not self.value_indexes:
+            if not build:
+                return None
+            self.install_value_indexes(*self.build_value_indexes())
+        return self.value_indexes[column]
+
+    def suggest(self, column, prefix, limit=SUGGEST_LIMIT, build=True):
+        """Saran nilai column yang diawali prefix; None jika indeks belum ada dan build=False"""
+        index = self.value_index(column, build)
+        return None if index is None else index.suggest(prefix, limit)
+
+    def reset_value_indexes(self):
+        """Buang indeks autocomplete (mis. setelah restore); dibangun ulang saat dipakai"""
+        self.value_indexes = {}
+
+    # --- Log perubahan antar proses ---
+
+    def data_version(self):
+        """PRAGMA data_version: berubah hanya jika koneksi lain meng-commit perubahan"""
+        return self.conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def last_change_seq(self):
+        """Nomor urut perubahan terakhir di pegawai_changes"""
+        return self.conn.execute(SQL_LAST_CHANGE).fetchone()[0]
+
+    def changes_since(self, seq, limit=1000):
+        """Perubahan setelah nomor urut seq: daftar (seq, pegawai_id, op) dengan op 'I'/'U'/'D'"""
+        return self.conn.execute(SQL_CHANGES_SINCE, (seq, limit)).fetchall()
+
+    def prune_changes(self, keep=CHANGE_LOG_KEEP):
+        """Buang log perubahan lama, sisakan keep entri terakhir"""
+        cutoff = self.last_change_seq() - keep
+        if cutoff > 0:
+            self._write(SQL_PRUNE_CHANGES, (cutoff,))
+
+    def interrupt(self):
+        """Batalkan query yang sedang berjalan (aman dipanggil dari thread lain)"""
+        self.conn.interrupt()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,504 @@
+"""API HTTP/JSON lokal (asyncio) untuk data pegawai, tanpa dependensi di luar stdlib.
+
+Contoh:
+    python -m EmployeeServer --port 8765
+    curl 'http://127.0.0.1:8765/pegawai?after=0&limit=20'
+    curl -X POST http://127.0.0.1:8765/pegawai -d '{"nama": "Aldi", "alamat": "Jambi", ...}'
+
+Event loop hanya mengurus HTTP. Query baca dijalankan di pool thread kecil
+yang masing-masing memegang satu koneksi SQLite (WAL: pembaca tidak saling
+menunggu), sedangkan semua tulis masuk antrean satu thread penulis sehingga
+tidak ada dua transaksi tulis yang berebut kunci database. Validasi memakai
+validate_employee / validate_fields yang sama dengan form GUI.
+
+Endpoint:
+    GET    /pegawai?after=&limit=            halaman keyset urut ID
+    GET    /pegawai/search?q=&limit=&offset= hasil pencarian (&fuzzy=1: nama mirip)
+    GET    /pegawai/<id>                     satu pegawai beserta version
+    POST   /pegawai                          tambah pegawai
+    PATCH  /pegawai/<id>                     ubah sebagian field ("version" opsional, CAS)
+    PUT    /pegawai/<id>                     ganti seluruh data (semua field wajib)
+    DELETE /pegawai/<id>?version=            hapus pegawai
+    GET    /pegawai/batch?ids=1,2,3          banyak pegawai sekaligus
+    POST   /pegawai/batch                    {"items": [...]} tambah banyak (satu transaksi)
+    PATCH  /pegawai/batch                    {"versions": {id: version}, "fields": {...}}
+    DELETE /pegawai/batch                    {"versions": {id: version}}
+    GET    /stats, /metrics, /health
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from EmployeeMetrics import OperationMetrics
+from EmployeeRepository import (DB_FILE, EmployeeRepository, ConflictError, ValidationError,
+                                validate_employee, validate_fields)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Koneksi baca (satu per thread); penulis selalu tepat satu
+DEFAULT_READERS = 4
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_SIZE = 1000
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+# Koneksi keep-alive yang diam lebih lama dari ini ditutup
+IDLE_TIMEOUT_S = 30
+
+log = logging.getLogger(__name__)
+
+class ApiError(Exception):
+    """Error yang dikirim ke klien sebagai {"error": ...} dengan status HTTP tertentu"""
+    def __init__(self, status, message, **extra):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.extra = extra
+
+def _employee_json(row, version=None):
+    data = row._asdict()
+    if version is not None:
+        data['version'] = version
+    return data
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' harus berupa angka")
+    if value < minimum:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' minimal {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+def _body_version(body):
+    """Nilai "version" dari body (None jika tidak dikirim); harus bilangan bulat"""
+    version = body.get('version')
+    if version is None:
+        return None
+    if isinstance(version, bool) or not isinstance(version, int):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Field 'version' harus berupa angka")
+    return version
+
+def _versions(body):
+    """{"versions": {"id": version}} dari body batch menjadi {int: int}"""
+    versions = body.get('versions')
+    if not isinstance(versions, dict) or not versions:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Body harus berisi 'versions': {id: version}")
+    if len(versions) > MAX_BATCH_SIZE:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Maksimal {MAX_BATCH_SIZE} pegawai per batch")
+    try:
+        return {int(row_id): int(version) for row_id, version in versions.items()}
+    except (TypeError, ValueError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "ID dan version harus berupa angka")
+
+class EmployeeServer:
+    """Server HTTP/1.1 (keep-alive) di atas EmployeeRepository.
+
+    Pembaca memakai ThreadPoolExecutor dengan satu repository per thread;
+    penulis adalah executor satu thread, yang sekaligus menjadi antrean tulis.
+    row_cache repository dimatikan karena baris bisa diubah koneksi lain kapan saja.
+    """
+    def __init__(self, db_path=DB_FILE, readers=DEFAULT_READERS, busy_timeout_ms=5000, metrics=None):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.metrics = metrics or OperationMetrics()
+        self.readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='api-reader')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-writer')
+        self._local = threading.local()
+        self._repos = []
+        self._repos_lock = threading.Lock()
+        self.server = None
+        # Task handle_connection yang masih berjalan (termasuk koneksi keep-alive yang menganggur)
+        self._connections = set()
+        self.routes = [
+            ('GET', r'/health', self.health),
+            ('GET', r'/metrics', self.get_metrics),
+            ('GET', r'/stats', self.stats),
+            ('GET', r'/pegawai', self.list_employees),
+            ('GET', r'/pegawai/search', self.search),
+            ('GET', r'/pegawai/batch', self.get_batch),
+            ('POST', r'/pegawai/batch', self.create_batch),
+            ('PATCH', r'/pegawai/batch', self.update_batch),
+            ('DELETE', r'/pegawai/batch', self.delete_batch),
+            ('GET', r'/pegawai/(\d+)', self.get_employee),
+            ('POST', r'/pegawai', self.create_employee),
+            ('PATCH', r'/pegawai/(\d+)', self.update_employee),
+            ('PUT', r'/pegawai/(\d+)', self.replace_employee),
+            ('DELETE', r'/pegawai/(\d+)', self.delete_employee),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), handler)
+                       for method, pattern, handler in self.routes]
+
+    # --- Koneksi database ---
+
+    def _repo(self):
+        """Repository milik thread executor ini (dibuat saat pertama dipakai)"""
+        repo = getattr(self._local, 'repo', None)
+        if repo is None:
+            # Tetap satu thread per koneksi; check_same_thread dimatikan hanya supaya close()
+            # bisa menutupnya dari thread event loop setelah executor berhenti
+            repo = EmployeeRepository(self.db_path, busy_timeout_ms=self.busy_timeout_ms,
+                                      row_cache_size=0, check_same_thread=False)
+            self._local.repo = repo
+            with self._repos_lock:
+                self._repos.append(repo)
+        return repo
+
+    async def read(self, work):
+        """Jalankan work(repo) di salah satu koneksi baca"""
+        return await asyncio.get_running_loop().run_in_executor(self.readers, lambda: work(self._repo()))
+
+    async def write(self, work):
+        """Jalankan work(repo) di antrean penulis tunggal"""
+        return await asyncio.get_running_loop().run_in_executor(self.writer, lambda: work(self._repo()))
+
+    # --- Siklus hidup ---
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        # Migrasi skema sekali, lewat penulis, sebelum menerima request
+        await self.write(lambda repo: repo.init_schema())
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        address = await self.start(host, port)
+        print(f"🌐 API pegawai berjalan di http://{address[0]}:{address[1]}", file=sys.stderr)
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Koneksi keep-alive tidak ikut ditutup server.close(): hentikan handler-nya
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self.server.wait_closed()
+        for executor in (self.readers, self.writer):
+            executor.shutdown(wait=True)
+        # Semua thread pool sudah berhenti: tidak ada lagi yang memakai koneksi ini
+        with self._repos_lock:
+            repos, self._repos = self._repos, []
+        for repo in repos:
+            repo.close()
+
+    # --- HTTP ---
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT_S)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ApiError as e:
+                    # Sisa request yang rusak tidak bisa dibaca dengan aman: jawab lalu tutup
+                    await self._send(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                status, payload = await self.dispatch(method, target, body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass  # Klien menutup koneksi di tengah respons
+        except Exception:
+            log.exception("Error tak terduga saat melayani koneksi")
+            try:
+                await self._send(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                 {'error': "Kesalahan internal server"}, keep_alive=False)
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+            try:
+                # Tunggu transport benar-benar tertutup supaya socket tidak menumpuk
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass  # Klien sudah memutus koneksi
+            finally:
+                self._connections.discard(task)
+
+    async def _read_request(self, reader):
+        """(method, target, body, keep_alive), atau None jika klien menutup koneksi"""
+        line = await self._readline(reader, HTTPStatus.BAD_REQUEST, "Request line terlalu panjang")
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Request line tidak valid")
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._readline(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        "Baris header terlalu panjang")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Header terlalu banyak")
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Content-Length tidak valid")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body terlalu besar")
+        body = await reader.readexactly(length) if length else b''
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        return method.upper(), target, body, keep_alive
+
+    @staticmethod
+    async def _readline(reader, status, message):
+        """readline() yang mengubah baris melebihi batas StreamReader menjadi ApiError(status)"""
+        try:
+            return await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise ApiError(status, message)
+
+    async def _send(self, writer, status, payload, keep_alive):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        status = HTTPStatus(status)
+        head = [f'HTTP/1.1 {status.value} {status.phrase}',
+                f'Content-Length: {len(body)}',
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if body:
+            head.append('Content-Type: application/json; charset=utf-8')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, body):
+        """Cocokkan route lalu jalankan handler; kembalikan (status, payload JSON)"""
+        start = time.perf_counter()
+        url = urlsplit(target)
+        operation = 'api (route tidak dikenal)'
+        try:
+            handler, args, operation = self._route(method, url.path)
+            query = parse_qs(url.query)
+            data = self._json_body(body) if method in ('POST', 'PUT', 'PATCH', 'DELETE') else {}
+            status, payload = await handler(query, data, *args)
+        except ApiError as e:
+            status, payload = e.status, dict(e.extra, error=e.message)
+        except ValidationError as e:
+            status, payload = HTTPStatus.UNPROCESSABLE_ENTITY, {'error': e.message, 'field': e.field}
+        except ConflictError as e:
+            payload = {'error': e.message, 'id': e.employee_id}
+            if e.current is not None:
+                payload['current'] = _employee_json(e.current, e.current_version)
+            status = HTTPStatus.CONFLICT
+        except sqlite3.IntegrityError:
+            status, payload = HTTPStatus.CONFLICT, {'error': "Nama pegawai sudah terdaftar! Gunakan nama yang berbeda."}
+        except sqlite3.Error as e:
+            status, payload = HTTPStatus.SERVICE_UNAVAILABLE, {'error': f"Database error: {e}"}
+        except Exception:
+            log.exception("Error tak terduga pada %s %s", method, target)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Kesalahan internal server"}
+        self.metrics.record(operation, (time.perf_counter() - start) * 1000)
+        self.metrics.count(f'http.{int(status)}')
+        return status, payload
+
+    def _route(self, method, path):
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                return handler, [int(arg) for arg in match.groups()], f'api {method} {pattern.pattern[:-1]}'
+            allowed = True
+        if allowed:
+            raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method {method} tidak didukung untuk {path}")
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Endpoint {path} tidak ditemukan")
+
+    @staticmethod
+    def _json_body(body):
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"JSON tidak valid: {e}")
+        if not isinstance(data, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body harus berupa objek JSON")
+        return data
+
+    # --- Handler: baca ---
+
+    async def health(self, query, body):
+        return HTTPStatus.OK, {'ok': True}
+
+    async def get_metrics(self, query, body):
+        return HTTPStatus.OK, json.loads(self.metrics.to_json())
+
+    async def stats(self, query, body):
+        def work(repo):
+            return {'total': repo.count_rows(),
+                    'posisi': dict(repo.stats_by_posisi()),
+                    'tahun_masuk': {str(year): count for year, count in repo.stats_by_tahun()}}
+        return HTTPStatus.OK, await self.read(work)
+
+    async def list_employees(self, query, body):
+        after = _int_param(query, 'after', 0)
+        limit = _int_param(query, 'limit', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        rows = await self.read(lambda repo: repo.list_page(after, limit))
+        return HTTPStatus.OK, {'items': [row._asdict() for row in rows],
+                               'next_after': rows[-1].id if len(rows) == limit else None}
+
+    async def search(self, query, body):
+        term = (query.get('q') or [''])[0].strip()
+        if not term:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Parameter 'q' wajib diisi")
+        limit = _int_param(query, 'limit', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        offset = _int_param(query, 'offset', 0)
+        if (query.get('fuzzy') or ['0'])[0] in ('1', 'true'):
+            def work(repo):
+                matches = repo.fuzzy_search(term, offset + limit)[offset:]
+                rows = {row.id: row for row in repo.get_many([row_id for row_id, _ in matches])} if matches else {}
+                return [dict(rows[row_id]._asdict(), skor=round(score, 3))
+                        for row_id, score in matches if row_id in rows]
+            items = await self.read(work)
+        else:
+            rows = await self.read(lambda repo: repo.search_page(term, limit, offset))
+            items = [row._asdict() for row in rows]
+        return HTTPStatus.OK, {'items': items,
+                               'next_offset': offset + limit if len(items) == limit else None}
+
+    async def get_employee(self, query, body, employee_id):
+        row, version = await self.read(lambda repo: repo.get_versioned(employee_id, cached=False))
+        if row is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Pegawai dengan ID {employee_id} tidak ditemukan")
+        return HTTPStatus.OK, _employee_json(row, version)
+
+    async def get_batch(self, query, body):
+        try:
+            ids = [int(value) for value in ','.join(query.get('ids', [])).split(',') if value]
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Parameter 'ids' harus berupa daftar angka")
+        if len(ids) > MAX_BATCH_SIZE:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Maksimal {MAX_BATCH_SIZE} pegawai per batch")
+        found = await self.read(lambda repo: repo.get_versioned_many(ids)) if ids else {}
+        return HTTPStatus.OK, {'items': [_employee_json(*found[row_id]) for row_id in ids if row_id in found],
+                               'missing': [row_id for row_id in ids if row_id not in found]}
+
+    # --- Handler: tulis (lewat antrean penulis) ---
+
+    async def create_employee(self, query, body):
+        values = validate_employee(body.get('nama'), body.get('alamat'), body.get('posisi'),
+                                   body.get('tahun_masuk'))
+        new_id = await self.write(lambda repo: repo.add(*values))
+        return HTTPStatus.CREATED, {'id': new_id, 'version': 1}
+
+    async def update_employee(self, query, body, employee_id, partial=True):
+        expected = _body_version(body)
+
+        def work(repo):
+            current, version = repo.get_versioned(employee_id, cached=False)
+            if current is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Pegawai dengan ID {employee_id} tidak ditemukan")
+            # PATCH: field yang tidak dikirim tetap memakai nilai lama (seperti EmployeeCLI update);
+            # PUT: field yang tidak dikirim dianggap kosong dan ditolak validasi
+            values = validate_employee(*(body.get(field, getattr(current, field) if partial else None)
+                                         for field in ('nama', 'alamat', 'posisi', 'tahun_masuk')))
+            # Tanpa "version" dari klien, CAS tetap melindungi dari tulis di antara baca dan update
+            repo.update(employee_id, *values, expected_version=version if expected is None else expected)
+            return (version if expected is None else expected) + 1
+
+        version = await self.write(work)
+        return HTTPStatus.OK, {'id': employee_id, 'version': version}
+
+    async def replace_employee(self, query, body, employee_id):
+        return await self.update_employee(query, body, employee_id, partial=False)
+
+    async def delete_employee(self, query, body, employee_id):
+        version = _int_param(query, 'version', None)
+        if version is None:
+            version = _body_version(body)
+        if not await self.write(lambda repo: repo.delete(employee_id, version)):
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Pegawai dengan ID {employee_id} tidak ditemukan")
+        return HTTPStatus.NO_CONTENT, None
+
+    async def create_batch(self, query, body):
+        items = body.get('items')
+        if not isinstance(items, list) or not items:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body harus berisi 'items': [pegawai, ...]")
+        if len(items) > MAX_BATCH_SIZE:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Maksimal {MAX_BATCH_SIZE} pegawai per batch")
+        rows, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValidationError('record', "Item bukan objek data pegawai")
+                rows.append(validate_employee(item.get('nama'), item.get('alamat'), item.get('posisi'),
+                                              item.get('tahun_masuk')))
+            except ValidationError as e:
+                errors.append({'index': index, 'field': e.field, 'error': e.message})
+        if errors:
+            # Satu transaksi: batch hanya masuk jika semua item valid
+            raise ApiError(HTTPStatus.UNPROCESSABLE_ENTITY, "Ada item yang tidak valid", items=errors)
+        inserted = await self.write(lambda repo: repo.add_many(rows))
+        return HTTPStatus.CREATED, {'inserted': inserted}
+
+    async def update_batch(self, query, body):
+        versions = _versions(body)
+        fields = body.get('fields') or {}
+        if not isinstance(fields, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body harus berisi 'fields': {kolom: nilai}")
+        fields = validate_fields(fields)
+        updated, conflicts = await self.write(lambda repo: repo.update_many(versions, fields))
+        return HTTPStatus.OK, {'updated': updated, 'conflicts': conflicts}
+
+    async def delete_batch(self, query, body):
+        versions = _versions(body)
+        deleted, conflicts = await self.write(lambda repo: repo.delete_many(versions))
+        return HTTPStatus.OK, {'deleted': deleted, 'conflicts': conflicts}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP/JSON lokal untuk data pegawai")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help="alamat yang didengarkan (default: %(default)s, hanya lokal)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS,
+                        help="jumlah koneksi baca (default: %(default)s)")
+    parser.add_argument('--busy-timeout', type=int, default=5000, metavar='MS',
+                        help="lama menunggu database yang dikunci penulis lain (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    server = EmployeeServer(args.db, args.readers, args.busy_timeout)
+
+    async def run():
+        try:
+            await server.serve_forever(args.host, args.port)
+        finally:
+            await server.close()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ Server gagal: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
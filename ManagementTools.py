@@ -1,112 +1,936 @@
+import argparse
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sqlite3
 from datetime import datetime
 import threading
 import time
+import queue
+from collections import deque
+from contextlib import contextmanager
+from array import array
+from EmployeeRepository import (DB_FILE, JOURNAL_MODES, EmployeeRepository, ConflictError,
+                                DuplicateNamesError, PegawaiIdList, ValidationError, AUTOCOMPLETE_COLUMNS,
+                                BATCH_FIELDS, validate_employee, validate_fields, is_busy_error)
+from EmployeeMetrics import OperationMetrics, StartupProfile
 
-class ModernNotification:
-    def __init__(self, parent, message, notification_type="info", duration=3000):
+# Jumlah hasil pencarian fuzzy (nama mirip) jika kata kunci tidak ditemukan persis
+FUZZY_RESULTS = 100
+
+# Jeda debounce pencarian
+SEARCH_DEBOUNCE_MS = 200
+SEARCH_POLL_MS = 30
+JOB_POLL_MS = 100
+PERF_OVERLAY_MS = 500
+
+# Pengecekan perubahan dari proses lain; lebih dari batas ini tampilan dimuat ulang saja
+CHANGE_POLL_MS = 1000
+CHANGE_BATCH_LIMIT = 200
+
+# Jeda refresh dashboard statistik setelah perubahan, dan lebar batang grafiknya
+STATS_REFRESH_MS = 300
+STATS_BAR_WIDTH = 20
+
+# Atribut EmployeeManagement yang menyimpan ID root.after; semuanya dibatalkan oleh close()
+AFTER_ID_ATTRIBUTES = ('_startup_after_id', '_search_after_id', '_search_poll_id', '_stats_after_id',
+                       '_overlay_after_id', '_change_after_id', '_backup_after_id')
+
+# Anggaran satu frame: event berfrekuensi tinggi diproses paling banyak sekali per frame
+FRAME_MS = 16
+
+# Ukuran jendela awal (posisi tengah layar dihitung tanpa menunggu layout)
+WINDOW_WIDTH = 1000
+WINDOW_HEIGHT = 700
+
+# Backup otomatis: interval (menit, 0 = nonaktif), jumlah file yang disimpan, dan jeda minimal
+# setelah startup sebelum backup yang sudah jatuh tempo dijalankan
+BACKUP_INTERVAL_MIN = 60
+BACKUP_KEEP = 10
+BACKUP_STARTUP_DELAY_MS = 30000
+
+# Jumlah baris per halaman pada daftar lengkap (keyset pagination)
+PAGE_SIZE = 100
+
+# Judul kolom Treeview dan kolom database yang diurutkan saat judul diklik
+SORT_HEADINGS = {
+    'ID': ('🆔 ID', 'id'),
+    'Nama': ('👤 Nama Lengkap', 'nama'),
+    'Alamat': ('🏠 Alamat', 'alamat'),
+    'Posisi': ('💼 Posisi', 'posisi'),
+    'Tahun Masuk': ('📅 Tahun Masuk', 'tahun_masuk'),
+}
+
+# Nama pegawai yang ditampilkan di dialog konfirmasi hapus/edit massal
+BATCH_PREVIEW_NAMES = 5
+
+# Animasi notifikasi (satu timer untuk semua jendela)
+NOTIFICATION_FADE_MS = 20
+NOTIFICATION_FADE_STEP = 0.05
+NOTIFICATION_ALPHA = 0.95
+NOTIFICATION_GAP = 8
+
+class NotificationManager:
+    """Notifikasi modern dengan pool jendela yang dipakai ulang.
+
+    Paling banyak pool_size Toplevel dibuat sekali lalu hanya disembunyikan/
+    ditampilkan; pesan yang sama digabung (×n) dan sisanya diantrekan. Semua
+    fade dan auto-hide digerakkan oleh satu timer, dan alpha disimpan di Python
+    sehingga tidak perlu membaca attributes('-alpha') setiap tick.
+    """
+    # Warna berdasarkan tipe notifikasi
+    COLORS = {
+        "success": {"bg": "#10B981", "fg": "white"},
+        "error": {"bg": "#EF4444", "fg": "white"},
+        "warning": {"bg": "#F59E0B", "fg": "white"},
+        "info": {"bg": "#3B82F6", "fg": "white"}
+    }
+
+    # Icon berdasarkan tipe
+    ICONS = {
+        "success": "✓",
+        "error": "✗",
+        "warning": "⚠",
+        "info": "ⓘ"
+    }
+
+    def __init__(self, parent, pool_size=3, duration=3000, max_queue=20):
         self.parent = parent
-        self.message = message
-        self.type = notification_type
+        self.pool_size = pool_size
         self.duration = duration
-        
-        # Warna berdasarkan tipe notifikasi
-        self.colors = {
-            "success": {"bg": "#10B981", "fg": "white"},
-            "error": {"bg": "#EF4444", "fg": "white"},
-            "warning": {"bg": "#F59E0B", "fg": "white"},
-            "info": {"bg": "#3B82F6", "fg": "white"}
-        }
-        
-        self.show_notification()
-    
-    def show_notification(self):
-        # Buat window notifikasi
-        self.notification = tk.Toplevel(self.parent)
-        self.notification.withdraw()  # Sembunyikan dulu
-        self.notification.overrideredirect(True)  # Hilangkan title bar
-        self.notification.attributes('-alpha', 0.0)  # Mulai transparan
-        self.notification.attributes('-topmost', True)  # Selalu di atas
-        
-        # Frame utama notifikasi
-        color = self.colors.get(self.type, self.colors["info"])
-        frame = tk.Frame(self.notification, bg=color["bg"], padx=20, pady=15)
-        frame.pack(fill='both', expand=True)
-        
-        # Icon berdasarkan tipe
-        icons = {
-            "success": "✓",
-            "error": "✗",
-            "warning": "⚠",
-            "info": "ⓘ"
-        }
-        
-        # Label icon
-        icon_label = tk.Label(frame, text=icons.get(self.type, "ⓘ"), 
-                             bg=color["bg"], fg=color["fg"], 
-                             font=('Arial', 16, 'bold'))
-        icon_label.pack(side='left', padx=(0, 10))
-        
-        # Label pesan
-        message_label = tk.Label(frame, text=self.message, 
-                               bg=color["bg"], fg=color["fg"],
-                               font=('Arial', 11, 'normal'),
-                               wraplength=300)
-        message_label.pack(side='left', fill='x', expand=True)
-        
-        # Posisikan di tengah atas parent window
-        self.notification.update_idletasks()
+        self.slots = []
+        self.pending = deque(maxlen=max_queue)  # Pesan terlama dibuang jika antrean penuh
+        self._after_id = None
+
+    def show(self, message, notification_type="info"):
+        """Tampilkan pesan; duplikat yang sedang tampil/antre hanya menaikkan hitungan"""
+        key = (notification_type, message)
+        for slot in self.slots:
+            if slot.active and slot.key == key:
+                slot.count += 1
+                slot.expires = time.monotonic() + self.duration / 1000
+                slot.target = NOTIFICATION_ALPHA
+                self._set_text(slot)
+                self._schedule(0)
+                return
+        for entry in self.pending:
+            if entry[0] == key:
+                entry[1] += 1
+                return
+
+        slot = self._free_slot()
+        if slot is None:
+            self.pending.append([key, 1])
+            return
+        self._open(slot, key, 1)
+
+    def _free_slot(self):
+        for slot in self.slots:
+            if not slot.active:
+                return slot
+        if len(self.slots) < self.pool_size:
+            slot = self._create_slot()
+            self.slots.append(slot)
+            return slot
+        return None
+
+    def _create_slot(self):
+        """Buat satu jendela notifikasi (sekali saja, lalu dipakai ulang)"""
+        window = tk.Toplevel(self.parent)
+        window.withdraw()  # Sembunyikan dulu
+        window.overrideredirect(True)  # Hilangkan title bar
+        window.attributes('-alpha', 0.0)  # Mulai transparan
+        window.attributes('-topmost', True)  # Selalu di atas
+
+        slot = _NotificationSlot(window)
+        slot.frame = tk.Frame(window, padx=20, pady=15)
+        slot.frame.pack(fill='both', expand=True)
+        slot.icon_label = tk.Label(slot.frame, font=('Arial', 16, 'bold'))
+        slot.icon_label.pack(side='left', padx=(0, 10))
+        slot.message_label = tk.Label(slot.frame, font=('Arial', 11, 'normal'), wraplength=300)
+        slot.message_label.pack(side='left', fill='x', expand=True)
+        return slot
+
+    def _open(self, slot, key, count):
+        notification_type, _ = key
+        color = self.COLORS.get(notification_type, self.COLORS["info"])
+        slot.key = key
+        slot.count = count
+        slot.active = True
+        slot.target = NOTIFICATION_ALPHA
+        slot.expires = time.monotonic() + self.duration / 1000
+
+        slot.frame.configure(bg=color["bg"])
+        slot.icon_label.configure(text=self.ICONS.get(notification_type, "ⓘ"),
+                                  bg=color["bg"], fg=color["fg"])
+        slot.message_label.configure(bg=color["bg"], fg=color["fg"])
+        self._set_text(slot)
+
+        if not slot.shown:
+            slot.alpha = 0.0
+            slot.window.attributes('-alpha', 0.0)
+            slot.window.deiconify()
+            slot.shown = True
+        self._place()
+        self._schedule(0)
+
+    def _set_text(self, slot):
+        message = slot.key[1]
+        slot.message_label.configure(text=f"{message} (×{slot.count})" if slot.count > 1 else message)
+
+    def _place(self):
+        """Susun notifikasi aktif di tengah atas parent window"""
+        self.parent.update_idletasks()
         parent_x = self.parent.winfo_x()
-        parent_y = self.parent.winfo_y()
         parent_width = self.parent.winfo_width()
-        
-        notif_width = self.notification.winfo_reqwidth()
-        x = parent_x + (parent_width - notif_width) // 2
-        y = parent_y + 50
-        
-        self.notification.geometry(f"+{x}+{y}")
-        self.notification.deiconify()
-        
-        # Animasi fade in
-        self.fade_in()
-        
-        # Auto hide setelah duration
-        self.parent.after(self.duration, self.fade_out)
-    
-    def fade_in(self):
-        alpha = self.notification.attributes('-alpha')
-        if alpha < 0.95:
-            self.notification.attributes('-alpha', alpha + 0.05)
-            self.parent.after(20, self.fade_in)
-    
-    def fade_out(self):
-        alpha = self.notification.attributes('-alpha')
-        if alpha > 0:
-            self.notification.attributes('-alpha', alpha - 0.05)
-            self.parent.after(20, self.fade_out)
+        y = self.parent.winfo_y() + 50
+        for slot in self.slots:
+            if not slot.shown:
+                continue
+            x = parent_x + (parent_width - slot.window.winfo_reqwidth()) // 2
+            slot.window.geometry(f"+{x}+{y}")
+            y += slot.window.winfo_reqheight() + NOTIFICATION_GAP
+
+    def _schedule(self, delay_ms):
+        if self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+        self._after_id = self.parent.after(max(0, int(delay_ms)), self._tick)
+
+    def cancel(self):
+        """Hentikan timer animasi (saat aplikasi ditutup)"""
+        if self._after_id is not None:
+            try:
+                self.parent.after_cancel(self._after_id)
+            except tk.TclError:
+                pass  # Window sudah dihancurkan
+            self._after_id = None
+
+    def _tick(self):
+        """Satu-satunya timer: animasi fade, auto-hide dan pengambilan antrean"""
+        self._after_id = None
+        now = time.monotonic()
+        animating = False
+        next_expiry = None
+        freed = False
+
+        for slot in self.slots:
+            if not slot.shown:
+                continue
+            if slot.active and now >= slot.expires:
+                slot.target = 0.0
+            if slot.alpha != slot.target:
+                step = NOTIFICATION_FADE_STEP if slot.target > slot.alpha else -NOTIFICATION_FADE_STEP
+                slot.alpha = min(max(slot.alpha + step, 0.0), NOTIFICATION_ALPHA)
+                if abs(slot.alpha - slot.target) < NOTIFICATION_FADE_STEP / 2:
+                    slot.alpha = slot.target
+                slot.window.attributes('-alpha', slot.alpha)
+                animating = True
+            if slot.alpha == 0.0 and slot.target == 0.0:
+                # Selesai fade out: sembunyikan, jangan dihancurkan
+                slot.window.withdraw()
+                slot.shown = False
+                slot.active = False
+                freed = True
+            elif slot.active and slot.target > 0.0:
+                remaining = slot.expires - now
+                next_expiry = remaining if next_expiry is None else min(next_expiry, remaining)
+
+        if freed:
+            while self.pending:
+                slot = self._free_slot()
+                if slot is None:
+                    break
+                key, count = self.pending.popleft()
+                self._open(slot, key, count)
+                animating = True
+            self._place()
+
+        if animating:
+            self._schedule(NOTIFICATION_FADE_MS)
+        elif next_expiry is not None:
+            # Tidak ada animasi: tidur sampai notifikasi berikutnya kedaluwarsa
+            self._schedule(next_expiry * 1000 + 1)
+
+class _NotificationSlot:
+    """Status satu jendela di pool notifikasi"""
+    def __init__(self, window):
+        self.window = window
+        self.key = None
+        self.count = 0
+        self.active = False
+        self.shown = False
+        self.alpha = 0.0
+        self.target = 0.0
+        self.expires = 0.0
+
+class SearchWorker:
+    """Thread pencarian di latar belakang dengan koneksi SQLite sendiri.
+
+    Setiap permintaan mendapat nomor generasi; permintaan yang sudah digantikan
+    dibatalkan (lewat interrupt) dan hasilnya tidak pernah dikirim ke GUI.
+    Hasil: (generasi, term, sort, ids atau exception, query_ms, fuzzy).
+    """
+    BATCH_SIZE = 5000
+
+    def __init__(self, db_path, **repo_options):
+        self.db_path = db_path
+        # Pengaturan koneksi sama dengan GUI (journal mode, busy timeout)
+        self.repo_options = repo_options
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._repo = None
+        self.thread = threading.Thread(target=self._run, name='search-worker', daemon=True)
+        self.thread.start()
+
+    def submit(self, term, sort=None):
+        """Kirim pencarian baru (opsional terurut (kolom, menurun)) dan batalkan yang sedang berjalan"""
+        generation = self.cancel()
+        self.requests.put((generation, term, sort))
+        return generation
+
+    def cancel(self):
+        """Batalkan semua pencarian yang belum selesai"""
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+            repo = self._repo
+        if repo is not None:
+            repo.interrupt()
+        return generation
+
+    def close(self):
+        self.cancel()
+        self.requests.put(None)
+
+    def _run(self):
+        repo = EmployeeRepository(self.db_path, **self.repo_options)
+        with self._lock:
+            self._repo = repo
+        try:
+            while True:
+                request = self.requests.get()
+                if request is None:
+                    break
+                generation, term, sort = request
+                # Lewati permintaan yang sudah digantikan
+                if generation != self.generation:
+                    continue
+                start = time.perf_counter()
+                try:
+                    ids, fuzzy = self._search(repo, generation, term, sort)
+                except sqlite3.OperationalError as e:
+                    if 'interrupted' not in str(e):
+                        self.results.put((generation, term, sort, e, 0.0, False))
+                    # Ter-interrupt: kalau masih yang terbaru (interrupt nyasar), ulangi
+                    elif generation == self.generation:
+                        self.requests.put(request)
+                    continue
+                except sqlite3.Error as e:
+                    self.results.put((generation, term, sort, e, 0.0, False))
+                    continue
+                if ids is not None:
+                    query_ms = (time.perf_counter() - start) * 1000
+                    self.results.put((generation, term, sort, ids, query_ms, fuzzy))
+        finally:
+            with self._lock:
+                self._repo = None
+            repo.close()
+
+    def _search(self, repo, generation, term, sort):
+        """Kumpulkan ID yang cocok per batch, berhenti jika sudah digantikan.
+
+        Jika tidak ada yang cocok persis, cari nama yang mirip (salah ketik) lewat
+        indeks trigram; hasilnya urut kemiripan dan ditandai fuzzy.
+        """
+        ids = array('q')
+        for batch in repo.iter_search_ids(term, self.BATCH_SIZE, sort):
+            if generation != self.generation:
+                return None, False
+            ids.extend(batch)
+        if ids or generation != self.generation:
+            return ids, False
+        matches = repo.fuzzy_search(term, FUZZY_RESULTS)
+        return array('q', (row_id for row_id, _ in matches)), bool(matches)
+
+class BackgroundJob:
+    """Pekerjaan panjang (import/export) di thread terpisah.
+
+    work(job) berjalan di thread lain dan melapor lewat job.report(...);
+    callback on_progress/on_done/on_error selalu dipanggil di thread Tk
+    karena antrean pesan dibaca dengan root.after.
+    """
+    def __init__(self, root, work, on_progress, on_done, on_error, poll_ms=JOB_POLL_MS):
+        self.root = root
+        self.work = work
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+
+    def report(self, *args):
+        """Kirim progres dari thread kerja"""
+        self.messages.put(('progress', args))
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def stop(self):
+        """Batalkan pekerjaan dan berhenti polling; callback tidak dipanggil lagi"""
+        self.cancel()
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass  # Window sudah dihancurkan
+            self._after_id = None
+
+    def _run(self):
+        try:
+            self.messages.put(('done', self.work(self)))
+        except Exception as e:
+            self.messages.put(('error', e))
+
+    def _poll(self):
+        self._after_id = None
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                self.on_progress(*payload)
+            else:
+                self.running = False
+                (self.on_done if kind == 'done' else self.on_error)(payload)
+                return
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+
+class EventCoalescer:
+    """Gabungkan event berfrekuensi tinggi (Configure, MouseWheel, KeyRelease).
+
+    Setiap event hanya disimpan (atau digabung lewat merge); handler dijalankan
+    paling banyak sekali per frame_ms dengan hasil gabungannya. Jumlah event,
+    jumlah eksekusi handler dan event yang digabung dicatat di metrics
+    sebagai events.<nama>, events.<nama>.runs dan events.<nama>.collapsed.
+    """
+    def __init__(self, widget, frame_ms=FRAME_MS, metrics=None):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.metrics = metrics
+        self.pending = {}
+        self.after_ids = {}
+        self.last_run = {}
+
+    def wrap(self, name, handler, merge=None, result=None):
+        """Callback untuk bind(); merge(nilai_sebelumnya, event) menggabung event (default: event terakhir).
+
+        result dikembalikan langsung ke Tk (mis. 'break' supaya event tidak diteruskan).
+        """
+        def callback(event):
+            previous = self.pending.get(name)
+            self.pending[name] = merge(previous, event) if merge is not None else event
+            self._count(f'events.{name}')
+            if name not in self.after_ids:
+                # Jalankan secepatnya, tapi tidak lebih sering dari sekali per frame
+                elapsed = (time.perf_counter() - self.last_run.get(name, 0.0)) * 1000
+                delay = max(0, int(self.frame_ms - elapsed))
+                run = lambda: self._run(name, handler)
+                self.after_ids[name] = (self.widget.after(delay, run) if delay
+                                        else self.widget.after_idle(run))
+            else:
+                self._count(f'events.{name}.collapsed')
+            return result
+        return callback
+
+    def _run(self, name, handler):
+        self.after_ids.pop(name, None)
+        value = self.pending.pop(name, None)
+        self.last_run[name] = time.perf_counter()
+        self._count(f'events.{name}.runs')
+        handler(value)
+
+    def _count(self, counter):
+        if self.metrics is not None:
+            self.metrics.count(counter)
+
+    def cancel(self):
+        """Batalkan semua handler yang masih menunggu (mis. saat jendela ditutup)"""
+        for after_id in self.after_ids.values():
+            try:
+                self.widget.after_cancel(after_id)
+            except tk.TclError:
+                pass  # Window sudah dihancurkan
+        self.after_ids.clear()
+        self.pending.clear()
+
+def wheel_units(total, event):
+    """merge untuk MouseWheel: jumlahkan langkah scroll (Windows/macOS delta, X11 Button-4/5)"""
+    if event.num == 4:
+        step = -1
+    elif event.num == 5:
+        step = 1
+    else:
+        step = -1 if event.delta > 0 else 1
+    return (total or 0) + step
+
+class AutocompleteDropdown:
+    """Daftar saran di bawah Entry, diisi suggest(teks) pada setiap ketikan.
+
+    suggest dilayani indeks prefiks di memori (lihat EmployeeRepository.suggest),
+    jadi tidak ada query per ketikan; KeyRelease lewat EventCoalescer sehingga
+    ketikan cepat hanya memicu satu pencarian saran per frame.
+    """
+    NAVIGATION_KEYS = ('Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab')
+
+    def __init__(self, entry, var, suggest, events, name, colors):
+        self.entry = entry
+        self.var = var
+        self.suggest = suggest
+        self.colors = colors
+        self.popup = None
+        self.listbox = None
+        entry.bind('<KeyRelease>', events.wrap(name, self.on_key), add='+')
+        # Indeks dibangun saat field pertama kali difokus, bukan di tengah ketikan
+        entry.bind('<FocusIn>', lambda event: self.suggest(''), add='+')
+        entry.bind('<FocusOut>', lambda event: entry.after(150, self.hide_unless_focused), add='+')
+        entry.bind('<Down>', lambda event: self.move(1))
+        entry.bind('<Up>', lambda event: self.move(-1))
+        entry.bind('<Return>', self.accept)
+        entry.bind('<KP_Enter>', self.accept)
+        entry.bind('<Escape>', lambda event: self.hide())
+
+    @property
+    def visible(self):
+        return self.popup is not None and self.popup.winfo_ismapped()
+
+    def on_key(self, event):
+        if event is not None and event.keysym in self.NAVIGATION_KEYS:
+            return
+        self.refresh()
+
+    def refresh(self):
+        text = self.var.get()
+        values = self.suggest(text)
+        if not values or values == [text]:
+            self.hide()
+            return
+        self.show(values)
+
+    def _create_popup(self):
+        self.popup = tk.Toplevel(self.entry)
+        self.popup.withdraw()
+        self.popup.overrideredirect(True)
+        self.listbox = tk.Listbox(self.popup, font=('Segoe UI', 10), relief='solid', bd=1,
+                                  activestyle='none', exportselection=False,
+                                  bg='white', fg=self.colors['text'],
+                                  selectbackground=self.colors['primary_light'],
+                                  selectforeground=self.colors['text'])
+        self.listbox.pack(fill='both', expand=True)
+        self.listbox.bind('<ButtonRelease-1>', self.on_click)
+
+    def show(self, values):
+        if self.popup is None:
+            self._create_popup()
+        self.listbox.delete(0, 'end')
+        self.listbox.insert('end', *values)
+        self.listbox.configure(height=len(values))
+        x = self.entry.winfo_rootx()
+        y = self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f'{self.entry.winfo_width()}x{self.listbox.winfo_reqheight()}+{x}+{y}')
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide(self):
+        if self.visible:
+            self.popup.withdraw()
+
+    def hide_unless_focused(self):
+        try:
+            if self.entry.focus_get() is not self.entry:
+                self.hide()
+        except (KeyError, tk.TclError):
+            self.hide()  # Fokus ada di widget yang sudah dihancurkan / popup
+
+    def move(self, step):
+        """Panah atas/bawah: pindah pilihan, atau tampilkan saran jika belum tampil"""
+        if not self.visible:
+            self.refresh()
+            return 'break'
+        size = self.listbox.size()
+        current = self.listbox.curselection()
+        index = (current[0] + step) % size if current else (0 if step > 0 else size - 1)
+        self.listbox.selection_clear(0, 'end')
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return 'break'
+
+    def accept(self, event=None):
+        if not self.visible or not self.listbox.curselection():
+            return None
+        self.choose(self.listbox.curselection()[0])
+        return 'break'
+
+    def on_click(self, event):
+        self.choose(self.listbox.nearest(event.y))
+
+    def choose(self, index):
+        self.var.set(self.listbox.get(index))
+        self.entry.icursor('end')
+        self.entry.focus_set()
+        self.hide()
+
+class VirtualTable:
+    """Treeview virtual: hanya baris yang terlihat (plus overscan) yang diambil dan di-render"""
+    def __init__(self, tree, scrollbar, overscan=50, metrics=None, coalescer=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.overscan = overscan
+        self.metrics = metrics
+        self.source = None
+        self.total = 0
+        self.offset = 0
+
+        # Waktu query/render yang terkumpul sejak take_timings() terakhir
+        self.timings = {}
+
+        # Cache jendela baris yang sudah diambil dari SQLite
+        self.cache_start = 0
+        self.cache_rows = []
+
+        # ID yang dipilih tetap diingat walaupun barisnya sudah di-scroll keluar layar
+        self.selected_ids = set()
+
+        self.scrollbar.configure(command=self.scroll)
+        self.tree.bind('<<TreeviewSelect>>', self.on_select, add='+')
+        # Putaran roda beruntun digabung menjadi satu scroll (satu render) per frame
+        on_wheel = self.on_mousewheel
+        if coalescer is not None:
+            on_wheel = coalescer.wrap('table_wheel', self.scroll_wheel, wheel_units, 'break')
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, on_wheel)
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>'):
+            self.tree.bind(sequence, self.on_key)
+
+    @property
+    def visible(self):
+        return max(1, int(self.tree.cget('height')))
+
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+
+    def take_timings(self):
+        """Ambil lalu reset waktu query/render yang terkumpul"""
+        timings, self.timings = self.timings, {}
+        return timings
+
+    def set_source(self, source):
+        """Ganti sumber data dan tampilkan dari baris pertama"""
+        self.source = source
+        with self.timed('query'):
+            self.total = source.count()
+        self.offset = 0
+        self.invalidate()
+        self.render()
+
+    def invalidate(self):
+        """Buang cache sehingga render berikutnya membaca ulang dari database"""
+        self.cache_start = 0
+        self.cache_rows = []
+
+    def contains(self, row_id):
+        """Apakah baris termasuk data yang sedang ditampilkan (filter aktif)"""
+        return self.source is not None and self.source.contains(row_id)
+
+    def has_row(self, row_id):
+        """Apakah baris ada di data yang sedang ditampilkan, menurut sumber (tanpa probe database)"""
+        return self.source is not None and self.source.has_id(row_id)
+
+    def row_changed(self, row_id, was_listed=False):
+        """Terapkan perubahan satu baris ke tampilan tanpa reload penuh.
+
+        was_listed adalah hasil contains() sebelum perubahan ditulis; kondisi
+        sesudahnya diprobe ulang sehingga insert, update dan delete ditangani sama.
+        """
+        if self.source is None:
+            return
+        listed = self.source.contains(row_id)
+
+        if was_listed and listed:
+            row, moved = self.source.refresh_row(row_id)
+            if moved:
+                # Nilai kolom urut berubah: sumber sudah membaca ulang halamannya
+                self.refresh_window()
+                return
+            # Update di tempat: posisi tetap, cukup ganti isi baris
+            for index, cached in enumerate(self.cache_rows):
+                if cached[0] == row_id:
+                    self.cache_rows[index] = row
+                    break
+            if self.tree.exists(str(row_id)):
+                self.tree.item(str(row_id), values=row)
+            return
+
+        if listed:
+            self.source.insert_id(row_id)
+        elif was_listed:
+            self.source.remove_id(row_id)
+            self.selected_ids.discard(row_id)
         else:
-            self.notification.destroy()
+            return
+
+        # Posisi bergeser: render ulang jendela saja, bukan seluruh tabel
+        self.refresh_window()
+
+    def listed_ids(self, row_ids):
+        """ID yang termasuk data yang sedang ditampilkan (untuk rows_changed)"""
+        return {row_id for row_id in row_ids if self.contains(row_id)}
+
+    def rows_changed(self, row_ids, was_listed):
+        """Versi batch row_changed: sumber diperbarui sekali dan jendela dirender sekali"""
+        if self.source is None:
+            return
+        inserted, removed = [], []
+        for row_id in row_ids:
+            listed = self.source.contains(row_id)
+            if listed and row_id not in was_listed:
+                inserted.append(row_id)
+            elif not listed and row_id in was_listed:
+                removed.append(row_id)
+        # Dipanggil juga tanpa perubahan posisi supaya sumber bercache (pager) membaca isi baru
+        self.source.apply_changes(inserted, removed)
+        self.selected_ids.difference_update(removed)
+        self.refresh_window()
+
+    def refresh_window(self):
+        self.total = self.source.count()
+        self.offset = max(0, min(self.offset, self.total - self.visible))
+        self.invalidate()
+        self.render()
+
+    def window_rows(self):
+        """Baris untuk jendela yang sedang terlihat, diambil dari cache bila ada"""
+        end = min(self.offset + self.visible, self.total)
+        cache_end = self.cache_start + len(self.cache_rows)
+        if self.offset < self.cache_start or end > cache_end:
+            self.cache_start = max(0, self.offset - self.overscan)
+            with self.timed('query'):
+                self.cache_rows = self.source.fetch(self.cache_start,
+                                                    self.visible + 2 * self.overscan)
+        return self.cache_rows[self.offset - self.cache_start:end - self.cache_start]
+
+    def render(self):
+        """Render ulang hanya baris yang terlihat"""
+        rows = self.window_rows() if self.source is not None and self.total else []
+
+        with self.timed('render'):
+            self._render_rows(rows)
+
+    def _render_rows(self, rows):
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+
+        if not rows:
+            self.scrollbar.set(0.0, 1.0)
+            return
+
+        for row in rows:
+            self.tree.insert('', tk.END, iid=str(row[0]), values=row)
+
+        # Pulihkan seleksi untuk baris yang kembali terlihat
+        reselect = [iid for iid in self.tree.get_children() if int(iid) in self.selected_ids]
+        if reselect:
+            self.tree.selection_set(reselect)
+
+        first = self.offset / self.total
+        last = min(self.offset + self.visible, self.total) / self.total
+        self.scrollbar.set(first, last)
+
+    def scroll_to(self, offset):
+        """Geser jendela ke offset tertentu"""
+        offset = max(0, min(int(offset), max(0, self.total - self.visible)))
+        if offset == self.offset:
+            return
+        self.offset = offset
+        if self.metrics is None:
+            self.render()
+            return
+        with self.metrics.measure('scroll') as span:
+            self.take_timings()
+            self.render()
+            span.merge(self.take_timings())
+            span.rows = len(self.tree.get_children())
+
+    def scroll(self, *args):
+        """Callback scrollbar: ('moveto', fraksi) atau ('scroll', n, 'units'/'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if args[2] == 'pages':
+                step *= self.visible
+            self.scroll_to(self.offset + step)
+
+    def on_mousewheel(self, event):
+        self.scroll_wheel(wheel_units(0, event))
+        return 'break'  # Jangan ikut men-scroll canvas utama
+
+    def scroll_wheel(self, units):
+        """Scroll 3 baris per langkah roda (units negatif = ke atas)"""
+        self.scroll_to(self.offset + 3 * units)
+
+    def on_key(self, event):
+        """Navigasi keyboard yang melewati tepi jendela virtual"""
+        children = self.tree.get_children()
+        focus = self.tree.focus()
+        if not children:
+            return None
+
+        if event.keysym in ('Prior', 'Next'):
+            step = self.visible if event.keysym == 'Next' else -self.visible
+            self.scroll_to(self.offset + step)
+            return 'break'
+
+        if event.keysym == 'Down' and focus == children[-1]:
+            self.scroll_to(self.offset + 1)
+            target = self.tree.get_children()[-1]
+        elif event.keysym == 'Up' and focus == children[0]:
+            self.scroll_to(self.offset - 1)
+            target = self.tree.get_children()[0]
+        else:
+            return None  # Biarkan Treeview menangani navigasi di dalam jendela
+
+        self.selected_ids = {int(target)}
+        self.tree.selection_set(target)
+        self.tree.focus(target)
+        return 'break'
+
+    def on_select(self, event=None):
+        """Sinkronkan seleksi: baris di luar jendela tetap, baris di jendela ikut Treeview"""
+        visible_ids = {int(iid) for iid in self.tree.get_children()}
+        selected = {int(iid) for iid in self.tree.selection()}
+        self.selected_ids = (self.selected_ids - visible_ids) | selected
 
 class EmployeeManagement:
-    def __init__(self, root):
+    def __init__(self, root, db_path=DB_FILE, busy_timeout_ms=5000, journal_mode='WAL', on_ready=None,
+                 backup_interval_min=BACKUP_INTERVAL_MIN, backup_keep=BACKUP_KEEP):
         self.root = root
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        # WAL butuh shared memory lokal; database di network drive dibuka dengan 'DELETE'
+        self.journal_mode = journal_mode
+        self.backup_interval_min = backup_interval_min
+        self.backup_keep = backup_keep
+        # close() hanya berjalan sekali; pekerjaan latar belakang ikut dihentikan olehnya
+        self._closed = False
+        self._jobs = []
+        self._startup_after_id = None
+
+        # Waktu tiap tahap startup; on_ready(app) dipanggil setelah data awal tampil
+        self.startup = StartupProfile()
+        self.ready = False
+        self.on_ready = on_ready
+
+        # Pencatat latensi operasi (ring buffer) untuk overlay performa
+        self.metrics = OperationMetrics()
+        self._overlay_after_id = None
+
+        # Penggabung event Configure/MouseWheel/KeyRelease (maksimal sekali per frame)
+        self.events = EventCoalescer(self.root, metrics=self.metrics)
         self.root.title("✨ Sistem Management Pegawai Modern")
-        self.root.geometry("1000x700")
+        self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.resizable(True, True)
         
         # Set tema modern
         self.setup_theme()
+
+        # Pool notifikasi; pesan yang muncul sebelum jendela tampil ditunda sampai startup selesai
+        self.notifications = NotificationManager(self.root)
+        self._startup_messages = []
+        self.startup.mark('theme')
         
         # Inisialisasi database
         self.init_database()
-        
-        # Setup GUI
+        self.startup.mark('database')
+
+        # Worker pencarian latar belakang (koneksi sendiri)
+        self.search_worker = SearchWorker(self.db_path, journal_mode=self.journal_mode,
+                                          busy_timeout_ms=self.busy_timeout_ms)
+        self._search_after_id = None
+        # Jadwal polling hasil (None = tidak sedang polling) dan generasi pencarian yang ditunggu
+        self._search_poll_id = None
+        self._search_generation = None
+
+        # Pekerjaan import/export yang sedang berjalan di latar belakang
+        self._import_job = None
+        self._export_job = None
+
+        # Pembangunan indeks autocomplete di latar belakang (awal, restore, perubahan massal)
+        self._value_index_job = None
+
+        # Backup/restore online (thread sendiri); backup otomatis dijadwalkan setelah startup
+        self._backup_job = None
+        self._restore_job = None
+        self._backup_after_id = None
+
+        # Urutan tampilan (kolom, menurun); None = urutan bawaan (ID / peringkat pencarian)
+        self.sort = None
+
+        # Pager keyset untuk daftar lengkap; jumlah total dihitung belakangan di latar belakang
+        self.pager = None
+        self._count_generation = 0
+
+        # Setup GUI (hanya widget yang terlihat di layar pertama)
         self.setup_gui()
-        
-        # Load data awal
+        self._change_after_id = None
+        self.startup.mark('widgets')
+        self.status_var.set("⏳ Memuat data pegawai...")
+
+        # Data awal, dashboard dan change feed dimuat setelah jendela pertama kali tampil
+        self._map_binding = self.root.bind('<Map>', self.on_first_map, add='+')
+
+    def on_first_map(self, event):
+        """Jendela utama baru tampil: selesaikan startup setelah gambar pertama digambar"""
+        if event.widget is not self.root or self._closed:
+            return
+        self.root.unbind('<Map>', self._map_binding)
+        # Antrean idle Tk berurutan: redraw jendela sudah antre sebelum callback ini
+        self._startup_after_id = self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        """Inisialisasi yang ditunda: widget non-kritis, data awal, change feed"""
+        self._startup_after_id = None
+        self.startup.mark('first_paint')
+        self.setup_stats_card()
         self.load_data()
+        self.startup.mark('data_loaded')
+        self.start_change_feed()
+        self.schedule_backup()
+
+        self.startup.record(self.metrics)
+        self.ready = True
+        for message, type_notif in self._startup_messages:
+            self.notifications.show(message, type_notif)
+        self._startup_messages = None
+        if self.on_ready is not None:
+            self.on_ready(self)
     
     def setup_theme(self):
         """Setup tema modern untuk aplikasi"""
@@ -147,30 +971,52 @@ class EmployeeManagement:
         self.root.configure(bg=self.colors['background'])
     
     def show_notification(self, message, type_notif="info"):
-        """Tampilkan notifikasi modern"""
-        ModernNotification(self.root, message, type_notif)
+        """Tampilkan notifikasi modern (ditunda jika jendela belum tampil)"""
+        if getattr(self, '_startup_messages', None) is not None:
+            self._startup_messages.append((message, type_notif))
+            return
+        self.notifications.show(message, type_notif)
     
     def init_database(self):
-        """Inisialisasi database SQLite"""
+        """Inisialisasi database SQLite; gagal membuka/migrasi menghentikan aplikasi"""
+        repo = None
         try:
-            self.conn = sqlite3.connect('data_pegawai.db')
-            self.cursor = self.conn.cursor()
-            
-            # Membuat tabel pegawai jika belum ada
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pegawai (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nama TEXT NOT NULL UNIQUE,
-                    alamat TEXT NOT NULL,
-                    posisi TEXT NOT NULL,
-                    tahun_masuk INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            self.conn.commit()
-            self.show_notification("Database berhasil diinisialisasi", "success")
+            # Koneksi, pragma, tabel dan migrasi skema dikelola oleh repository
+            repo = self.open_repo()
+            self.migrate_schema(repo)
         except sqlite3.Error as e:
-            self.show_notification(f"Gagal menginisialisasi database: {e}", "error")
+            if repo is not None:
+                repo.close()
+            # Migrasi yang gagal di-rollback, tapi kode aplikasi butuh skema terbaru:
+            # jangan lanjut dengan database setengah termigrasi
+            message = f"Gagal menginisialisasi database {self.db_path}: {e}"
+            messagebox.showerror("❌ Database", f"{message}\n\nAplikasi akan ditutup.", parent=self.root)
+            raise SystemExit(message)
+        self.repo = repo
+
+    def open_repo(self):
+        """Koneksi baru dengan pengaturan aplikasi; dipakai GUI dan setiap pekerjaan latar belakang"""
+        return EmployeeRepository(self.db_path, journal_mode=self.journal_mode,
+                                  busy_timeout_ms=self.busy_timeout_ms)
+
+    def migrate_schema(self, repo):
+        """Migrasi skema; nama ganda beda huruf besar/kecil bisa dirapikan dulu atas izin pengguna"""
+        try:
+            repo.init_schema()
+        except DuplicateNamesError as e:
+            names = '\n'.join(f"• {name}" for name in e.names[:10])
+            if len(e.names) > 10:
+                names += f"\n... dan {len(e.names) - 10} lainnya"
+            repair = messagebox.askyesno(
+                "⚠️ Nama Ganda",
+                f"Nama berikut terdaftar lebih dari sekali (hanya beda huruf besar/kecil):\n\n{names}\n\n"
+                f"Rapikan otomatis? Data dengan ID terkecil tetap, sisanya diberi akhiran (2), (3), ...",
+                icon='warning', parent=self.root)
+            if not repair:
+                raise
+            renamed = repo.dedupe_names()
+            repo.init_schema()
+            self.show_notification(f"{len(renamed)} nama ganda diberi akhiran angka", "warning")
     
     def setup_gui(self):
         """Setup antarmuka pengguna dengan tema modern"""
@@ -183,9 +1029,12 @@ class EmployeeManagement:
         scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
+        # Resize frame dan canvas memicu banyak Configure saat jendela di-drag:
+        # bbox("all") dihitung ulang paling banyak sekali per frame
         scrollable_frame.bind(
             "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            self.events.wrap('frame_configure',
+                             lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
         )
         
         # Bind canvas resize untuk responsive content
@@ -196,7 +1045,7 @@ class EmployeeManagement:
             canvas.itemconfig(canvas_window, width=canvas_width)
         
         canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.bind('<Configure>', configure_scroll_region)
+        canvas.bind('<Configure>', self.events.wrap('canvas_configure', configure_scroll_region))
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Frame utama dengan padding - gunakan grid untuk better control
@@ -258,6 +1107,14 @@ class EmployeeManagement:
         self.create_modern_input(form_grid, "🏠 Alamat:", 1, "alamat_var", "alamat_entry")
         self.create_modern_input(form_grid, "💼 Posisi/Jabatan:", 2, "posisi_var", "posisi_entry")
         self.create_modern_input(form_grid, "📅 Tahun Masuk:", 3, "tahun_var", "tahun_entry")
+
+        # Saran alamat/posisi yang sudah ada (indeks prefiks di memori, tanpa query per ketikan)
+        self.autocomplete = {
+            column: AutocompleteDropdown(getattr(self, f'{column}_entry'), getattr(self, f'{column}_var'),
+                                         lambda prefix, column=column: self.suggest_values(column, prefix),
+                                         self.events, f'{column}_key', self.colors)
+            for column in AUTOCOMPLETE_COLUMNS
+        }
         
         # Button frame dengan style modern
         button_frame = tk.Frame(form_frame, bg=self.colors['card'])
@@ -269,6 +1126,10 @@ class EmployeeManagement:
         self.create_modern_button(button_frame, "🗑️ Hapus", self.delete_employee, self.colors['error'])
         self.create_modern_button(button_frame, "🧹 Clear", self.clear_fields, self.colors['text_light'])
         self.create_modern_button(button_frame, "🔄 Refresh", self.load_data, self.colors['text_light'])
+        self.create_modern_button(button_frame, "📥 Import", self.start_import, self.colors['primary'])
+        self.create_modern_button(button_frame, "📤 Export", self.start_export, self.colors['primary'])
+        self.create_modern_button(button_frame, "💾 Backup", self.start_backup, self.colors['text_light'])
+        self.create_modern_button(button_frame, "♻️ Restore", self.start_restore, self.colors['text_light'])
         
         # Card untuk pencarian
         search_card = tk.Frame(main_frame, bg=self.colors['card'], relief='solid', bd=1)
@@ -298,7 +1159,7 @@ class EmployeeManagement:
                                font=('Segoe UI', 11), relief='solid', bd=1,
                                bg='white', fg=self.colors['text'])
         search_entry.grid(row=1, column=0, sticky='ew', pady=(5, 0), ipady=8)
-        search_entry.bind('<KeyRelease>', self.search_employee)
+        search_entry.bind('<KeyRelease>', self.events.wrap('search_key', self.search_employee))
         
         # Card untuk tabel data
         table_card = tk.Frame(main_frame, bg=self.colors['card'], relief='solid', bd=1)
@@ -333,14 +1194,11 @@ class EmployeeManagement:
         
         self.tree = ttk.Treeview(tree_frame, style="Modern.Treeview",
                                 columns=('ID', 'Nama', 'Alamat', 'Posisi', 'Tahun Masuk'), 
-                                show='headings', height=12)
+                                show='headings', height=12, selectmode='extended')
         
-        # Konfigurasi kolom dengan icon
-        self.tree.heading('ID', text='🆔 ID')
-        self.tree.heading('Nama', text='👤 Nama Lengkap')
-        self.tree.heading('Alamat', text='🏠 Alamat')
-        self.tree.heading('Posisi', text='💼 Posisi')
-        self.tree.heading('Tahun Masuk', text='📅 Tahun Masuk')
+        # Konfigurasi kolom dengan icon; klik judul kolom untuk mengurutkan (di SQL)
+        for column, (text, _) in SORT_HEADINGS.items():
+            self.tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
         
         # Lebar kolom dengan alignment yang konsisten
         self.tree.column('ID', width=60, anchor=tk.CENTER, minwidth=50)
@@ -349,21 +1207,51 @@ class EmployeeManagement:
         self.tree.column('Posisi', width=150, anchor=tk.CENTER, minwidth=120)
         self.tree.column('Tahun Masuk', width=120, anchor=tk.CENTER, minwidth=100)
         
-        # Scrollbar dengan style
-        scrollbar_tree = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar_tree.set)
-        
+        # Scrollbar dengan style, dikendalikan oleh tabel virtual (bukan yview Treeview)
+        scrollbar_tree = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        self.table = VirtualTable(self.tree, scrollbar_tree, metrics=self.metrics, coalescer=self.events)
+
         # Grid layout
         self.tree.grid(row=0, column=0, sticky='nsew')
         scrollbar_tree.grid(row=0, column=1, sticky='ns')
+
+        # Navigasi halaman untuk daftar lengkap (disembunyikan saat menampilkan hasil pencarian)
+        self.page_frame = tk.Frame(table_card, bg=self.colors['card'])
+        self.page_frame.grid(row=2, column=0, sticky='ew', padx=20, pady=(0, 15))
+        self.first_button = self.create_modern_button(self.page_frame, "⏮", self.first_page,
+                                                      self.colors['primary'])
+        self.prev_button = self.create_modern_button(self.page_frame, "◀ Sebelumnya", self.prev_page,
+                                                     self.colors['primary'])
+        self.page_var = tk.StringVar()
+        page_label = tk.Label(self.page_frame, textvariable=self.page_var,
+                              font=('Segoe UI', 10), fg=self.colors['text'], bg=self.colors['card'])
+        page_label.pack(side='left', padx=10)
+        self.next_button = self.create_modern_button(self.page_frame, "Berikutnya ▶", self.next_page,
+                                                     self.colors['primary'])
+        self.last_button = self.create_modern_button(self.page_frame, "⏭", self.last_page,
+                                                     self.colors['primary'])
+
+        self.page_jump_var = tk.StringVar()
+        jump_entry = tk.Entry(self.page_frame, textvariable=self.page_jump_var, width=6,
+                              font=('Segoe UI', 10), relief='solid', bd=1,
+                              bg='white', fg=self.colors['text'])
+        jump_entry.pack(side='right', ipady=4)
+        jump_entry.bind('<Return>', self.jump_to_page)
+        jump_label = tk.Label(self.page_frame, text="Ke halaman:", font=('Segoe UI', 10),
+                              fg=self.colors['text'], bg=self.colors['card'])
+        jump_label.pack(side='right', padx=(0, 5))
         
         # Bind events
         self.tree.bind('<Double-1>', self.on_item_select)
         self.tree.bind('<Button-1>', self.on_single_click)
         
+        # Card dashboard statistik dibuat setelah jendela tampil (setup_stats_card)
+        self.main_frame = main_frame
+        self._stats_after_id = None
+
         # Status bar modern
         status_frame = tk.Frame(main_frame, bg=self.colors['primary'], height=40)
-        status_frame.grid(row=4, column=0, sticky='ew', pady=(20, 0))
+        status_frame.grid(row=5, column=0, sticky='ew', pady=(20, 0))
         status_frame.grid_propagate(False)
         status_frame.grid_columnconfigure(0, weight=1)
         
@@ -372,19 +1260,105 @@ class EmployeeManagement:
         status_label = tk.Label(status_frame, textvariable=self.status_var, 
                                font=('Segoe UI', 10), fg='white', bg=self.colors['primary'])
         status_label.grid(row=0, column=0, pady=10)
+
+        # Overlay performa (p50/p95), disembunyikan sampai diaktifkan dengan Ctrl+Shift+P
+        self.perf_var = tk.StringVar()
+        self.perf_label = tk.Label(status_frame, textvariable=self.perf_var,
+                                   font=('Consolas', 9), fg=self.colors['primary_light'],
+                                   bg=self.colors['primary'])
+        self.root.bind('<Control-P>', self.toggle_perf_overlay)
+        self.root.bind('<Control-D>', self.dump_metrics)
         
         # Grid canvas dan scrollbar dengan proper weights
         canvas.grid(row=0, column=0, sticky="nsew")
         scrollbar.grid(row=0, column=1, sticky="ns")
         
-        # Bind mouse wheel untuk scroll
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # Bind mouse wheel untuk scroll (langkah dalam satu frame dijumlahkan)
+        def _on_mousewheel(units):
+            canvas.yview_scroll(units, "units")
+        canvas.bind_all("<MouseWheel>", self.events.wrap('wheel', _on_mousewheel, wheel_units))
         
-        # ID tersembunyi untuk update
+        # ID tersembunyi untuk update, beserta versi baris saat dimuat ke form
         self.selected_id = None
-        
+        self.selected_version = None
+        
+    def setup_stats_card(self):
+        """Card dashboard statistik (dibaca dari tabel ringkasan, bukan agregasi tabel pegawai)"""
+        stats_card = tk.Frame(self.main_frame, bg=self.colors['card'], relief='solid', bd=1)
+        stats_card.grid(row=4, column=0, sticky='ew')
+        stats_card.grid_columnconfigure(0, weight=1)
+        stats_card.grid_columnconfigure(1, weight=1)
+
+        stats_header = tk.Frame(stats_card, bg=self.colors['primary_light'], height=50)
+        stats_header.grid(row=0, column=0, columnspan=2, sticky='ew')
+        stats_header.grid_propagate(False)
+        stats_header.grid_columnconfigure(0, weight=1)
+
+        self.stats_title_var = tk.StringVar(value="📈 Statistik Pegawai")
+        stats_title = tk.Label(stats_header, textvariable=self.stats_title_var,
+                               font=('Segoe UI', 14, 'bold'),
+                               fg=self.colors['text'], bg=self.colors['primary_light'])
+        stats_title.grid(row=0, column=0, pady=15)
+
+        self.stats_posisi_tree = self.create_stats_table(stats_card, 0, '💼 Posisi')
+        self.stats_tahun_tree = self.create_stats_table(stats_card, 1, '📅 Tahun Masuk')
+
+    def create_stats_table(self, parent, column, group_title):
+        """Tabel kecil jumlah pegawai per kelompok dengan batang grafik teks"""
+        frame = tk.Frame(parent, bg=self.colors['card'])
+        frame.grid(row=1, column=column, sticky='nsew', padx=20, pady=20)
+        frame.grid_columnconfigure(0, weight=1)
+
+        tree = ttk.Treeview(frame, style="Modern.Treeview", columns=('Kelompok', 'Jumlah', 'Grafik'),
+                            show='headings', height=8)
+        tree.heading('Kelompok', text=group_title)
+        tree.heading('Jumlah', text='👥 Jumlah')
+        tree.heading('Grafik', text='')
+        tree.column('Kelompok', width=160, anchor=tk.W, minwidth=100)
+        tree.column('Jumlah', width=80, anchor=tk.CENTER, minwidth=60)
+        tree.column('Grafik', width=160, anchor=tk.W, minwidth=80)
+
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.grid(row=0, column=0, sticky='nsew')
+        scrollbar.grid(row=0, column=1, sticky='ns')
+        return tree
+
+    def suggest_values(self, column, prefix):
+        """Saran autocomplete untuk column; indeks yang belum ada dibangun di latar belakang"""
+        with self.metrics.measure(f'autocomplete_{column}') as span:
+            try:
+                values = self.repo.suggest(column, prefix, build=False)
+            except sqlite3.Error:
+                return []
+            if values is None:
+                self.build_value_indexes()
+                return []
+            span.rows = len(values)
+        return values
+
+    def build_value_indexes(self):
+        """Bangun indeks autocomplete dengan koneksi sendiri (GROUP BY seluruh tabel tidak di thread Tk)"""
+        if self._value_index_job is not None and self._value_index_job.running:
+            return
+
+        def work(job):
+            repo = self.open_repo()
+            try:
+                return repo.build_value_indexes()
+            finally:
+                repo.close()
+
+        def on_done(result):
+            # Hasil dari sebelum restore sudah tidak berlaku
+            if self._value_index_job is job:
+                self.repo.install_value_indexes(*result)
+
+        def on_error(error):
+            pass  # Autocomplete tidak wajib; dicoba lagi saat field berikutnya difokuskan
+
+        job = self._value_index_job = self.start_job(work, None, on_done, on_error)
+
     def create_modern_input(self, parent, label_text, row, var_name, entry_name):
         """Buat input field dengan style modern"""
         # Frame untuk setiap input
@@ -424,6 +1398,7 @@ class EmployeeManagement:
             
         button.bind("<Enter>", on_enter)
         button.bind("<Leave>", on_leave)
+        return button
         
     def lighten_color(self, color):
         """Buat warna lebih terang untuk hover effect"""
@@ -441,35 +1416,37 @@ class EmployeeManagement:
         if not self.validate_input():
             return
         
-        try:
-            # Cek apakah nama sudah ada
-            self.cursor.execute('SELECT COUNT(*) FROM pegawai WHERE LOWER(nama) = LOWER(?)', 
-                              (self.nama_var.get().strip(),))
-            if self.cursor.fetchone()[0] > 0:
+        with self.metrics.measure('add_employee') as span:
+            try:
+                # Keunikan nama (tanpa beda huruf besar/kecil) dijaga oleh indeks idx_pegawai_nama_nocase
+                with span.phase('query'):
+                    new_id = self.repo.add(self.nama_var.get().strip(), self.alamat_var.get().strip(),
+                                           self.posisi_var.get().strip(), int(self.tahun_var.get()))
+                nama = self.nama_var.get()
+                self.show_notification(f"Pegawai '{nama}' berhasil ditambahkan!", "success")
+                self.clear_fields()
+
+                # Tampilkan baris baru (jika cocok dengan filter aktif) tanpa reload penuh
+                with span.phase('render'):
+                    self.table.row_changed(new_id)
+                self.adjust_page_total(1)
+                self.schedule_stats_refresh()
+                span.rows = 1
+                self.status_var.set(f"✅ Pegawai {nama} berhasil ditambahkan")
+            
+            except sqlite3.IntegrityError:
                 self.show_notification("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", "warning")
                 self.nama_entry.focus()
-                return
-            
-            self.cursor.execute('''
-                INSERT INTO pegawai (nama, alamat, posisi, tahun_masuk)
-                VALUES (?, ?, ?, ?)
-            ''', (self.nama_var.get().strip(), self.alamat_var.get().strip(), 
-                  self.posisi_var.get().strip(), int(self.tahun_var.get())))
-            
-            self.conn.commit()
-            self.status_var.set(f"✅ Pegawai {self.nama_var.get()} berhasil ditambahkan")
-            self.show_notification(f"Pegawai '{self.nama_var.get()}' berhasil ditambahkan!", "success")
-            self.clear_fields()
-            self.load_data()
-            
-        except sqlite3.IntegrityError:
-            self.show_notification("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", "warning")
-        except sqlite3.Error as e:
-            self.show_notification(f"Gagal menambah pegawai: {e}", "error")
-            self.status_var.set("❌ Gagal menambah pegawai")
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal menambah pegawai: {self.describe_db_error(e)}", "error")
+                self.status_var.set("❌ Gagal menambah pegawai")
     
     def update_employee(self):
         """Update data pegawai dengan validasi nama unik"""
+        if len(self.table.selected_ids) > 1:
+            self.update_selected()
+            return
+
         if not self.selected_id:
             self.show_notification("Pilih pegawai yang akan diupdate terlebih dahulu!", "warning")
             return
@@ -477,53 +1454,111 @@ class EmployeeManagement:
         if not self.validate_input():
             return
         
-        try:
-            # Cek apakah nama sudah ada (kecuali untuk record yang sedang diedit)
-            self.cursor.execute('SELECT COUNT(*) FROM pegawai WHERE LOWER(nama) = LOWER(?) AND id != ?', 
-                              (self.nama_var.get().strip(), self.selected_id))
-            if self.cursor.fetchone()[0] > 0:
-                self.show_notification("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", "warning")
-                self.nama_entry.focus()
-                return
-            
-            old_name = self.get_employee_name(self.selected_id)
+        with self.metrics.measure('update_employee') as span:
+            try:
+                employee_id = self.selected_id
+                old_name = self.get_employee_name(employee_id)
+                was_listed = self.table.contains(employee_id)
             
-            self.cursor.execute('''
-                UPDATE pegawai SET nama=?, alamat=?, posisi=?, tahun_masuk=?
-                WHERE id=?
-            ''', (self.nama_var.get().strip(), self.alamat_var.get().strip(), 
-                  self.posisi_var.get().strip(), int(self.tahun_var.get()), self.selected_id))
+                # Nama yang bentrok dengan pegawai lain ditolak atomik oleh indeks unik NOCASE;
+                # versi baris memastikan perubahan pengguna lain tidak tertimpa diam-diam
+                with span.phase('query'):
+                    self.repo.update(employee_id, self.nama_var.get().strip(), self.alamat_var.get().strip(),
+                                     self.posisi_var.get().strip(), int(self.tahun_var.get()),
+                                     expected_version=self.selected_version)
             
-            self.conn.commit()
-            self.status_var.set(f"✅ Data pegawai berhasil diupdate")
-            self.show_notification(f"Data pegawai '{old_name}' berhasil diupdate!", "success")
-            self.clear_fields()
-            self.load_data()
+                self.show_notification(f"Data pegawai '{old_name}' berhasil diupdate!", "success")
+                self.clear_fields()
+                with span.phase('render'):
+                    self.table.row_changed(employee_id, was_listed)
+                self.schedule_stats_refresh()
+                span.rows = 1
+                self.status_var.set(f"✅ Data pegawai berhasil diupdate")
             
-        except sqlite3.IntegrityError:
-            self.show_notification("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", "warning")
-        except sqlite3.Error as e:
-            self.show_notification(f"Gagal mengupdate pegawai: {e}", "error")
-            self.status_var.set("❌ Gagal mengupdate pegawai")
+            except ConflictError as e:
+                self.resolve_update_conflict(e)
+            except sqlite3.IntegrityError:
+                self.show_notification("Nama pegawai sudah terdaftar! Gunakan nama yang berbeda.", "warning")
+                self.nama_entry.focus()
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal mengupdate pegawai: {self.describe_db_error(e)}", "error")
+                self.status_var.set("❌ Gagal mengupdate pegawai")
     
+    def resolve_update_conflict(self, conflict):
+        """Tanya pengguna cara menyelesaikan update yang bentrok dengan penulis lain"""
+        employee_id = conflict.employee_id
+        # Segarkan baris di tabel: ganti isinya, atau buang jika sudah dihapus/tidak cocok filter
+        listed = self.table.contains(employee_id)
+        self.table.row_changed(employee_id, listed or self.tree.exists(str(employee_id)))
+
+        current = conflict.current
+        if current is None:
+            self.show_notification(f"{conflict.message}. Perubahan tidak disimpan.", "warning")
+            self.clear_fields()
+            self.status_var.set("⚠️ Pegawai sudah dihapus pengguna lain")
+            return
+
+        answer = messagebox.askyesnocancel(
+            "⚠️ Konflik Data",
+            f"{conflict.message} sejak Anda membukanya.\n\n"
+            f"Data terbaru:\n"
+            f"  Nama: {current.nama}\n"
+            f"  Alamat: {current.alamat}\n"
+            f"  Posisi: {current.posisi}\n"
+            f"  Tahun masuk: {current.tahun_masuk}\n\n"
+            f"Ya = timpa dengan perubahan Anda\n"
+            f"Tidak = muat data terbaru ke form\n"
+            f"Batal = kembali ke form tanpa menyimpan",
+            icon='warning'
+        )
+        if answer is None:
+            self.status_var.set("⚠️ Update dibatalkan karena konflik data")
+        elif answer:
+            # Timpa secara sadar: CAS ulang terhadap versi yang baru saja ditampilkan
+            self.selected_version = conflict.current_version
+            self.update_employee()
+        else:
+            self.load_into_form(current, conflict.current_version)
+            self.status_var.set(f"🔄 Data terbaru pegawai {current.nama} dimuat ke form")
+
+    def describe_db_error(self, error):
+        """Pesan error database yang lebih jelas untuk kunci dari penulis lain"""
+        if is_busy_error(error):
+            return "database sedang dipakai pengguna lain, coba lagi sebentar lagi"
+        return str(error)
+
     def get_employee_name(self, employee_id):
-        """Ambil nama pegawai berdasarkan ID"""
+        """Ambil nama pegawai berdasarkan ID (dari cache baris, query hanya jika belum ada)"""
         try:
-            self.cursor.execute('SELECT nama FROM pegawai WHERE id=?', (employee_id,))
-            result = self.cursor.fetchone()
-            return result[0] if result else "Unknown"
+            return self.repo.get_name(employee_id) or "Unknown"
         except:
             return "Unknown"
     
     def delete_employee(self):
         """Hapus pegawai dengan konfirmasi modern"""
+        if len(self.table.selected_ids) > 1:
+            self.delete_selected()
+            return
+
         selection = self.tree.selection()
         if not selection:
             self.show_notification("Pilih pegawai yang akan dihapus terlebih dahulu!", "warning")
             return
         
-        item = self.tree.item(selection[0])
-        employee_name = item['values'][1]
+        employee_id = int(selection[0])
+
+        # Baris dan versinya dari cache (baris yang tampil selalu ada di cache);
+        # jika sudah basi, delete compare-and-swap menolaknya di bawah
+        try:
+            employee, version = self.repo.get_versioned(employee_id)
+        except sqlite3.Error as e:
+            self.show_notification(f"Gagal memuat pegawai: {self.describe_db_error(e)}", "error")
+            return
+        if employee is None:
+            self.show_notification("Data pegawai sudah dihapus oleh pengguna lain", "info")
+            self.table.row_changed(employee_id, True)
+            return
+        employee_name = employee.nama
         
         # Konfirmasi hapus dengan dialog modern
         result = messagebox.askyesno(
@@ -532,96 +1567,770 @@ class EmployeeManagement:
             icon='warning'
         )
         
-        if result:
-            try:
-                employee_id = item['values'][0]
+        while result:
+            with self.metrics.measure('delete_employee') as span:
+                try:
+                    was_listed = self.table.contains(employee_id)
                 
-                self.cursor.execute('DELETE FROM pegawai WHERE id=?', (employee_id,))
-                self.conn.commit()
+                    with span.phase('query'):
+                        self.repo.delete(employee_id, expected_version=version)
                 
-                self.status_var.set(f"🗑️ Pegawai {employee_name} berhasil dihapus")
-                self.show_notification(f"Data pegawai '{employee_name}' berhasil dihapus!", "success")
-                self.clear_fields()
-                self.load_data()
+                    self.show_notification(f"Data pegawai '{employee_name}' berhasil dihapus!", "success")
+                    self.clear_fields()
+                    with span.phase('render'):
+                        self.table.row_changed(employee_id, was_listed)
+                    self.adjust_page_total(-1)
+                    self.schedule_stats_refresh()
+                    span.rows = 1
+                    self.status_var.set(f"🗑️ Pegawai {employee_name} berhasil dihapus")
+                    return
                 
+                except ConflictError as e:
+                    self.table.row_changed(employee_id, was_listed)
+                    employee, version = e.current, e.current_version
+                    if employee is None:
+                        self.show_notification(e.message, "info")
+                        self.status_var.set("⚠️ Pegawai sudah dihapus pengguna lain")
+                        return
+                    # Tampilkan data terbaru dan minta konfirmasi ulang untuk versi itu
+                    result = messagebox.askyesno(
+                        "⚠️ Konflik Data",
+                        f"{e.message} sejak Anda membukanya. Data terbaru:\n\n"
+                        f"{employee.nama} - {employee.alamat} - {employee.posisi} - {employee.tahun_masuk}\n\n"
+                        f"Tetap hapus data ini?",
+                        icon='warning'
+                    )
+                    employee_name = employee.nama
+                    if not result:
+                        self.status_var.set("⚠️ Penghapusan dibatalkan karena konflik data")
+                except sqlite3.Error as e:
+                    self.show_notification(f"Gagal menghapus pegawai: {self.describe_db_error(e)}", "error")
+                    self.status_var.set("❌ Gagal menghapus pegawai")
+                    return
+    
+    def selected_versions(self):
+        """{id: (Employee, version)} untuk semua baris terpilih, termasuk yang di luar layar"""
+        try:
+            return self.repo.get_versioned_many(sorted(self.table.selected_ids))
+        except sqlite3.Error as e:
+            self.show_notification(f"Gagal memuat pegawai: {self.describe_db_error(e)}", "error")
+            return None
+
+    def preview_names(self, selected):
+        names = [employee.nama for employee, _ in list(selected.values())[:BATCH_PREVIEW_NAMES]]
+        if len(selected) > BATCH_PREVIEW_NAMES:
+            names.append(f"... dan {len(selected) - BATCH_PREVIEW_NAMES} lainnya")
+        return '\n'.join(f"• {name}" for name in names)
+
+    def report_batch(self, action, done, conflicts):
+        """Notifikasi hasil operasi massal; baris yang bentrok dengan pengguna lain disebutkan"""
+        if conflicts:
+            self.show_notification(f"{len(done)} pegawai berhasil {action}, {len(conflicts)} dilewati "
+                                   f"karena diubah/dihapus pengguna lain", "warning")
+        else:
+            self.show_notification(f"{len(done)} pegawai berhasil {action}!", "success")
+        self.status_var.set(f"✅ {len(done)} pegawai {action}")
+
+    def delete_selected(self):
+        """Hapus semua pegawai terpilih: satu konfirmasi, satu transaksi, satu render"""
+        selected = self.selected_versions()
+        if selected is None:
+            return
+        if not selected:
+            self.show_notification("Data pegawai terpilih sudah dihapus oleh pengguna lain", "info")
+            return
+
+        result = messagebox.askyesno(
+            "🗑️ Konfirmasi Hapus Massal",
+            f"Yakin ingin menghapus {len(selected)} pegawai terpilih?\n\n"
+            f"{self.preview_names(selected)}\n\nTindakan ini tidak dapat dibatalkan.",
+            icon='warning'
+        )
+        if not result:
+            return
+
+        with self.metrics.measure('delete_selected') as span:
+            try:
+                was_listed = self.table.listed_ids(selected)
+                with span.phase('query'):
+                    deleted, conflicts = self.repo.delete_many(
+                        {row_id: version for row_id, (_, version) in selected.items()})
             except sqlite3.Error as e:
-                self.show_notification(f"Gagal menghapus pegawai: {e}", "error")
+                self.show_notification(f"Gagal menghapus pegawai: {self.describe_db_error(e)}", "error")
                 self.status_var.set("❌ Gagal menghapus pegawai")
-    
-    def load_data(self):
-        """Load semua data pegawai ke treeview"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+                return
+
+            self.clear_fields()
+            with span.phase('render'):
+                self.table.rows_changed(list(selected), was_listed)
+            self.adjust_page_total(-len(deleted))
+            self.schedule_stats_refresh()
+            span.rows = len(deleted)
+            self.report_batch("dihapus", deleted, conflicts)
+
+    def update_selected(self):
+        """Isi field form yang tidak kosong (alamat/posisi/tahun) ke semua pegawai terpilih"""
+        variables = {'alamat': self.alamat_var, 'posisi': self.posisi_var, 'tahun_masuk': self.tahun_var}
+        labels = {'alamat': "Alamat", 'posisi': "Posisi", 'tahun_masuk': "Tahun masuk"}
         try:
-            # Urutkan berdasarkan ID, bukan nama
-            self.cursor.execute('SELECT id, nama, alamat, posisi, tahun_masuk FROM pegawai ORDER BY id')
-            rows = self.cursor.fetchall()
-            
-            for row in rows:
-                self.tree.insert('', tk.END, values=row)
-            
-            self.status_var.set(f"📊 Menampilkan {len(rows)} data pegawai")
+            fields = validate_fields({field: variables[field].get() for field in BATCH_FIELDS
+                                      if str(variables[field].get()).strip()})
+        except ValidationError as e:
+            self.show_notification(f"{e.message} (isi alamat, posisi atau tahun masuk untuk edit massal)",
+                                   "warning")
+            return
+
+        selected = self.selected_versions()
+        if selected is None:
+            return
+        if not selected:
+            self.show_notification("Data pegawai terpilih sudah dihapus oleh pengguna lain", "info")
+            return
+
+        changes = '\n'.join(f"  {labels[field]}: {value}" for field, value in fields.items())
+        result = messagebox.askyesno(
+            "✏️ Konfirmasi Edit Massal",
+            f"Ubah {len(selected)} pegawai terpilih menjadi:\n{changes}\n\n"
+            f"{self.preview_names(selected)}\n\nNama tidak ikut diubah.",
+            icon='question'
+        )
+        if not result:
+            return
+
+        with self.metrics.measure('update_selected') as span:
+            try:
+                was_listed = self.table.listed_ids(selected)
+                with span.phase('query'):
+                    updated, conflicts = self.repo.update_many(
+                        {row_id: version for row_id, (_, version) in selected.items()}, fields)
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal mengupdate pegawai: {self.describe_db_error(e)}", "error")
+                self.status_var.set("❌ Gagal mengupdate pegawai")
+                return
+
+            self.clear_fields()
+            with span.phase('render'):
+                self.table.rows_changed(list(selected), was_listed)
+            self.schedule_stats_refresh()
+            span.rows = len(updated)
+            self.report_batch("diupdate", updated, conflicts)
+
+    def load_data(self):
+        """Load halaman pertama data pegawai ke treeview (keyset, waktu konstan)"""
+        # Hasil pencarian yang masih berjalan tidak boleh menimpa data lengkap
+        self.cancel_search()
+
+        with self.metrics.measure('load_data') as span:
+            try:
+                # Urutkan berdasarkan ID, bukan nama
+                with span.phase('query'):
+                    self.pager = self.repo.pager(PAGE_SIZE, self.sort)
+                self.table.take_timings()
+                self.table.set_source(self.pager)
+                span.merge(self.table.take_timings())
+                span.rows = self.table.total
+
+                self.page_frame.grid()
+                self.update_page_controls()
+                self.count_total()
+                self.schedule_stats_refresh()
+                self.status_var.set("📊 Menampilkan data pegawai")
             
-        except sqlite3.Error as e:
-            self.show_notification(f"Gagal memuat data: {e}", "error")
-            self.status_var.set("❌ Gagal memuat data")
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal memuat data: {e}", "error")
+                self.status_var.set("❌ Gagal memuat data")
+
+    def sort_by(self, heading):
+        """Klik judul kolom: urutkan naik, klik lagi untuk urutan turun"""
+        column = SORT_HEADINGS[heading][1]
+        if self.sort is not None and self.sort[0] == column:
+            self.sort = (column, not self.sort[1])
+        else:
+            self.sort = (column, False)
+
+        for name, (text, sort_column) in SORT_HEADINGS.items():
+            if sort_column == column:
+                text = f"{text} {'▼' if self.sort[1] else '▲'}"
+            self.tree.heading(name, text=text)
+
+        # Pencarian aktif diurutkan ulang oleh worker; daftar lengkap kembali ke halaman pertama
+        self.refresh_view()
+
+    def show_page(self, move, *args):
+        """Pindah halaman lewat salah satu method pager (first/next/prev/last/jump)"""
+        if self.pager is None or self.table.source is not self.pager:
+            return
+        with self.metrics.measure('page') as span:
+            try:
+                with span.phase('query'):
+                    move(*args)
+                self.table.take_timings()
+                self.table.set_source(self.pager)
+                span.merge(self.table.take_timings())
+                span.rows = self.table.total
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal memuat halaman: {e}", "error")
+        self.update_page_controls()
+
+    def first_page(self):
+        self.show_page(self.pager.first)
+
+    def prev_page(self):
+        self.show_page(self.pager.prev)
+
+    def next_page(self):
+        self.show_page(self.pager.next)
+
+    def last_page(self):
+        self.show_page(self.pager.last)
+
+    def jump_to_page(self, event=None):
+        """Lompat ke nomor halaman dari kotak 'Ke halaman'"""
+        try:
+            page = int(self.page_jump_var.get().strip())
+        except ValueError:
+            self.show_notification("Nomor halaman harus berupa angka!", "warning")
+            return
+        self.show_page(self.pager.jump, page)
+        self.page_jump_var.set('')
+
+    def update_page_controls(self):
+        """Perbarui label halaman dan tombol navigasi sesuai posisi pager"""
+        pager = self.pager
+        page = pager.page if pager.page is not None else '…'
+        pages = pager.pages if pager.pages is not None else '…'
+        total = pager.total if pager.total is not None else '…'
+        self.page_var.set(f"Halaman {page} dari {pages} · {total} pegawai")
+        for button, enabled in ((self.first_button, pager.has_prev), (self.prev_button, pager.has_prev),
+                                (self.next_button, pager.has_next), (self.last_button, pager.has_next)):
+            button.config(state='normal' if enabled else 'disabled')
+
+    def count_total(self):
+        """Hitung jumlah pegawai di thread latar belakang setelah halaman pertama tampil"""
+        self._count_generation += 1
+        generation = self._count_generation
+        pager = self.pager
+
+        def work(job):
+            repo = self.open_repo()
+            try:
+                return repo.count_rows()
+            finally:
+                repo.close()
+
+        def on_done(total):
+            # Abaikan hasil hitungan yang sudah digantikan
+            if generation == self._count_generation and pager is self.pager:
+                pager.set_total(total)
+                self.update_page_controls()
+
+        def on_error(error):
+            if generation == self._count_generation:
+                self.page_var.set(f"Gagal menghitung total: {error}")
+
+        self.start_job(work, None, on_done, on_error)
+
+    def start_job(self, work, on_progress, on_done, on_error):
+        """Jalankan BackgroundJob yang ikut dihentikan oleh close()"""
+        self._jobs = [job for job in self._jobs if job.running]
+        job = BackgroundJob(self.root, work, on_progress, on_done, on_error)
+        self._jobs.append(job)
+        return job
+
+    def adjust_page_total(self, delta):
+        """Sesuaikan total pager setelah tambah/hapus tanpa menghitung ulang"""
+        if self.pager is None or self.table.source is not self.pager:
+            return
+        if delta > 0 and not self.pager.has_next:
+            # Baris baru yang tidak muat di halaman terakhir membuka halaman berikutnya
+            self.pager.reload()
+        if self.pager.total is not None:
+            self.pager.set_total(max(0, self.pager.total + delta))
+        self.update_page_controls()
     
     def search_employee(self, event=None):
-        """Pencarian pegawai berdasarkan nama dengan highlight"""
+        """Pencarian pegawai (debounce), query dijalankan di thread latar belakang"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.start_search)
+
+    def start_search(self):
+        """Mulai pencarian untuk isi kotak pencarian saat ini"""
+        self._search_after_id = None
         search_term = self.search_var.get().strip()
-        
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+
+        if not search_term:
+            # Jika tidak ada search term, tampilkan semua data urut berdasarkan ID
+            self.load_data()
+            return
+
+        self._search_generation = self.search_worker.submit(search_term, self.sort)
+        self.status_var.set(f"⏳ Mencari '{search_term}'...")
+        if self._search_poll_id is None:
+            self._search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search)
+
+    def cancel_search(self):
+        """Batalkan pencarian yang sedang berjalan beserta polling hasilnya"""
+        self.search_worker.cancel()
+        if self._search_poll_id is not None:
+            self.root.after_cancel(self._search_poll_id)
+            self._search_poll_id = None
+
+    def poll_search(self):
+        """Ambil hasil pencarian terbaru dari worker (dijalankan di thread Tk)"""
+        self._search_poll_id = None
+        latest = None
+        while True:
+            try:
+                result = self.search_worker.results.get_nowait()
+            except queue.Empty:
+                break
+            if result[0] == self.search_worker.generation:
+                latest = result
+
+        if latest is None:
+            # Tetap menunggu hanya selama pencarian terakhir belum dibatalkan/digantikan
+            if self._search_generation == self.search_worker.generation:
+                self._search_poll_id = self.root.after(SEARCH_POLL_MS, self.poll_search)
+            return
+
+        _, search_term, sort, ids, query_ms, fuzzy = latest
         try:
-            if search_term:
-                self.cursor.execute('''
-                    SELECT id, nama, alamat, posisi, tahun_masuk FROM pegawai 
-                    WHERE nama LIKE ? OR alamat LIKE ? OR posisi LIKE ?
-                    ORDER BY id
-                ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-            else:
-                # Jika tidak ada search term, tampilkan semua data urut berdasarkan ID
-                self.cursor.execute('SELECT id, nama, alamat, posisi, tahun_masuk FROM pegawai ORDER BY id')
-            
-            rows = self.cursor.fetchall()
-            
-            for row in rows:
-                self.tree.insert('', tk.END, values=row)
-            
-            if search_term:
-                self.status_var.set(f"🔍 Ditemukan {len(rows)} pegawai untuk '{search_term}'")
+            if isinstance(ids, Exception):
+                raise ids
+            start = time.perf_counter()
+            self.table.take_timings()
+            self.table.set_source(self.repo.search_source(search_term, ids, sort, fuzzy))
+            self.page_frame.grid_remove()
+
+            # Query di worker + query jendela & render di thread Tk
+            timings = self.table.take_timings()
+            elapsed = (time.perf_counter() - start) * 1000
+            self.metrics.record('search', query_ms + elapsed, rows=self.table.total,
+                                query=query_ms + timings.get('query', 0.0),
+                                render=timings.get('render', 0.0))
+            if fuzzy:
+                self.status_var.set(f"🔍 Tidak ada yang cocok persis dengan '{search_term}', "
+                                    f"menampilkan {self.table.total} nama yang mirip")
             else:
-                self.status_var.set(f"📊 Menampilkan {len(rows)} data pegawai")
-            
+                self.status_var.set(f"🔍 Ditemukan {self.table.total} pegawai untuk '{search_term}'")
         except sqlite3.Error as e:
             self.show_notification(f"Gagal mencari data: {e}", "error")
             self.status_var.set("❌ Gagal mencari data")
-    
+
+    def toggle_perf_overlay(self, event=None):
+        """Tampilkan/sembunyikan p50/p95 per operasi di status bar"""
+        if self._overlay_after_id is not None:
+            self.root.after_cancel(self._overlay_after_id)
+            self._overlay_after_id = None
+            self.perf_label.grid_remove()
+            return
+        self.perf_label.grid(row=0, column=1, padx=(0, 15))
+        self.update_perf_overlay()
+
+    def update_perf_overlay(self):
+        self.perf_var.set(self.metrics.overlay_text())
+        self._overlay_after_id = self.root.after(PERF_OVERLAY_MS, self.update_perf_overlay)
+
+    def dump_metrics(self, event=None):
+        """Simpan catatan latensi ke file JSON (Ctrl+Shift+D)"""
+        path = filedialog.asksaveasfilename(
+            title="Simpan metrik performa", defaultextension=".json",
+            initialfile=f"metrics_{datetime.now():%Y%m%d_%H%M%S}.json",
+            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self.metrics.dump(path)
+            self.show_notification("Metrik performa berhasil disimpan", "success")
+        except OSError as e:
+            self.show_notification(f"Gagal menyimpan metrik: {e}", "error")
+
+    def schedule_stats_refresh(self):
+        """Gabungkan beberapa perubahan beruntun menjadi satu refresh dashboard"""
+        if self._stats_after_id is None:
+            self._stats_after_id = self.root.after(STATS_REFRESH_MS, self.refresh_stats)
+
+    def refresh_stats(self):
+        """Isi dashboard dari tabel ringkasan (O(jumlah kelompok))"""
+        self._stats_after_id = None
+        with self.metrics.measure('stats') as span:
+            try:
+                with span.phase('query'):
+                    by_posisi = self.repo.stats_by_posisi()
+                    by_tahun = self.repo.stats_by_tahun()
+            except sqlite3.Error as e:
+                self.stats_title_var.set(f"📈 Statistik Pegawai (gagal dimuat: {e})")
+                return
+            with span.phase('render'):
+                self.fill_stats_table(self.stats_posisi_tree, by_posisi)
+                self.fill_stats_table(self.stats_tahun_tree, by_tahun)
+            span.rows = len(by_posisi) + len(by_tahun)
+
+        total = sum(count for _, count in by_tahun)
+        self.stats_title_var.set(f"📈 Statistik Pegawai · {total} pegawai, "
+                                 f"{len(by_posisi)} posisi, {len(by_tahun)} tahun masuk")
+
+    def fill_stats_table(self, tree, groups):
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        largest = max((count for _, count in groups), default=0)
+        for group, count in groups:
+            bar = '█' * max(1, round(STATS_BAR_WIDTH * count / largest)) if largest else ''
+            tree.insert('', tk.END, values=(group, count, bar))
+
+    def start_change_feed(self):
+        """Mulai polling log perubahan dari posisi terakhir saat ini"""
+        try:
+            self._data_version = self.repo.data_version()
+            self._change_seq = self.repo.last_change_seq()
+        except sqlite3.Error as e:
+            self.status_var.set(f"⚠️ Auto-refresh tidak aktif: {e}")
+            return
+        self._change_after_id = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+
+    def poll_changes(self):
+        """Terapkan perubahan dari proses lain ke tampilan, hanya baris yang berubah.
+
+        PRAGMA data_version hanya berubah jika koneksi lain meng-commit, jadi
+        saat tidak ada penulis lain setiap tick cukup satu pragma murah.
+        """
+        self._change_after_id = self.root.after(CHANGE_POLL_MS, self.poll_changes)
+        try:
+            version = self.repo.data_version()
+            if version == self._data_version:
+                return
+            self._data_version = version
+            changes = self.repo.changes_since(self._change_seq, CHANGE_BATCH_LIMIT + 1)
+            bulk = len(changes) > CHANGE_BATCH_LIMIT
+            last_seq = self.repo.last_change_seq() if bulk else None
+        except sqlite3.Error:
+            return
+        if not changes:
+            return
+
+        if bulk:
+            # Perubahan massal (mis. import): lebih murah memuat ulang tampilan saat ini.
+            # Entri yang sudah dipangkas trigger juga berakhir di sini, karena setelah
+            # pemangkasan selalu tersisa lebih dari CHANGE_BATCH_LIMIT entri
+            self._change_seq = last_seq
+            self.repo.row_cache.clear()
+            self.reload_current_view()
+            self.schedule_stats_refresh()
+            self.status_var.set("🔄 Tampilan dimuat ulang karena banyak perubahan dari pengguna lain")
+            return
+        self._change_seq = changes[-1][0]
+
+        row_ids = list(dict.fromkeys(row_id for _, row_id, _ in changes))
+        self.repo.row_cache.invalidate(row_ids)
+        # Indeks autocomplete mengejar log perubahan sendiri saat dipakai (lihat sync_value_indexes)
+        with self.metrics.measure('change_feed') as span:
+            # Satu batch per tick: sumber diperbarui sekali (pager: satu reload) dan dirender sekali
+            was_listed = {row_id for row_id in row_ids if self.table.has_row(row_id)}
+            try:
+                self.table.rows_changed(row_ids, was_listed)
+            except sqlite3.Error:
+                return
+            span.rows = len(row_ids)
+        self.schedule_stats_refresh()
+
+        if any(op != 'U' for _, _, op in changes) and self.table.source is self.pager:
+            self.count_total()
+            self.update_page_controls()
+        if self.selected_id in row_ids:
+            self.status_var.set("⚠️ Data yang sedang diedit baru saja diubah pengguna lain")
+        else:
+            self.status_var.set(f"🔄 {len(row_ids)} perubahan dari pengguna lain diterapkan")
+
+    def reload_current_view(self):
+        """Muat ulang halaman/hasil pencarian yang sedang tampil tanpa kembali ke awal"""
+        if self.table.source is self.pager and self.pager is not None:
+            self.show_page(self.pager.reload)
+            self.count_total()
+        elif self.search_var.get().strip():
+            self.start_search()
+
+    def refresh_view(self):
+        """Muat ulang tampilan sesuai kotak pencarian saat ini"""
+        if self.search_var.get().strip():
+            self.start_search()
+        else:
+            self.load_data()
+
+    def start_import(self):
+        """Import data pegawai dari file CSV/JSON tanpa memblokir mainloop"""
+        if self._import_job is not None and self._import_job.running:
+            if messagebox.askyesno("📥 Import", "Import sedang berjalan.\n\nBatalkan import?",
+                                   icon='question'):
+                self._import_job.cancel()
+            return
+
+        path = filedialog.askopenfilename(
+            title="Pilih file data pegawai",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json *.jsonl *.ndjson"), ("Semua file", "*.*")])
+        if not path:
+            return
+        # Diimpor saat dibutuhkan saja supaya startup GUI tetap ringan
+        from EmployeeImport import import_employees
+
+        def work(job):
+            # Thread import memakai koneksi database sendiri
+            repo = self.open_repo()
+            try:
+                return import_employees(repo, path, progress=job.report, cancel=job.cancel_event)
+            finally:
+                repo.close()
+
+        def on_progress(result, fraction):
+            self.status_var.set(f"📥 Import {fraction:.0%}: {result.processed} baris dibaca, "
+                                f"{result.inserted} masuk")
+
+        def on_error(error):
+            self.show_notification(f"Import gagal: {error}", "error")
+            self.status_var.set("❌ Import gagal")
+            self.refresh_view()
+
+        self._import_job = self.start_job(work, on_progress, self.finish_import, on_error)
+        self.status_var.set("📥 Import dimulai...")
+
+    def finish_import(self, result):
+        """Ringkasan import dan muat ulang tampilan"""
+        self.refresh_view()
+        self.schedule_stats_refresh()
+        summary = f"{result.inserted} pegawai ditambahkan, {len(result.rejected)} baris ditolak"
+        if result.cancelled:
+            summary = f"Import dibatalkan: {summary}"
+        self.status_var.set(f"📥 {summary}")
+        self.show_notification(summary, "warning" if result.rejected or result.cancelled else "success")
+
+        if result.rejected:
+            # Tampilkan beberapa penolakan pertama saja
+            lines = [f"Baris {line_no}: {reason}" for line_no, reason in result.rejected[:10]]
+            if len(result.rejected) > 10:
+                lines.append(f"... dan {len(result.rejected) - 10} baris lainnya")
+            messagebox.showwarning("📥 Baris Ditolak", "\n".join(lines))
+
+    def start_export(self):
+        """Export seluruh data (atau hasil pencarian aktif) ke CSV/JSON di latar belakang"""
+        if self._export_job is not None and self._export_job.running:
+            if messagebox.askyesno("📤 Export", "Export sedang berjalan.\n\nBatalkan export?",
+                                   icon='question'):
+                self._export_job.cancel()
+            return
+
+        path = filedialog.asksaveasfilename(
+            title="Simpan data pegawai",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("JSON", "*.json")])
+        if not path:
+            return
+        from EmployeeExport import export_employees
+
+        # Ikuti data yang sedang tampil di tabel: hasil pencarian diexport dari daftar ID-nya
+        # (salinan, karena tabel bisa berubah selama export), bukan dengan menjalankan ulang kata kunci
+        source = self.table.source
+        ids = array('q', source.ids) if isinstance(source, PegawaiIdList) else None
+        sort = self.sort
+        total = self.pager.total if source is self.pager else self.table.total
+
+        def work(job):
+            repo = self.open_repo()
+            try:
+                return export_employees(repo, path, total=total, ids=ids, sort=sort,
+                                        progress=job.report, cancel=job.cancel_event)
+            finally:
+                repo.close()
+
+        def on_progress(result, fraction):
+            percent = f" {fraction:.0%}" if fraction is not None else ""
+            self.status_var.set(f"📤 Export{percent}: {result.written} baris ditulis")
+
+        def on_done(result):
+            if result.cancelled:
+                self.status_var.set("📤 Export dibatalkan")
+                self.show_notification("Export dibatalkan", "warning")
+            else:
+                self.status_var.set(f"📤 {result.written} pegawai diexport")
+                self.show_notification(f"{result.written} pegawai berhasil diexport!", "success")
+
+        def on_error(error):
+            self.show_notification(f"Export gagal: {error}", "error")
+            self.status_var.set("❌ Export gagal")
+
+        self._export_job = self.start_job(work, on_progress, on_done, on_error)
+        self.status_var.set("📤 Export dimulai...")
+
+    def schedule_backup(self, delay_ms=None):
+        """Jadwalkan backup otomatis berikutnya (default: interval setelah backup terakhir)"""
+        if not self.backup_interval_min:
+            return
+        from EmployeeBackup import list_backups
+        interval_ms = self.backup_interval_min * 60 * 1000
+        if delay_ms is None:
+            try:
+                backups = list_backups(self.db_path)
+                age_ms = (time.time() - os.path.getmtime(backups[0])) * 1000 if backups else interval_ms
+            except OSError:
+                age_ms = interval_ms
+            delay_ms = max(BACKUP_STARTUP_DELAY_MS, int(interval_ms - age_ms))
+        self._backup_after_id = self.root.after(delay_ms, self.scheduled_backup)
+
+    def scheduled_backup(self):
+        self._backup_after_id = None
+        if self._backup_job is not None and self._backup_job.running:
+            self.schedule_backup()
+        elif self._restore_job is not None and self._restore_job.running:
+            self.schedule_backup(BACKUP_STARTUP_DELAY_MS)
+        else:
+            self.start_backup(scheduled=True)
+
+    def start_backup(self, scheduled=False):
+        """Backup online database di latar belakang lalu rotasi backup lama.
+
+        Backup otomatis (scheduled) hanya melapor di status bar kecuali gagal.
+        """
+        if self._backup_job is not None and self._backup_job.running:
+            if messagebox.askyesno("💾 Backup", "Backup sedang berjalan.\n\nBatalkan backup?",
+                                   icon='question'):
+                self._backup_job.cancel()
+            return
+        if self._restore_job is not None and self._restore_job.running:
+            self.show_notification("Restore sedang berjalan, tunggu sampai selesai", "warning")
+            return
+        from EmployeeBackup import backup_database, rotate_backups
+
+        db_path, keep, busy_timeout_ms = self.db_path, self.backup_keep, self.busy_timeout_ms
+
+        def work(job):
+            result = backup_database(db_path, progress=job.report, cancel=job.cancel_event,
+                                     busy_timeout_ms=busy_timeout_ms)
+            if not result.cancelled:
+                result.removed = rotate_backups(db_path, keep)
+            return result
+
+        def on_progress(result, fraction):
+            if not scheduled:
+                self.status_var.set(f"💾 Backup {fraction:.0%}: {result.pages}/{result.total_pages} halaman")
+
+        def on_done(result):
+            if result.cancelled:
+                self.status_var.set("💾 Backup dibatalkan")
+                self.show_notification("Backup dibatalkan", "warning")
+            else:
+                name = os.path.basename(result.path)
+                self.status_var.set(f"💾 Backup {result.rows} pegawai tersimpan: {name}")
+                if not scheduled:
+                    self.show_notification(f"Backup berhasil disimpan: {name}", "success")
+            if scheduled:
+                self.schedule_backup()
+
+        def on_error(error):
+            self.show_notification(f"Backup gagal: {error}", "error")
+            self.status_var.set("❌ Backup gagal")
+            if scheduled:
+                self.schedule_backup(self.backup_interval_min * 60 * 1000)
+
+        self._backup_job = self.start_job(work, on_progress, on_done, on_error)
+        if not scheduled:
+            self.status_var.set("💾 Backup dimulai...")
+
+    def start_restore(self):
+        """Pulihkan database dari file backup (diverifikasi dulu) di latar belakang"""
+        if any(job is not None and job.running
+               for job in (self._backup_job, self._restore_job, self._import_job)):
+            self.show_notification("Tunggu backup/restore/import yang sedang berjalan selesai", "warning")
+            return
+        from EmployeeBackup import backup_dir, restore_database
+
+        path = filedialog.askopenfilename(
+            title="Pilih file backup",
+            initialdir=backup_dir(self.db_path),
+            filetypes=[("Backup database", "*.db"), ("Semua file", "*.*")])
+        if not path:
+            return
+        if not messagebox.askyesno(
+                "♻️ Restore",
+                f"Timpa seluruh data pegawai dengan isi backup:\n{os.path.basename(path)}\n\n"
+                "Database saat ini disimpan dulu sebagai backup 'sebelum-restore'.",
+                icon='warning'):
+            return
+
+        db_path, busy_timeout_ms, journal_mode = self.db_path, self.busy_timeout_ms, self.journal_mode
+
+        def work(job):
+            return restore_database(path, db_path, progress=job.report, busy_timeout_ms=busy_timeout_ms,
+                                    journal_mode=journal_mode)
+
+        def on_progress(result, fraction):
+            self.status_var.set(f"♻️ Restore {fraction:.0%}: {result.pages}/{result.total_pages} halaman")
+
+        def on_error(error):
+            self.show_notification(f"Restore gagal: {error}", "error")
+            self.status_var.set("❌ Restore gagal, data tidak diubah")
+
+        self._restore_job = self.start_job(work, on_progress, self.after_restore, on_error)
+        self.status_var.set("♻️ Memeriksa file backup...")
+
+    def after_restore(self, result):
+        """Isi database diganti seluruhnya: buang semua cache lalu muat ulang tampilan"""
+        try:
+            self.repo.init_schema()
+            self.repo.row_cache.clear()
+            self.repo.reset_value_indexes()
+            self._value_index_job = None
+            # Log perubahan ikut dipulihkan; mulai lagi dari posisi terakhirnya
+            self._data_version = self.repo.data_version()
+            self._change_seq = self.repo.last_change_seq()
+        except sqlite3.Error as e:
+            self.show_notification(f"Gagal membuka database hasil restore: {e}", "error")
+            return
+        self.clear_fields()
+        self.search_var.set("")
+        self.load_data()
+        self.show_notification(f"{result.rows} pegawai dipulihkan dari {os.path.basename(result.path)}",
+                               "success")
+
     def on_item_select(self, event):
         """Handle double click pada item treeview"""
         selection = self.tree.selection()
         if selection:
-            item = self.tree.item(selection[0])
-            values = item['values']
-            
-            self.selected_id = values[0]
-            self.nama_var.set(values[1])
-            self.alamat_var.set(values[2])
-            self.posisi_var.set(values[3])
-            self.tahun_var.set(values[4])
-            
-            self.status_var.set(f"✏️ Siap edit data pegawai: {values[1]}")
-            self.show_notification(f"Data pegawai '{values[1]}' siap untuk diedit", "info")
+            # Muat dari cache baris (bukan dari string Treeview) beserta versinya;
+            # versi yang basi ditangkap oleh update compare-and-swap
+            employee_id = int(selection[0])
+            try:
+                employee, version = self.repo.get_versioned(employee_id)
+            except sqlite3.Error as e:
+                self.show_notification(f"Gagal memuat pegawai: {self.describe_db_error(e)}", "error")
+                return
+            if employee is None:
+                self.show_notification("Data pegawai sudah dihapus oleh pengguna lain", "info")
+                self.table.row_changed(employee_id, True)
+                return
+
+            self.load_into_form(employee, version)
+            self.status_var.set(f"✏️ Siap edit data pegawai: {employee.nama}")
+            self.show_notification(f"Data pegawai '{employee.nama}' siap untuk diedit", "info")
+
+    def load_into_form(self, employee, version):
+        """Isi form edit dengan data pegawai dan ingat versinya untuk update CAS"""
+        self.selected_id = employee.id
+        self.selected_version = version
+        self.nama_var.set(employee.nama)
+        self.alamat_var.set(employee.alamat)
+        self.posisi_var.set(employee.posisi)
+        self.tahun_var.set(employee.tahun_masuk)
+        if self.tree.exists(str(employee.id)):
+            self.tree.item(str(employee.id), values=employee)
     
     def on_single_click(self, event):
         """Handle single click untuk highlight"""
         selection = self.tree.selection()
         if selection:
-            item = self.tree.item(selection[0])
-            values = item['values']
-            self.status_var.set(f"📋 Terpilih: {values[1]} - {values[3]}")
+            entry = self.repo.row_cache.get(int(selection[0]))
+            if entry is not None:
+                employee = entry[0]
+                self.status_var.set(f"📋 Terpilih: {employee.nama} - {employee.posisi}")
     
     def clear_fields(self):
         """Clear semua input fields dengan animasi"""
@@ -630,58 +2339,76 @@ class EmployeeManagement:
         self.posisi_var.set('')
         self.tahun_var.set('')
         self.selected_id = None
+        self.selected_version = None
         self.status_var.set("🧹 Form berhasil dibersihkan")
         
-        # Clear selection di treeview
+        # Clear selection di treeview (termasuk baris terpilih yang sudah di-scroll keluar)
+        self.table.selected_ids.clear()
         for item in self.tree.selection():
             self.tree.selection_remove(item)
     
     def validate_input(self):
         """Validasi input form dengan pesan yang lebih user-friendly"""
-        # Validasi nama
-        if not self.nama_var.get().strip():
-            self.show_notification("Nama lengkap wajib diisi!", "warning")
-            self.nama_entry.focus()
-            return False
-        
-        if len(self.nama_var.get().strip()) < 3:
-            self.show_notification("Nama minimal 3 karakter!", "warning")
-            self.nama_entry.focus()
-            return False
-        
-        # Validasi alamat
-        if not self.alamat_var.get().strip():
-            self.show_notification("Alamat wajib diisi!", "warning")
-            self.alamat_entry.focus()
-            return False
-        
-        # Validasi posisi
-        if not self.posisi_var.get().strip():
-            self.show_notification("Posisi/Jabatan wajib diisi!", "warning")
-            self.posisi_entry.focus()
-            return False
-        
-        # Validasi tahun masuk
         try:
-            tahun = int(self.tahun_var.get().strip())
-            current_year = datetime.now().year
-            if tahun < 1950 or tahun > current_year:
-                self.show_notification(f"Tahun masuk harus antara 1950 - {current_year}!", "warning")
-                self.tahun_entry.focus()
-                return False
-        except ValueError:
-            self.show_notification("Tahun masuk harus berupa angka yang valid!", "warning")
-            self.tahun_entry.focus()
+            validate_employee(self.nama_var.get(), self.alamat_var.get(),
+                              self.posisi_var.get(), self.tahun_var.get())
+        except ValidationError as e:
+            self.show_notification(e.message, "warning")
+            # Fokus ke field yang salah
+            entries = {'nama': self.nama_entry, 'alamat': self.alamat_entry,
+                       'posisi': self.posisi_entry, 'tahun_masuk': self.tahun_entry}
+            entries[e.field].focus()
             return False
         
         return True
     
+    def close(self):
+        """Hentikan semua timer, pekerjaan latar belakang dan worker, lalu tutup koneksi database.
+
+        Aman dipanggil berulang kali (mis. saat keluar lalu lagi dari __del__).
+        """
+        if getattr(self, '_closed', True):
+            return
+        self._closed = True
+        for name in AFTER_ID_ATTRIBUTES:
+            after_id = getattr(self, name, None)
+            if after_id is not None:
+                try:
+                    self.root.after_cancel(after_id)
+                except tk.TclError:
+                    pass  # Window sudah dihancurkan
+                setattr(self, name, None)
+        if hasattr(self, 'notifications'):
+            self.notifications.cancel()
+        for job in self._jobs:
+            job.stop()
+        if hasattr(self, 'events'):
+            self.events.cancel()
+        if hasattr(self, 'search_worker'):
+            self.search_worker.close()
+        if hasattr(self, 'repo'):
+            self.repo.close()
+
     def __del__(self):
         """Destructor untuk menutup koneksi database"""
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistem Management Pegawai (GUI)")
+    parser.add_argument('--db', default=DB_FILE, help="lokasi database (default: %(default)s)")
+    parser.add_argument('--journal-mode', default='WAL', choices=JOURNAL_MODES, type=str.upper,
+                        help="journal SQLite; pakai DELETE untuk database di network drive "
+                             "(default: %(default)s)")
+    parser.add_argument('--busy-timeout', type=int, default=5000, metavar='MS',
+                        help="lama menunggu database yang dikunci penulis lain (default: %(default)s)")
+    parser.add_argument('--backup-interval', type=int, default=BACKUP_INTERVAL_MIN, metavar='MENIT',
+                        help="interval backup otomatis, 0 = nonaktif (default: %(default)s)")
+    parser.add_argument('--backup-keep', type=int, default=BACKUP_KEEP, metavar='N',
+                        help="jumlah file backup yang disimpan (default: %(default)s)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="cetak waktu startup (JSON) lalu keluar setelah data awal tampil")
+    args = parser.parse_args(argv)
 
-def main():
     # Set DPI awareness untuk Windows (opsional)
     try:
         from ctypes import windll
@@ -696,8 +2423,21 @@ def main():
         root.iconbitmap('icon.ico')  # Ganti dengan path icon Anda
     except:
         pass
+
+    def on_ready(app):
+        if args.profile_startup:
+            print(app.startup.to_json())
+            app.close()
+            root.destroy()
+            return
+        # Tampilkan pesan selamat datang
+        root.after(1000, lambda: app.show_notification(
+            "Selamat datang di Sistem Management Pegawai Modern! 🎉", "info"))
     
-    app = EmployeeManagement(root)
+    app = EmployeeManagement(root, args.db, busy_timeout_ms=args.busy_timeout,
+                             journal_mode=args.journal_mode, on_ready=on_ready,
+                             backup_interval_min=0 if args.profile_startup else args.backup_interval,
+                             backup_keep=args.backup_keep)
     
     # Handle window close dengan konfirmasi
     def on_closing():
@@ -707,25 +2447,17 @@ def main():
             icon='question'
         )
         if result:
-            if hasattr(app, 'conn'):
-                app.conn.close()
+            app.close()
             root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)
     
-    # Tampilkan pesan selamat datang
-    root.after(1000, lambda: app.show_notification(
-        "Selamat datang di Sistem Management Pegawai Modern! 🎉", "info"))
-    
-    # Center window di layar
-    root.update_idletasks()
-    width = root.winfo_width()
-    height = root.winfo_height()
-    x = (root.winfo_screenwidth() // 2) - (width // 2)
-    y = (root.winfo_screenheight() // 2) - (height // 2)
-    root.geometry(f'{width}x{height}+{x}+{y}')
+    # Center window di layar; ukuran sudah diketahui sehingga tidak perlu update_idletasks()
+    x = (root.winfo_screenwidth() // 2) - (WINDOW_WIDTH // 2)
+    y = (root.winfo_screenheight() // 2) - (WINDOW_HEIGHT // 2)
+    root.geometry(f'{WINDOW_WIDTH}x{WINDOW_HEIGHT}+{x}+{y}')
     
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,71 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+# Modul aplikasi berada di folder induk (bukan paket)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from EmployeeRepository import EmployeeRepository
+
+# Data contoh: nama unik, alamat/posisi berulang
+SAMPLE_ROWS = [
+    (f"Pegawai {i:03d}", f"Jl. {['Merdeka', 'Sudirman', 'Thamrin'][i % 3]} No. {i}, Jambi",
+     ['Staf', 'Manajer', 'Kasir', 'Satpam'][i % 4], 1990 + i % 30)
+    for i in range(1, 251)
+]
+
+class FakeRoot:
+    """Pengganti root Tk untuk kode yang hanya memakai after/after_cancel (test tanpa display)"""
+    def __init__(self):
+        self.now = 0
+        self.pending = {}
+        self._ids = itertools.count(1)
+
+    def after(self, delay_ms, callback, *args):
+        after_id = next(self._ids)
+        self.pending[after_id] = (self.now + delay_ms, callback, args)
+        return after_id
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def advance(self, ms):
+        """Majukan waktu dan jalankan callback yang jatuh tempo, urut waktu lalu urut jadwal"""
+        target = self.now + ms
+        while True:
+            due = [(when, after_id) for after_id, (when, _, _) in self.pending.items() if when <= target]
+            if not due:
+                break
+            when, after_id = min(due)
+            _, callback, args = self.pending.pop(after_id)
+            self.now = when
+            callback(*args)
+        self.now = target
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Database baru dengan skema terbaru dan SAMPLE_ROWS"""
+    path = str(tmp_path / 'pegawai.db')
+    repo = EmployeeRepository(path)
+    repo.init_schema()
+    repo.add_many(SAMPLE_ROWS)
+    repo.close()
+    return path
+
+@pytest.fixture
+def repo(db_path):
+    repo = EmployeeRepository(db_path)
+    yield repo
+    repo.close()
+
+@pytest.fixture
+def other(db_path):
+    """Koneksi kedua, berperan sebagai proses lain"""
+    repo = EmployeeRepository(db_path)
+    yield repo
+    repo.close()
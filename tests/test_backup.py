@@ -0,0 +1,92 @@
+import os
+import threading
+from datetime import datetime
+
+import pytest
+
+from EmployeeBackup import (BackupError, backup_database, backup_dir, backup_path, list_backups,
+                            restore_database, rotate_backups, verify_backup)
+from conftest import SAMPLE_ROWS
+
+def test_backup_is_verified_and_standalone(db_path, repo):
+    # Perubahan yang masih di WAL ikut tersalin
+    repo.add('Pegawai Baru', 'Jl. Baru', 'Kurir', 2021)
+    fractions = []
+    result = backup_database(db_path, pages=1, progress=lambda result, fraction: fractions.append(fraction))
+    assert os.path.dirname(result.path) == backup_dir(db_path)
+    assert result.rows == len(SAMPLE_ROWS) + 1 and not result.cancelled
+    assert fractions and fractions[-1] == 1.0
+    assert not os.path.exists(result.path + '-wal')
+    assert verify_backup(result.path, full=True) == len(SAMPLE_ROWS) + 1
+
+def test_cancelled_backup_leaves_no_file(db_path):
+    cancel = threading.Event()
+    cancel.set()
+    result = backup_database(db_path, pages=1, cancel=cancel)
+    assert result.cancelled
+    assert list_backups(db_path) == []
+    assert not any(name.endswith('.part') for name in os.listdir(backup_dir(db_path)))
+
+def test_verify_rejects_missing_and_corrupt_files(tmp_path):
+    with pytest.raises(BackupError, match='tidak ditemukan'):
+        verify_backup(str(tmp_path / 'tidak-ada.db'))
+    corrupt = tmp_path / 'rusak.db'
+    corrupt.write_bytes(b'bukan database sqlite' * 200)
+    with pytest.raises(BackupError):
+        verify_backup(str(corrupt))
+
+def test_backup_names_are_unique_and_rotation_keeps_newest(db_path):
+    now = datetime(2026, 1, 2, 3, 4, 5)
+    first = backup_path(db_path, now=now)
+    assert os.path.basename(first) == 'pegawai-20260102-030405.db'
+    os.makedirs(os.path.dirname(first))
+    open(first, 'w').close()
+    second = backup_path(db_path, now=now)
+    assert second.endswith('pegawai-20260102-030405-1.db')
+    open(second, 'w').close()
+    # Backup kedua dalam detik yang sama lebih baru, meski namanya urut lebih dulu
+    assert list_backups(db_path) == [second, first]
+
+    paths = [backup_path(db_path, now=datetime(2026, 1, day)) for day in range(2, 7)]
+    for path in paths:
+        open(path, 'w').close()
+    removed = rotate_backups(db_path, keep=2)
+    assert list_backups(db_path) == [paths[-1], paths[-2]]
+    assert len(removed) == 5 and first in removed and second in removed
+
+def test_only_plain_backups_are_listed_and_rotated(db_path):
+    paths = [backup_path(db_path, now=datetime(2026, 1, day)) for day in range(2, 5)]
+    os.makedirs(os.path.dirname(paths[0]))
+    safety = backup_path(db_path, label='sebelum-restore', now=datetime(2026, 1, 1))
+    # File lain di folder backup: nama mirip, database lain, salinan manual, file sementara
+    others = ['pegawai-lama.db', 'pegawai-2-20260102-030405.db', 'pegawai-20260102.db',
+              'pegawai-20260102-030405.db.part', 'Pegawai-20260102-030405.db']
+    for path in paths + [safety] + [os.path.join(os.path.dirname(safety), name) for name in others]:
+        open(path, 'w').close()
+
+    assert list_backups(db_path) == paths[::-1]
+    assert list_backups(db_path, labeled=True) == paths[::-1] + [safety]
+    assert rotate_backups(db_path, keep=1) == paths[1::-1]
+    # Salinan sebelum restore dan file lain tidak ikut dirotasi
+    assert os.path.exists(safety)
+    assert all(os.path.exists(os.path.join(os.path.dirname(safety), name)) for name in others)
+
+def test_restore_replaces_data_and_keeps_safety_copy(db_path, repo):
+    backup = backup_database(db_path).path
+    repo.delete_many({row_id: 1 for row_id in range(1, 101)})
+    assert repo.count_rows() == len(SAMPLE_ROWS) - 100
+
+    result = restore_database(backup, db_path)
+    assert result.rows == len(SAMPLE_ROWS)
+    # Koneksi yang sudah terbuka melihat isi hasil restore
+    assert repo.get(1) is not None
+    assert verify_backup(result.safety_copy) == len(SAMPLE_ROWS) - 100
+    assert 'sebelum-restore' in os.path.basename(result.safety_copy)
+
+def test_restore_rejects_corrupt_backup_without_touching_database(db_path, repo, tmp_path):
+    corrupt = tmp_path / 'rusak.db'
+    corrupt.write_bytes(b'bukan database sqlite' * 200)
+    with pytest.raises(BackupError):
+        restore_database(str(corrupt), db_path)
+    assert repo.count_rows() == len(SAMPLE_ROWS)
+    assert list_backups(db_path) == []
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from EmployeeCLI import main
+from EmployeeRepository import SQL_CREATE_TABLE, EmployeeRepository
+from conftest import SAMPLE_ROWS
+
+@pytest.fixture
+def cli(db_path, capsys):
+    def run(*argv):
+        code = main(['--db', db_path] + [str(arg) for arg in argv])
+        out, err = capsys.readouterr()
+        return code, out, err
+    return run
+
+def ids(out):
+    return [int(line.split('\t')[0]) for line in out.splitlines()]
+
+def test_read_commands(cli):
+    assert ids(cli('list', '--after', 10, '--limit', 3)[1]) == [11, 12, 13]
+    code, out, _ = cli('search', 'Pegawai 01', '--limit', 3, '--json')
+    assert code == 0 and len(out.splitlines()) == 3
+    assert all('Pegawai 01' in json.loads(line)['nama'] for line in out.splitlines())
+    assert cli('count')[1].strip() == str(len(SAMPLE_ROWS))
+    assert cli('count', 'Pegawai 00')[1].strip() == '9'
+    assert json.loads(cli('get', 2, '--json')[1])['nama'] == SAMPLE_ROWS[1][0]
+    assert cli('stats')[1].splitlines()[0] == 'Kasir\t63'
+    assert json.loads(cli('stats', '--by', 'tahun', '--json')[1].splitlines()[0]) == \
+        {'tahun_masuk': 1990, 'jumlah': 8}
+    code, _, err = cli('get', 9999)
+    assert code == 1 and 'tidak ditemukan' in err
+
+def test_write_commands(cli):
+    code, out, _ = cli('add', '--nama', 'Aldi Saputra', '--alamat', 'Jambi', '--posisi', 'Staf', '--tahun', 2020)
+    new_id = int(out)
+    assert code == 0 and new_id == len(SAMPLE_ROWS) + 1
+
+    code, _, err = cli('add', '--nama', 'ALDI SAPUTRA', '--alamat', 'Jambi', '--posisi', 'Staf', '--tahun', 2020)
+    assert code == 1 and 'sudah terdaftar' in err
+    code, _, err = cli('add', '--nama', 'Bima', '--alamat', 'Jambi', '--posisi', 'Staf', '--tahun', 'abc')
+    assert code == 1 and 'tahun_masuk' in err
+
+    # Field yang tidak diisi tetap memakai nilai lama
+    assert cli('update', new_id, '--posisi', 'Manajer')[0] == 0
+    assert cli('get', new_id)[1].split('\t')[1:4] == ['Aldi Saputra', 'Jambi', 'Manajer']
+    assert cli('delete', new_id)[0] == 0
+    assert cli('delete', new_id)[0] == 1
+
+def test_import_and_export_are_forwarded(cli, tmp_path):
+    source = tmp_path / 'baru.csv'
+    source.write_text('nama,alamat,posisi,tahun_masuk\nCitra Dewi,Padang,Staf,2019\n', encoding='utf-8')
+    assert cli('import', source)[0] == 0
+    target = tmp_path / 'hasil.jsonl'
+    assert cli('export', target, '--search', 'Citra')[0] == 0
+    assert [json.loads(line)['nama'] for line in target.read_text(encoding='utf-8').splitlines()] == ['Citra Dewi']
+
+def test_dedupe_names_repairs_blocked_migration(tmp_path, capsys):
+    path = str(tmp_path / 'lama.db')
+    conn = sqlite3.connect(path)
+    conn.execute(SQL_CREATE_TABLE)
+    conn.executemany('INSERT INTO pegawai(nama, alamat, posisi, tahun_masuk) VALUES (?, ?, ?, ?)',
+                     [('Budi', 'Jambi', 'Staf', 2000), ('BUDI', 'Jambi', 'Staf', 2001)])
+    conn.commit()
+    conn.close()
+
+    assert main(['--db', path, 'count']) == 1
+    assert 'dedupe-names' in capsys.readouterr().err
+    assert main(['--db', path, 'dedupe-names', '--list']) == 0
+    assert capsys.readouterr().out == 'BUDI\n'
+    assert main(['--db', path, 'dedupe-names']) == 0
+    assert capsys.readouterr().out == '2\tBUDI\tBUDI (2)\n'
+    assert main(['--db', path, 'count']) == 0
+
+    repo = EmployeeRepository(path)
+    try:
+        assert repo.duplicate_names() == []
+    finally:
+        repo.close()
+
+def test_cli_does_not_import_tkinter():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', "import sys, EmployeeCLI; print('tkinter' in sys.modules)"],
+                            cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == 'False'
+
+def test_global_connection_options(cli):
+    code, out, _ = cli('--journal-mode', 'delete', '--busy-timeout', 100, 'count')
+    assert code == 0 and out.strip() == str(len(SAMPLE_ROWS))
+    with pytest.raises(SystemExit):
+        cli('--journal-mode', 'memory', 'count')
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from EmployeeMetrics import OperationMetrics
+from ManagementTools import FRAME_MS, EventCoalescer, wheel_units
+from conftest import FakeRoot
+
+def wheel(delta=0, num=None):
+    return SimpleNamespace(delta=delta, num=num)
+
+def test_burst_runs_handler_once_with_last_event():
+    root = FakeRoot()
+    metrics = OperationMetrics()
+    coalescer = EventCoalescer(root, metrics=metrics)
+    seen = []
+    callback = coalescer.wrap('configure', seen.append)
+
+    for width in (100, 200, 300):
+        callback(SimpleNamespace(width=width))
+    assert seen == []
+    root.advance(FRAME_MS)
+
+    assert [event.width for event in seen] == [300]
+    assert metrics.counters == {'events.configure': 3, 'events.configure.collapsed': 2,
+                                'events.configure.runs': 1}
+    assert coalescer.pending == {} and coalescer.after_ids == {}
+
+def test_merge_sums_wheel_steps_and_returns_result():
+    root = FakeRoot()
+    coalescer = EventCoalescer(root)
+    seen = []
+    callback = coalescer.wrap('wheel', seen.append, merge=wheel_units, result='break')
+
+    # Windows/macOS: delta positif = ke atas; X11: Button-4 ke atas, Button-5 ke bawah
+    assert callback(wheel(delta=-120)) == 'break'
+    callback(wheel(delta=-120))
+    callback(wheel(num=5))
+    callback(wheel(num=4))
+    root.advance(FRAME_MS)
+    assert seen == [2]
+
+def test_handler_runs_at_most_once_per_frame():
+    root = FakeRoot()
+    coalescer = EventCoalescer(root, frame_ms=1000)
+    seen = []
+    callback = coalescer.wrap('key', seen.append)
+
+    callback('a')
+    root.advance(0)
+    assert seen == ['a']
+    # Event berikutnya dalam frame yang sama menunggu sisa frame
+    callback('b')
+    callback('c')
+    root.advance(0)
+    assert seen == ['a']
+    root.advance(1000)
+    assert seen == ['a', 'c']
+
+def test_cancel_drops_pending_handlers():
+    root = FakeRoot()
+    coalescer = EventCoalescer(root)
+    seen = []
+    coalescer.wrap('configure', seen.append)('event')
+    assert root.pending
+
+    coalescer.cancel()
+    assert root.pending == {} and coalescer.pending == {}
+    root.advance(FRAME_MS)
+    assert seen == []
@@ -0,0 +1,80 @@
+import csv
+import json
+import os
+import threading
+
+import pytest
+
+from EmployeeExport import export_employees
+from conftest import SAMPLE_ROWS
+
+@pytest.fixture
+def out_dir(tmp_path):
+    """Folder kosong untuk file export (database test ada di tmp_path)"""
+    path = tmp_path / 'export'
+    path.mkdir()
+    return path
+
+def test_csv_export_writes_whole_table(repo, out_dir):
+    path = str(out_dir / 'pegawai.csv')
+    fractions = []
+    result = export_employees(repo, path, chunk_size=100, total=len(SAMPLE_ROWS),
+                              progress=lambda result, fraction: fractions.append(fraction))
+    with open(path, newline='', encoding='utf-8') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ['id', 'nama', 'alamat', 'posisi', 'tahun_masuk']
+    assert rows[1] == ['1'] + [str(value) for value in SAMPLE_ROWS[0]]
+    assert result.written == len(rows) - 1 == len(SAMPLE_ROWS)
+    assert fractions == [0.4, 0.8, 1.0]
+    assert os.listdir(out_dir) == ['pegawai.csv']
+
+def test_json_array_and_json_lines(repo, out_dir):
+    path = str(out_dir / 'cari.json')
+    export_employees(repo, path, term='Pegawai 00', chunk_size=4)
+    with open(path, encoding='utf-8') as file:
+        # Urutan peringkat FTS, isinya tetap Pegawai 001-009
+        assert sorted(item['id'] for item in json.load(file)) == list(range(1, 10))
+
+    path = str(out_dir / 'semua.jsonl')
+    export_employees(repo, path, chunk_size=100)
+    with open(path, encoding='utf-8') as file:
+        items = [json.loads(line) for line in file]
+    assert len(items) == len(SAMPLE_ROWS) and items[-1]['nama'] == SAMPLE_ROWS[-1][0]
+
+def test_export_by_ids_keeps_table_order_and_skips_deleted_rows(repo, out_dir):
+    repo.delete(4)
+    path = str(out_dir / 'tampil.json')
+    result = export_employees(repo, path, ids=[5, 3, 999, 4, 1])
+    with open(path, encoding='utf-8') as file:
+        assert [item['id'] for item in json.load(file)] == [5, 3, 1]
+    assert result.written == 3
+    # Potongan ID yang semua barisnya sudah hilang tidak menghasilkan batch kosong
+    assert [[row.id for row in batch] for batch in repo.iter_rows_by_ids([5, 999, 4, 3], chunk_size=2)] == [[5], [3]]
+
+def test_cancelled_export_keeps_existing_file(repo, out_dir):
+    path = out_dir / 'pegawai.csv'
+    path.write_text('lama\n', encoding='utf-8')
+    cancel = threading.Event()
+    result = export_employees(repo, str(path), chunk_size=10, cancel=cancel,
+                              progress=lambda result, fraction: cancel.set())
+    assert result.cancelled and result.written == 10
+    assert path.read_text(encoding='utf-8') == 'lama\n'
+    assert os.listdir(out_dir) == ['pegawai.csv']
+
+def test_failed_export_removes_part_file(repo, out_dir):
+    def fail(result, fraction):
+        raise RuntimeError('disk penuh')
+    path = str(out_dir / 'pegawai.jsonl')
+    with pytest.raises(RuntimeError):
+        export_employees(repo, path, chunk_size=10, progress=fail)
+    assert os.listdir(out_dir) == []
+
+def test_export_follows_table_sort(repo, out_dir):
+    path = str(out_dir / 'urut.jsonl')
+    export_employees(repo, path, sort=('tahun_masuk', True))
+    with open(path, encoding='utf-8') as file:
+        rows = [json.loads(line) for line in file]
+    years = [row['tahun_masuk'] for row in rows]
+    assert len(rows) == len(SAMPLE_ROWS) and years == sorted(years, reverse=True)
+    # Nilai sama diurutkan menurut id, searah dengan kolom urut (seperti KeysetPager)
+    assert [row['id'] for row in rows[:3]] == [239, 209, 179]
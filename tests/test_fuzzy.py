@@ -0,0 +1,64 @@
+import pytest
+
+from EmployeeFuzzy import edit_distance, name_similarity, nama_key, rank_names
+from EmployeeRepository import nama_trigrams
+
+@pytest.mark.parametrize('a, b, distance', [
+    ('budi', 'budi', 0),
+    ('budi', 'bdui', 1),       # tukar dua huruf bersebelahan
+    ('budi', 'budhi', 1),      # sisip
+    ('santoso', 'santso', 1),  # hapus
+    ('budi', 'badi', 1),       # ganti
+    ('ca', 'abc', 3),          # OSA: tanpa edit lanjutan atas huruf yang sudah ditukar
+    ('', 'abc', 3),
+    ('kitten', 'sitting', 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b) == distance
+    assert edit_distance(b, a) == distance
+
+def test_edit_distance_stops_at_limit():
+    assert edit_distance('kitten', 'sitting', limit=3) == 3
+    assert edit_distance('kitten', 'sitting', limit=2) == 3
+    # Beda panjang saja sudah melebihi limit
+    assert edit_distance('a', 'abcdef', limit=2) == 3
+    assert edit_distance('abcdefgh', 'zyxwvuts', limit=1) == 2
+
+def test_name_similarity_matches_words_inside_full_name():
+    assert name_similarity('budi', 'Budi Santoso 12') == 1.0
+    assert name_similarity('SANTOSO', 'Budi  Santoso') == 1.0
+    assert name_similarity('bdui santso', 'Budi Santoso 12') == pytest.approx(1 - 2 / 12)
+    assert name_similarity('zzzz', 'Budi Santoso', floor=0.5) == 0.0
+
+def test_name_similarity_cache_is_shared_between_names():
+    cache = {}
+    name_similarity('budi', 'Santoso Budi', cache=cache)
+    assert cache['budi'] == 1.0 and 'santoso' in cache
+    cache['santoso'] = 0.9  # skor dari cache dipakai tanpa dihitung ulang
+    assert name_similarity('budi', 'Santoso', cache=cache) == 0.9
+
+def test_name_similarity_folds_like_trigram_index():
+    # Hanya huruf ASCII yang dikecilkan, sama seperti nama_key/nama_trigrams (COLLATE NOCASE)
+    cache = {}
+    name_similarity('budi', 'Émile BUDI', cache=cache)
+    assert set(cache) == {'budi', 'Émile'}
+    assert nama_key('BUDI Émile') == 'budi Émile'
+    assert '  é' not in nama_trigrams('Émile')
+
+def test_rank_names_orders_by_similarity_then_shared_trigrams():
+    candidates = [
+        (1, 'Budi Santoso', 5),
+        (2, 'Bodi Santoso', 3),
+        (3, 'Budi Santosa', 4),
+        (4, 'Joko Widodo', 1),
+    ]
+    ranked = rank_names('budi santoso', candidates, limit=10)
+    assert [row_id for row_id, _ in ranked] == [1, 3, 2]
+    assert ranked[0][1] == 1.0
+    assert rank_names('budi santoso', candidates, limit=1) == [(1, 1.0)]
+
+def test_repository_fuzzy_search(repo):
+    repo.add('Budi Santoso', 'Jl. Merdeka', 'Staf', 2010)
+    ids = [row_id for row_id, _ in repo.fuzzy_search('Bdui Santso')]
+    assert ids and repo.get(ids[0]).nama == 'Budi Santoso'
+    assert repo.fuzzy_search('qqqqqqq') == []
@@ -0,0 +1,91 @@
+import json
+import threading
+
+import pytest
+
+import EmployeeImport
+from EmployeeImport import import_employees
+from conftest import SAMPLE_ROWS
+
+CSV_HEADER = 'Nama,Alamat,Posisi,Tahun\n'
+
+def write_file(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def count(repo):
+    return repo.conn.execute('SELECT COUNT(*) FROM pegawai').fetchone()[0]
+
+def names(repo):
+    return {row[0] for row in repo.conn.execute('SELECT nama FROM pegawai')}
+
+def test_csv_import_validates_and_writes_in_batches(repo, tmp_path):
+    path = write_file(tmp_path, 'pegawai.csv', CSV_HEADER + (
+        'Aldi Saputra,Jambi,Staf,2020\n'
+        'Bima Sakti,Medan,Kasir,2019\n'
+        ',Jambi,Staf,2020\n'
+        'Citra Dewi,Padang,Staf,tahun lalu\n'
+        'ALDI SAPUTRA,Jambi,Staf,2021\n'
+        'pegawai 001,Jambi,Staf,2021\n'
+        'Dewi Lestari,Bogor,Manajer,2018\n'))
+    progress = []
+    result = import_employees(repo, path, batch_size=2,
+                              progress=lambda result, fraction: progress.append(fraction))
+
+    assert (result.processed, result.inserted) == (7, 3)
+    assert [line_no for line_no, _ in result.rejected] == [4, 5, 6, 7]
+    assert 'wajib' in result.rejected[0][1] and 'angka' in result.rejected[1][1]
+    assert 'lebih dari sekali' in result.rejected[2][1]
+    assert 'sudah terdaftar' in result.rejected[3][1]
+    assert {'Aldi Saputra', 'Bima Sakti', 'Dewi Lestari'} <= names(repo)
+    assert len(progress) == 3 and progress[-1] == 1.0
+
+def test_json_lines_and_json_array(repo, tmp_path, monkeypatch):
+    jsonl = write_file(tmp_path, 'pegawai.jsonl', (
+        json.dumps({'nama': 'Eka Putri', 'alamat': 'Solo', 'posisi': 'Staf', 'tahun_masuk': 2015}) + '\n'
+        '{bukan json\n'
+        '\n'
+        + json.dumps(['bukan', 'objek']) + '\n'))
+    result = import_employees(repo, jsonl)
+    assert result.inserted == 1 and [line_no for line_no, _ in result.rejected] == [2, 4]
+
+    # Chunk kecil: objek terpotong di batas chunk harus tetap terbaca utuh
+    monkeypatch.setattr(EmployeeImport, 'JSON_CHUNK_SIZE', 7)
+    records = [{'Nama': f'Fajar {i}', 'Alamat': 'Bandung', 'Posisi': 'Staf', 'Tahun': 2010 + i} for i in range(5)]
+    array_path = write_file(tmp_path, 'pegawai.json', json.dumps(records, indent=2))
+    result = import_employees(repo, array_path, batch_size=2)
+    assert result.inserted == 5 and not result.rejected
+    assert count(repo) == len(SAMPLE_ROWS) + 6
+
+def test_unterminated_json_array_is_an_error(repo, tmp_path):
+    path = write_file(tmp_path, 'rusak.json', '[{"nama": "Gita Ayu", "alamat": "x", "posisi": "y", "tahun": 2000}')
+    with pytest.raises(ValueError):
+        import_employees(repo, path)
+
+def test_concurrent_duplicate_falls_back_to_row_by_row(repo, other, tmp_path):
+    path = write_file(tmp_path, 'pegawai.csv', CSV_HEADER + (
+        'Hadi Wijaya,Jambi,Staf,2020\n'
+        'Indah Sari,Jambi,Staf,2020\n'
+        'Joko Susilo,Jambi,Staf,2020\n'))
+    # Proses lain menyisipkan nama yang sama setelah probe nama selesai
+    real_existing_names = repo.existing_names
+
+    def existing_names(batch_names):
+        found = real_existing_names(batch_names)
+        other.add('INDAH SARI', 'Medan', 'Kasir', 2019)
+        return found
+    repo.existing_names = existing_names
+
+    result = import_employees(repo, path)
+    assert result.inserted == 2
+    assert result.rejected == [(3, "Nama 'Indah Sari' sudah terdaftar")]
+    assert {'Hadi Wijaya', 'Joko Susilo', 'INDAH SARI'} <= names(repo)
+
+def test_cancelled_import_stops_before_writing(repo, tmp_path):
+    path = write_file(tmp_path, 'pegawai.csv', CSV_HEADER + 'Kiki Amelia,Jambi,Staf,2020\n')
+    cancel = threading.Event()
+    cancel.set()
+    result = import_employees(repo, path, cancel=cancel)
+    assert result.cancelled and result.inserted == 0
+    assert count(repo) == len(SAMPLE_ROWS)
@@ -0,0 +1,54 @@
+import threading
+
+from ManagementTools import JOB_POLL_MS, BackgroundJob
+from conftest import FakeRoot
+
+def run_job(root, work):
+    events = []
+    job = BackgroundJob(root, work, lambda *args: events.append(('progress',) + args),
+                        lambda result: events.append(('done', result)),
+                        lambda error: events.append(('error', str(error))))
+    return job, events
+
+def test_callbacks_run_on_poll():
+    root = FakeRoot()
+
+    def work(job):
+        job.report(0.5)
+        return 42
+    job, events = run_job(root, work)
+    job.thread.join()
+    root.advance(JOB_POLL_MS)
+    assert events == [('progress', 0.5), ('done', 42)]
+    assert not job.running and root.pending == {}
+
+def test_errors_are_reported():
+    root = FakeRoot()
+
+    def work(job):
+        raise ValueError('rusak')
+    job, events = run_job(root, work)
+    job.thread.join()
+    root.advance(JOB_POLL_MS)
+    assert events == [('error', 'rusak')]
+
+def test_stop_cancels_work_and_polling():
+    root = FakeRoot()
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        job.cancel_event.wait(5)
+        return 'selesai'
+    job, events = run_job(root, work)
+    started.wait(5)
+    root.advance(JOB_POLL_MS * 3)
+    assert len(root.pending) == 1
+
+    job.stop()
+    job.thread.join(5)
+    assert not job.thread.is_alive() and root.pending == {}
+    # Hasil yang tiba setelah stop() tidak pernah sampai ke callback
+    root.advance(JOB_POLL_MS * 3)
+    assert events == [] and not job.running
+    job.stop()
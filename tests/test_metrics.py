@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from EmployeeMetrics import OperationMetrics, StartupProfile, percentile
+
+def test_percentile_nearest_rank():
+    values = [5, 1, 4, 2, 3, 10, 9, 8, 7, 6]
+    assert percentile([], 0.5) == 0.0
+    assert percentile(values, 0.50) == 5
+    assert percentile(values, 0.95) == 10
+    assert percentile(values, 0.0) == 1
+
+def test_ring_buffer_keeps_only_latest_records():
+    metrics = OperationMetrics(capacity=3)
+    for i in range(5):
+        metrics.record('scroll', float(i), rows=i)
+    records = metrics.snapshot()
+    assert [entry['rows'] for entry in records] == [2, 3, 4]
+    assert metrics.summary()['scroll']['count'] == 3
+
+def test_measure_records_phases_even_on_error():
+    metrics = OperationMetrics()
+    with metrics.measure('load_data') as span:
+        with span.phase('query'):
+            pass
+        span.merge({'render': 1.5})
+        span.add('render', 0.5)
+        span.rows = 42
+
+    with pytest.raises(RuntimeError):
+        with metrics.measure('search'):
+            raise RuntimeError('gagal')
+
+    load, search = metrics.snapshot()
+    assert load['op'] == 'load_data' and load['rows'] == 42
+    assert load['render_ms'] == 2.0 and 'query_ms' in load
+    assert load['total_ms'] >= load['query_ms']
+    # Operasi yang gagal tetap tercatat
+    assert search['op'] == 'search' and search['rows'] == 0
+
+def test_summary_and_overlay():
+    metrics = OperationMetrics()
+    for ms in range(1, 21):
+        metrics.record('search', float(ms), rows=ms, query=ms / 2, render=1.0)
+    metrics.record('scroll', 3.0)
+    metrics.record('search', 100.0, rows=7)
+
+    stats = metrics.summary()['search']
+    assert stats['count'] == 21
+    assert stats['p50_ms'] == 11.0 and stats['p95_ms'] == 20.0
+    assert stats['last_rows'] == 7
+    # Fase hanya dihitung dari catatan yang memilikinya
+    assert stats['p50_query_ms'] == 5.0 and stats['p50_render_ms'] == 1.0
+
+    assert metrics.recent_operations() == ['search', 'scroll']
+    assert metrics.overlay_text().startswith('⏱ search p50 11.0 / p95 20.0 ms · scroll')
+    assert OperationMetrics().overlay_text() == '⏱ belum ada data'
+
+def test_dump_writes_summary_and_records(tmp_path):
+    metrics = OperationMetrics()
+    metrics.record('add', 2.0, rows=1)
+    path = tmp_path / 'metrics.json'
+    metrics.dump(str(path))
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['summary']['add']['count'] == 1
+    assert data['records'][0]['total_ms'] == 2.0
+
+def test_startup_profile_phases_are_differences_between_marks():
+    profile = StartupProfile()
+    profile.marks = {'theme': 5.0, 'database': 12.5, 'first_paint': 40.0}
+    assert profile.phases() == {'theme': 5.0, 'database': 7.5, 'first_paint': 27.5}
+
+    metrics = OperationMetrics()
+    profile.record(metrics)
+    entry = metrics.snapshot()[0]
+    assert entry['op'] == 'startup' and entry['total_ms'] == 40.0
+    assert entry['database_ms'] == 7.5
+    assert json.loads(profile.to_json())['marks_ms']['first_paint'] == 40.0
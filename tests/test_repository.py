@@ -0,0 +1,352 @@
+import sqlite3
+
+import pytest
+
+import EmployeeRepository as repository
+from EmployeeRepository import (AUTOCOMPLETE_COLUMNS, SCHEMA_MIGRATIONS, SQL_CREATE_TABLE, ConflictError,
+                                DuplicateNamesError, Employee, EmployeeRepository, PrefixIndex, RowCache,
+                                ValidationError, fts_available, nama_key)
+from conftest import SAMPLE_ROWS
+
+LATEST_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+def legacy_database(path, rows):
+    """Database versi lama: tabel pegawai tanpa migrasi apa pun"""
+    conn = sqlite3.connect(path)
+    conn.execute(SQL_CREATE_TABLE)
+    conn.executemany('INSERT INTO pegawai(nama, alamat, posisi, tahun_masuk) VALUES (?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+    return path
+
+def search(repo, term):
+    return sorted(row_id for batch in repo.iter_search_ids(term) for row_id in batch)
+
+# --- Migrasi ---
+
+def test_init_schema_applies_all_migrations_once(db_path):
+    repo = EmployeeRepository(db_path)
+    try:
+        assert repo.conn.execute('PRAGMA user_version').fetchone()[0] == LATEST_VERSION
+        # Sudah di versi terbaru: tidak ada migrasi yang dijalankan ulang
+        assert repo.init_schema() == LATEST_VERSION
+        assert search(repo, 'Pegawai 007') == [7]
+    finally:
+        repo.close()
+
+def test_failed_migration_is_rolled_back(tmp_path):
+    path = legacy_database(str(tmp_path / 'ganda.db'), [('Budi', 'Jambi', 'Staf', 2000),
+                                                        ('BUDI', 'Jambi', 'Staf', 2001),
+                                                        ('Siti', 'Jambi', 'Staf', 2002),
+                                                        ('siti', 'Jambi', 'Staf', 2003)])
+    repo = EmployeeRepository(path)
+    try:
+        # Migrasi 2 (nama unik tanpa beda huruf) gagal karena nama ganda
+        with pytest.raises(DuplicateNamesError) as error:
+            repo.init_schema()
+        assert error.value.names == ['BUDI', 'Siti']
+        assert repo.conn.execute('PRAGMA user_version').fetchone()[0] == 1
+        indexes = {row[0] for row in repo.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert 'idx_pegawai_nama_nocase' not in indexes
+    finally:
+        repo.close()
+
+def test_dedupe_names_unblocks_migration(tmp_path):
+    path = legacy_database(str(tmp_path / 'ganda.db'), [('Budi', 'Jambi', 'Staf', 2000),
+                                                        ('BUDI', 'Jambi', 'Staf', 2001),
+                                                        ('Budi (2)', 'Jambi', 'Staf', 2002),
+                                                        ('budi', 'Jambi', 'Staf', 2003)])
+    repo = EmployeeRepository(path)
+    try:
+        # ID terkecil tiap kelompok tetap; akhiran yang sudah dipakai dilewati
+        assert repo.dedupe_names() == [(2, 'BUDI', 'BUDI (3)'), (4, 'budi', 'budi (4)')]
+        assert repo.dedupe_names() == []
+        assert repo.init_schema() == LATEST_VERSION
+        with pytest.raises(sqlite3.IntegrityError):
+            repo.add('bUDI', 'Jambi', 'Staf', 2004)
+    finally:
+        repo.close()
+
+def test_missing_fts_index_is_built_on_open(repo, db_path):
+    # Seperti database yang dimigrasi oleh SQLite tanpa FTS5: versi tercatat, indeks tidak ada
+    with repo.conn:
+        for trigger in ('pegawai_fts_ai', 'pegawai_fts_ad', 'pegawai_fts_au'):
+            repo.conn.execute(f'DROP TRIGGER {trigger}')
+        repo.conn.execute('DROP TABLE pegawai_fts')
+    repo.add('Pegawai Baru', 'Jl. Baru', 'Kurir', 2021)
+    assert not fts_available(repo.conn)
+
+    reopened = EmployeeRepository(db_path)
+    try:
+        assert reopened.init_schema() == LATEST_VERSION
+        assert fts_available(reopened.conn)
+        assert reopened.use_fts and search(reopened, 'Pegawai Baru') == [len(SAMPLE_ROWS) + 1]
+    finally:
+        reopened.close()
+
+# --- Log perubahan ---
+
+def test_change_log_records_operations_and_values(repo, other):
+    seq = repo.last_change_seq()
+    version = repo.data_version()
+    row_id = other.add('Pegawai Baru', 'Jl. Baru', 'Kurir', 2021)
+    other.update(row_id, 'Pegawai Baru', 'Jl. Lama', 'Kurir', 2021)
+    other.delete(row_id)
+    # Commit koneksi lain terlihat lewat data_version
+    assert repo.data_version() != version
+    assert [(pegawai_id, op) for _, pegawai_id, op in repo.changes_since(seq)] == \
+        [(row_id, 'I'), (row_id, 'U'), (row_id, 'D')]
+    assert repo.changes_since(seq, limit=2)[-1][0] == seq + 2
+    values = repo.conn.execute('SELECT alamat_lama, alamat_baru FROM pegawai_changes WHERE seq > ? ORDER BY seq',
+                               (seq,)).fetchall()
+    assert values == [(None, 'Jl. Baru'), ('Jl. Baru', 'Jl. Lama'), ('Jl. Lama', None)]
+
+def test_change_log_is_pruned_by_trigger(tmp_path, monkeypatch):
+    monkeypatch.setattr(repository, 'CHANGE_LOG_KEEP', 20)
+    monkeypatch.setattr(repository, 'CHANGE_LOG_PRUNE_EVERY', 10)
+    repo = EmployeeRepository(str(tmp_path / 'log.db'))
+    try:
+        repo.init_schema()
+        row_id = repo.add('Pegawai Baru', 'Jambi', 'Staf', 2020)
+        for year in range(2001, 2036):
+            repo.update(row_id, 'Pegawai Baru', 'Jambi', 'Staf', year)
+        # seq 36: pemangkasan terakhir di seq 30 membuang seq <= 10
+        seqs = [seq for seq, _, _ in repo.changes_since(0)]
+        assert seqs == list(range(11, 37))
+    finally:
+        repo.close()
+
+# --- Compare-and-swap ---
+
+def test_update_with_current_version_bumps_version(repo):
+    row, version = repo.get_versioned(1)
+    assert repo.update(1, row.nama, 'Jl. Baru', row.posisi, row.tahun_masuk, expected_version=version)
+    assert repo.get_versioned(1, cached=False) == (row._replace(alamat='Jl. Baru'), version + 1)
+
+def test_stale_version_raises_conflict_with_latest_row(repo, other):
+    row, version = repo.get_versioned(1)
+    other.update(1, row.nama, 'Jl. Lain', row.posisi, row.tahun_masuk)
+    with pytest.raises(ConflictError) as error:
+        repo.update(1, row.nama, 'Jl. Saya', row.posisi, row.tahun_masuk, expected_version=version)
+    assert error.value.current.alamat == 'Jl. Lain'
+    assert error.value.current_version == version + 1
+
+    with pytest.raises(ConflictError):
+        repo.delete(1, expected_version=version)
+    assert repo.delete(1, expected_version=version + 1)
+    with pytest.raises(ConflictError) as error:
+        repo.delete(1, expected_version=version + 1)
+    assert error.value.current is None
+
+def test_journal_mode_is_configurable(db_path):
+    # Untuk network drive: tanpa WAL (dan tanpa file -wal/-shm)
+    repo = EmployeeRepository(db_path, journal_mode='DELETE')
+    try:
+        assert repo.journal_mode == 'delete'
+        assert repo.get(1).nama == SAMPLE_ROWS[0][0]
+    finally:
+        repo.close()
+
+# --- Operasi massal ---
+
+def test_batch_update_skips_conflicting_rows(repo, other):
+    versions = {row_id: version for row_id, (_, version) in repo.get_versioned_many([1, 2, 3]).items()}
+    other.update(2, SAMPLE_ROWS[1][0], 'x', 'y', 2000)
+    updated, conflicts = repo.update_many(versions, {'posisi': 'Direktur'})
+    assert (updated, conflicts) == ([1, 3], [2])
+    assert [repo.get(row_id).posisi for row_id in (1, 2, 3)] == ['Direktur', 'y', 'Direktur']
+    # Versi baris yang diupdate naik, cache ikut diperbarui
+    assert repo.get_versioned(1) == repo.get_versioned(1, cached=False)
+    assert repo.get_versioned(1)[1] == versions[1] + 1
+
+def test_batch_delete_skips_changed_and_missing_rows(repo, other):
+    versions = {row_id: version for row_id, (_, version) in repo.get_versioned_many([4, 5, 6, 7]).items()}
+    other.update(5, SAMPLE_ROWS[4][0], 'Medan', 'Staf', 2000)
+    other.delete(6)
+    deleted, conflicts = repo.delete_many(versions)
+    assert (deleted, conflicts) == ([4, 7], [5, 6])
+    assert repo.get_versioned_many([4, 5, 6, 7]).keys() == {5}
+    assert_stats_match_table(repo)
+
+def test_batch_update_validates_fields(repo):
+    versions = {1: repo.get_versioned(1)[1]}
+    for fields in ({'nama': 'Sama Semua'}, {'tahun_masuk': 'abc'}, {}):
+        with pytest.raises(ValidationError):
+            repo.update_many(versions, fields)
+    assert repo.get(1) == Employee(1, *SAMPLE_ROWS[0])
+
+# --- Statistik ---
+
+def assert_stats_match_table(repo):
+    """Ringkasan yang dijaga trigger harus sama dengan agregasi penuh tabel pegawai"""
+    conn = repo.conn
+    assert repo.stats_by_posisi() == conn.execute(
+        'SELECT posisi, COUNT(*) AS n FROM pegawai GROUP BY posisi ORDER BY n DESC, posisi').fetchall()
+    assert repo.stats_by_tahun() == conn.execute(
+        'SELECT tahun_masuk, COUNT(*) FROM pegawai GROUP BY tahun_masuk ORDER BY tahun_masuk').fetchall()
+    assert repo.count_rows() == conn.execute('SELECT COUNT(*) FROM pegawai').fetchone()[0]
+
+def test_stats_triggers_follow_writes(repo, other):
+    assert_stats_match_table(repo)
+    row_id = other.add('Pegawai Baru', 'Jambi', 'Direktur', 1985)
+    other.update(1, SAMPLE_ROWS[0][0], 'Medan', 'Direktur', 1985)   # posisi dan tahun berubah
+    other.update(2, SAMPLE_ROWS[1][0], 'Medan', SAMPLE_ROWS[1][2], SAMPLE_ROWS[1][3])  # kolom lain saja
+    other.delete(3)
+    other.add_many([('Pegawai Impor 1', 'Jambi', 'Kurir', 2022), ('Pegawai Impor 2', 'Jambi', 'Kurir', 2022)])
+    assert ('Direktur', 2) in repo.stats_by_posisi() and (1985, 2) in repo.stats_by_tahun()
+    assert_stats_match_table(repo)
+
+    # Kelompok yang kosong dihapus dari ringkasan
+    other.delete(row_id)
+    other.delete(1)
+    assert 'Direktur' not in dict(repo.stats_by_posisi())
+    assert_stats_match_table(repo)
+
+def test_stats_migration_fills_existing_rows(tmp_path):
+    path = legacy_database(str(tmp_path / 'lama.db'), SAMPLE_ROWS[:30])
+    repo = EmployeeRepository(path)
+    try:
+        repo.init_schema()
+        assert repo.use_stats
+        assert_stats_match_table(repo)
+    finally:
+        repo.close()
+
+# --- RowCache ---
+
+def test_row_cache_evicts_least_recently_used():
+    cache = RowCache(capacity=2)
+    rows = [Employee(i, f'P{i}', 'a', 'b', 2000) for i in range(3)]
+    cache.put(rows[0], 1)
+    cache.put(rows[1], 1)
+    assert cache.get(0) == (rows[0], 1)  # 0 jadi yang terbaru dipakai
+    cache.put(rows[2], 1)
+    assert cache.get(1) is None
+    assert cache.get(0) is not None and cache.get(2) is not None
+    cache.invalidate([0, 99])
+    assert len(cache) == 1
+
+def test_repository_keeps_row_cache_in_step_with_writes(repo):
+    row, version = repo.get_versioned(5)
+    assert repo.row_cache.get(5) == (row, version)
+    repo.update(5, row.nama, 'Jl. Cache', row.posisi, row.tahun_masuk, expected_version=version)
+    assert repo.row_cache.get(5) == (row._replace(alamat='Jl. Cache'), version + 1)
+    repo.delete(5)
+    assert repo.row_cache.get(5) is None
+
+# --- KeysetPager ---
+
+def sorted_rows(repo, sort):
+    """Semua baris dalam urutan yang sama dengan KeysetPager (kunci urut Python, lalu id)"""
+    rows = repo.get_many([row_id for row_id, in repo.conn.execute('SELECT id FROM pegawai')])
+    column, descending = sort
+
+    def key(row):
+        value = getattr(row, column)
+        return (nama_key(value) if isinstance(value, str) else value), row.id
+    return sorted(rows, key=key, reverse=descending)
+
+@pytest.mark.parametrize('sort', [None, ('nama', True), ('posisi', False), ('tahun_masuk', True)])
+def test_pager_pages_match_sorted_table(repo, sort):
+    expected = sorted_rows(repo, sort or ('id', False))
+    pager = repo.pager(40, sort)
+    pages = [pager.rows]
+    while pager.has_next:
+        pages.append(pager.next())
+    assert [row for page in pages for row in page] == expected
+    assert pager.page == len(pages) == 7
+
+    # Mundur dengan keyset terbalik menghasilkan halaman yang sama
+    for index in range(len(pages) - 2, -1, -1):
+        assert pager.prev() == pages[index]
+    assert not pager.has_prev and pager.page == 1
+
+@pytest.mark.parametrize('sort', [None, ('alamat', False)])
+def test_pager_jump_and_last(repo, sort):
+    expected = sorted_rows(repo, sort or ('id', False))
+    pager = repo.pager(40, sort)
+    assert pager.jump(3) == expected[80:120]
+    assert pager.has_prev and pager.has_next
+    pager.set_total(len(expected))
+    # Halaman terakhir mengikuti pembagian per nomor halaman (sisa 10 baris)
+    assert pager.last() == expected[240:]
+    assert pager.page == pager.pages == 7
+    assert pager.jump(100) == expected[240:]
+
+def test_pager_reloads_page_when_sort_value_changes(repo):
+    pager = repo.pager(40, ('nama', False))
+    pager.next()
+    target, anchor = pager.rows[5], pager.rows[30]
+    # Masih di rentang halaman ini, tapi posisinya di halaman berubah
+    repo.update(target.id, anchor.nama + ' A', target.alamat, target.posisi, target.tahun_masuk)
+    assert pager.contains(target.id)
+    row, moved = pager.refresh_row(target.id)
+    assert moved and row.nama == anchor.nama + ' A'
+    keys = [nama_key(row.nama) for row in pager.rows]
+    assert keys == sorted(keys)
+    assert pager.rows.index(row) == 30
+
+def test_pager_refresh_row_without_sort_change_patches_in_place(repo):
+    pager = repo.pager(40, ('nama', False))
+    target = pager.rows[5]
+    repo.update(target.id, target.nama, 'Jl. Baru', target.posisi, target.tahun_masuk)
+    row, moved = pager.refresh_row(target.id)
+    assert not moved and pager.rows[5] == row
+
+def test_pager_follows_inserts_and_deletes(repo):
+    pager = repo.pager(40)
+    pager.set_total(len(SAMPLE_ROWS))
+    pager.last()
+    assert pager.contains(repo.add('Pegawai Baru', 'Jambi', 'Staf', 2020))
+    pager.insert_id(251)
+    assert pager.rows[-1].id == 251 and not pager.contains(5)
+
+    pager.first()
+    repo.delete(1)
+    pager.remove_id(1)
+    assert [row.id for row in pager.rows] == list(range(2, 42))
+
+# --- Autocomplete ---
+
+def test_prefix_index_suggests_most_used_spelling_first():
+    index = PrefixIndex([('Staf', 5), ('staf ', 1), ('Staf IT', 2), ('Satpam', 9), ('Manajer', 3)])
+    assert len(index) == 4  # 'Staf' dan 'staf ' satu kunci
+    assert index.suggest('s') == ['Satpam', 'Staf', 'Staf IT']
+    assert index.suggest('  STAF') == ['Staf', 'Staf IT']
+    assert index.suggest('') == []
+
+    index.discard('Staf', 5)
+    assert index.suggest('staf') == ['Staf IT', 'staf ']
+    index.discard('staf ')
+    assert index.suggest('staf') == ['Staf IT']
+    index.add('Kasir')
+    assert index.suggest('k') == ['Kasir']
+
+def test_prefix_index_scans_limited_keys():
+    index = PrefixIndex((f'Jl. {i:04d}', 1) for i in range(1000))
+    assert len(index.suggest('jl.', limit=5, scan=50)) == 5
+    assert index.suggest('jl. 0999') == ['Jl. 0999']
+
+def test_value_indexes_follow_change_log(repo, other):
+    assert repo.suggest('posisi', 'Dir', build=False) is None
+    assert repo.suggest('posisi', 'Dir') == []
+
+    row_id = other.add('Pegawai Direksi', 'Jl. Direksi', 'Direktur', 2020)
+    assert repo.suggest('posisi', 'Dir') == ['Direktur']
+    repo.update(row_id, 'Pegawai Direksi', 'Jl. Direksi', 'Wakil Direktur', 2020)
+    assert repo.suggest('posisi', 'Dir') == []
+    other.delete(row_id)
+    assert repo.suggest('alamat', 'jl. dir') == []
+
+    # Hasil mengejar log sama dengan membangun ulang dari tabel
+    synced = {column: repo.value_index(column).variants for column in AUTOCOMPLETE_COLUMNS}
+    indexes, _ = repo.build_value_indexes()
+    assert synced == {column: index.variants for column, index in indexes.items()}
+
+def test_value_indexes_dropped_when_change_log_is_pruned(repo, other):
+    repo.value_index('posisi')
+    other.add('Pegawai Baru', 'Jl. Baru', 'Kurir', 2021)
+    other.add('Pegawai Lain', 'Jl. Lain', 'Kurir', 2021)
+    other.prune_changes(keep=1)
+    assert repo.suggest('posisi', 'Kur', build=False) is None
+    assert repo.suggest('posisi', 'Kur') == ['Kurir']
@@ -0,0 +1,166 @@
+import asyncio
+import http.client
+import json
+import socket
+import sqlite3
+import threading
+
+import pytest
+
+from EmployeeServer import EmployeeServer
+from conftest import SAMPLE_ROWS
+
+class Api:
+    """Server di event loop thread sendiri, dipanggil lewat http.client biasa"""
+    def __init__(self, db_path):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = EmployeeServer(db_path, readers=2)
+        self.host, self.port = self.run(self.server.start('127.0.0.1', 0))
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def request(self, method, path, body=None):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        try:
+            data = body if isinstance(body, (bytes, str)) or body is None else json.dumps(body)
+            conn.request(method, path, body=data)
+            response = conn.getresponse()
+            payload = response.read()
+            return response.status, json.loads(payload) if payload else None
+        finally:
+            conn.close()
+
+    def raw(self, data):
+        """Kirim byte mentah; kembalikan status line respons"""
+        with socket.create_connection((self.host, self.port), timeout=10) as sock:
+            sock.sendall(data)
+            return sock.makefile('rb').readline().decode('latin-1').strip()
+
+    def close(self):
+        self.run(self.server.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+@pytest.fixture
+def api(db_path):
+    api = Api(db_path)
+    yield api
+    api.close()
+
+NEW_EMPLOYEE = {'nama': 'Aldi Saputra', 'alamat': 'Jl. Merdeka, Jambi', 'posisi': 'Staf', 'tahun_masuk': 2020}
+
+def test_read_endpoints(api):
+    status, page = api.request('GET', '/pegawai?after=10&limit=5')
+    assert status == 200 and [item['id'] for item in page['items']] == [11, 12, 13, 14, 15]
+    status, row = api.request('GET', '/pegawai/1')
+    assert status == 200 and row['nama'] == SAMPLE_ROWS[0][0] and row['version'] == 1
+    status, found = api.request('GET', '/pegawai/search?q=Pegawai%20001')
+    assert status == 200 and [item['id'] for item in found['items']] == [1]
+    assert api.request('GET', '/stats')[0] == 200
+
+@pytest.mark.parametrize('method, path, status', [
+    ('GET', '/pegawai/9999', 404),
+    ('GET', '/tidak-ada', 404),
+    ('PUT', '/pegawai', 405),
+    ('GET', '/pegawai?limit=abc', 400),
+    ('GET', '/pegawai?limit=0', 400),
+    ('GET', '/pegawai/search', 400),
+    ('GET', '/pegawai/batch?ids=1,x', 400),
+    ('DELETE', '/pegawai/1?version=abc', 400),
+])
+def test_invalid_requests(api, method, path, status):
+    response_status, payload = api.request(method, path)
+    assert response_status == status and payload['error']
+
+def test_create_validates_and_rejects_duplicate_names(api):
+    status, created = api.request('POST', '/pegawai', NEW_EMPLOYEE)
+    assert status == 201 and created['version'] == 1
+
+    status, payload = api.request('POST', '/pegawai', dict(NEW_EMPLOYEE, nama='ALDI SAPUTRA'))
+    assert status == 409
+
+    status, payload = api.request('POST', '/pegawai', dict(NEW_EMPLOYEE, tahun_masuk='tahun lalu'))
+    assert status == 422 and payload['field'] == 'tahun_masuk'
+    assert api.request('POST', '/pegawai', b'{bukan json')[0] == 400
+    assert api.request('POST', '/pegawai', [NEW_EMPLOYEE])[0] == 400
+
+def test_patch_uses_compare_and_swap(api):
+    status, updated = api.request('PATCH', '/pegawai/1', {'posisi': 'Direktur', 'version': 1})
+    assert status == 200 and updated['version'] == 2
+
+    status, payload = api.request('PATCH', '/pegawai/1', {'posisi': 'Kasir', 'version': 1})
+    assert status == 409
+    assert payload['current']['posisi'] == 'Direktur' and payload['current']['version'] == 2
+
+    assert api.request('PATCH', '/pegawai/1', {'posisi': 'Kasir', 'version': 'abc'})[0] == 400
+    assert api.request('PATCH', '/pegawai/1', {'posisi': ''})[0] == 422
+    assert api.request('GET', '/pegawai/1')[1]['posisi'] == 'Direktur'
+
+def test_put_requires_full_record(api):
+    status, payload = api.request('PUT', '/pegawai/2', {'posisi': 'Kasir'})
+    assert status == 422 and payload['field'] == 'nama'
+
+    status, updated = api.request('PUT', '/pegawai/2', dict(NEW_EMPLOYEE, version=1))
+    assert status == 200 and updated['version'] == 2
+    row = api.request('GET', '/pegawai/2')[1]
+    assert {field: row[field] for field in NEW_EMPLOYEE} == NEW_EMPLOYEE
+
+def test_delete_with_version(api):
+    api.request('PATCH', '/pegawai/3', {'posisi': 'Kasir'})
+    assert api.request('DELETE', '/pegawai/3?version=1')[0] == 409
+    assert api.request('DELETE', '/pegawai/3?version=2') == (204, None)
+    assert api.request('DELETE', '/pegawai/3')[0] == 404
+
+def test_batch_endpoints(api):
+    status, payload = api.request('POST', '/pegawai/batch', {'items': [NEW_EMPLOYEE, {'nama': 'Tanpa Data'}]})
+    assert status == 422 and payload['items'][0]['index'] == 1
+    assert api.request('GET', '/pegawai/search?q=Aldi')[1]['items'] == []
+
+    api.request('PATCH', '/pegawai/5', {'alamat': 'Jl. Lain'})
+    status, payload = api.request('PATCH', '/pegawai/batch',
+                                  {'versions': {'4': 1, '5': 1}, 'fields': {'posisi': 'Kurir'}})
+    assert status == 200 and payload == {'updated': [4], 'conflicts': [5]}
+    assert api.request('PATCH', '/pegawai/batch', {'versions': {'4': 2}, 'fields': ['posisi']})[0] == 400
+    assert api.request('DELETE', '/pegawai/batch', {'versions': {'4': 'x'}})[0] == 400
+
+def test_oversized_request_head_is_answered(api):
+    header = b'X-Besar: ' + b'a' * 100000 + b'\r\n'
+    assert api.raw(b'GET /health HTTP/1.1\r\n' + header + b'\r\n').startswith('HTTP/1.1 431')
+    assert api.raw(b'GET /' + b'a' * 100000 + b' HTTP/1.1\r\n\r\n').startswith('HTTP/1.1 400')
+    assert api.raw(b'BUKAN-HTTP\r\n\r\n').startswith('HTTP/1.1 400')
+
+def test_connection_close_ends_the_socket(api):
+    with socket.create_connection((api.host, api.port), timeout=10) as sock:
+        sock.sendall(b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n')
+        data = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    # Server menutup koneksinya sendiri setelah respons (recv berakhir dengan EOF)
+    assert data.startswith(b'HTTP/1.1 200')
+
+def test_close_ends_idle_keep_alive_connections(db_path):
+    api = Api(db_path)
+    with socket.create_connection((api.host, api.port), timeout=10) as sock:
+        sock.sendall(b'GET /health HTTP/1.1\r\n\r\n')
+        assert sock.recv(65536).startswith(b'HTTP/1.1 200')
+        # Koneksi masih terbuka (keep-alive) saat server ditutup
+        api.close()
+        assert api.server._connections == set()
+        assert sock.recv(65536) == b''
+
+def test_close_releases_pooled_connections(db_path):
+    api = Api(db_path)
+    assert api.request('GET', '/pegawai/1')[0] == 200
+    repos = list(api.server._repos)
+    api.close()
+    assert repos and api.server._repos == []
+    for repo in repos:
+        with pytest.raises(sqlite3.ProgrammingError):
+            repo.conn.execute('SELECT 1')
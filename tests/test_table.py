@@ -0,0 +1,213 @@
+from array import array
+
+from EmployeeRepository import PegawaiIdList
+from ManagementTools import VirtualTable
+from conftest import SAMPLE_ROWS
+
+class FakeTree:
+    """Pengganti ttk.Treeview secukupnya untuk VirtualTable (test tidak butuh display)"""
+    def __init__(self, height=10):
+        self.height = height
+        self.items = {}
+        self.order = []
+        self.selected = []
+        self.focused = ''
+
+    def cget(self, option):
+        return self.height
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def get_children(self, item=''):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.items[iid] = tuple(values)
+        if index == 'end':
+            self.order.append(iid)
+        else:
+            self.order.insert(index, iid)
+        return iid
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.order.remove(iid)
+            del self.items[iid]
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def item(self, iid, values=None):
+        if values is not None:
+            self.items[iid] = tuple(values)
+        return {'values': self.items[iid]}
+
+    def selection(self):
+        return tuple(iid for iid in self.selected if iid in self.items)
+
+    def selection_set(self, items):
+        self.selected = list(items) if isinstance(items, (list, tuple)) else [items]
+
+    def focus(self, item=None):
+        if item is None:
+            return self.focused
+        self.focused = item
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def configure(self, **kwargs):
+        pass
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+class CountingIdList(PegawaiIdList):
+    """PegawaiIdList yang mencatat setiap fetch ke database"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetches = []
+
+    def fetch(self, offset, limit):
+        self.fetches.append((offset, limit))
+        return super().fetch(offset, limit)
+
+def make_table(source, height=10):
+    table = VirtualTable(FakeTree(height), FakeScrollbar(), overscan=5)
+    table.set_source(source)
+    return table
+
+def rendered_ids(table):
+    return [int(iid) for iid in table.tree.get_children()]
+
+def search_ids(repo, term):
+    return array('q', [row_id for batch in repo.iter_search_ids(term) for row_id in batch])
+
+def all_ids(repo, source=PegawaiIdList):
+    """Sumber berisi semua pegawai urut ID: 'Pegawai' cocok dengan setiap SAMPLE_ROWS"""
+    return source(repo, array('q', range(1, len(SAMPLE_ROWS) + 1)), 'Pegawai', use_fts=False)
+
+def test_only_visible_window_is_rendered(repo):
+    table = make_table(all_ids(repo))
+    assert table.total == len(SAMPLE_ROWS)
+    assert rendered_ids(table) == list(range(1, 11))
+    assert table.tree.items['1'] == (1,) + SAMPLE_ROWS[0]
+    assert table.scrollbar.position == (0.0, 10 / 250)
+
+def test_scrolling_moves_and_clamps_window(repo):
+    table = make_table(all_ids(repo))
+    table.scroll('moveto', '0.5')
+    assert rendered_ids(table) == list(range(126, 136))
+    table.scroll('scroll', '1', 'pages')
+    assert rendered_ids(table) == list(range(136, 146))
+    table.scroll('moveto', '1.0')
+    assert rendered_ids(table) == list(range(241, 251))
+    assert table.scrollbar.position == (240 / 250, 1.0)
+    table.scroll_to(-5)
+    assert rendered_ids(table) == list(range(1, 11))
+
+def test_window_is_fetched_again_only_outside_overscan(repo):
+    query = all_ids(repo, CountingIdList)
+    table = make_table(query)
+    assert query.fetches == [(0, 20)]
+    table.scroll_to(3)
+    assert query.fetches == [(0, 20)]
+    table.scroll_to(100)
+    assert query.fetches[-1] == (95, 20) and len(query.fetches) == 2
+
+def test_selection_survives_scrolling_out_of_window(repo):
+    table = make_table(all_ids(repo))
+    table.tree.selection_set(['3'])
+    table.on_select()
+    table.scroll_to(100)
+    assert table.selected_ids == {3} and table.tree.selection() == ()
+    # Seleksi baris di jendela lain tetap mengingat ID 3
+    table.tree.selection_set(['105'])
+    table.on_select()
+    table.scroll_to(0)
+    assert table.selected_ids == {3, 105} and table.tree.selection() == ('3',)
+
+def test_filtered_source_counts_matches(repo):
+    table = make_table(PegawaiIdList(repo, search_ids(repo, '01'), '01', use_fts=False))
+    assert table.total == 13  # 001, 010-019, 101, 201
+    assert rendered_ids(table)[:3] == [1, 10, 11]
+    table = make_table(PegawaiIdList(repo, array('q'), 'Tidak Ada', use_fts=False))
+    assert table.total == 0 and rendered_ids(table) == []
+    assert table.scrollbar.position == (0.0, 1.0)
+
+def test_row_changed_patches_visible_row_in_place(repo):
+    query = all_ids(repo, CountingIdList)
+    table = make_table(query)
+    was_listed = table.contains(3)
+    repo.update(3, SAMPLE_ROWS[2][0], 'Medan', 'Staf', 2000)
+    table.row_changed(3, was_listed)
+    assert table.tree.items['3'][2] == 'Medan'
+    assert rendered_ids(table) == list(range(1, 11))
+    assert len(query.fetches) == 1  # Jendela tidak diambil ulang
+
+def test_insert_and_delete_adjust_count_without_reload(repo):
+    table = make_table(all_ids(repo))
+    table.row_changed(repo.add('Pegawai Baru', 'Jambi', 'Staf', 2020))
+    assert table.total == 251
+
+    table.tree.selection_set(['1'])
+    table.on_select()
+    was_listed = table.contains(1)
+    repo.delete(1)
+    table.row_changed(1, was_listed)
+    assert table.total == 250 and table.selected_ids == set()
+    assert rendered_ids(table) == list(range(2, 12))
+
+def test_id_list_keeps_search_filter_after_writes(repo):
+    # 'Jl. Sudirman No. 1' hanya cocok dengan LIKE (kata kunci < 3 huruf tidak memakai FTS)
+    table = make_table(PegawaiIdList(repo, search_ids(repo, '01'), '01', use_fts=False))
+    assert rendered_ids(table) == [1, 10, 11, 12, 13, 14, 15, 16, 17, 18]
+
+    # Tidak cocok lagi: keluar dari daftar; tetap cocok: diganti di tempat
+    repo.update(10, 'Pindah', 'Jambi', 'Staf', 2000)
+    table.row_changed(10, was_listed=True)
+    repo.update(11, SAMPLE_ROWS[10][0], 'Medan', 'Staf', 2000)
+    table.row_changed(11, was_listed=True)
+    assert rendered_ids(table) == [1, 11, 12, 13, 14, 15, 16, 17, 18, 19]
+    assert table.tree.items['11'][2] == 'Medan'
+
+    # Baris baru yang cocok masuk sesuai urutan ID, yang tidak cocok diabaikan
+    repo.update(5, 'Pegawai 01 Lagi', 'Jambi', 'Staf', 2000)
+    table.row_changed(5, was_listed=False)
+    table.row_changed(repo.add('Lain', 'Jambi', 'Staf', 2020), was_listed=False)
+    assert list(table.source.ids[:3]) == [1, 5, 11] and table.total == 13
+
+def test_ranked_id_list_appends_new_matches(repo):
+    table = make_table(repo.search_source('Pegawai 24', search_ids(repo, 'Pegawai 24')))
+    assert not table.source.id_ordered and sorted(table.source.ids) == list(range(240, 250))
+
+    new_id = repo.add('Pegawai 24 Baru', 'Jambi', 'Staf', 2020)
+    table.row_changed(new_id)
+    assert table.source.ids[-1] == new_id
+    repo.delete(245)
+    table.row_changed(245, was_listed=True)
+    assert 245 not in table.source.ids and table.total == 10
+
+def test_rows_changed_applies_batch_with_one_render(repo, other):
+    table = make_table(repo.pager(40))
+    other.update(3, SAMPLE_ROWS[2][0], 'Medan', 'Staf', 2000)
+    other.delete(5)
+    row_ids = [3, 5, 200]
+    was_listed = {row_id for row_id in row_ids if table.has_row(row_id)}
+    assert was_listed == {3, 5}
+
+    table.rows_changed(row_ids, was_listed)
+    # Halaman dibaca ulang sekali: baris 5 keluar, baris 41 masuk di akhir halaman
+    assert table.source.rows[-1].id == 41 and not table.source.has_id(5)
+    assert rendered_ids(table) == [1, 2, 3, 4, 6, 7, 8, 9, 10, 11]
+    assert table.tree.items['3'][2] == 'Medan'
+
+def test_rows_changed_patches_id_list(repo, other):
+    table = make_table(PegawaiIdList(repo, search_ids(repo, '01'), '01', use_fts=False))
+    other.update(10, 'Pindah', 'Jambi', 'Staf', 2000)
+    other.update(5, 'Pegawai 01 Lagi', 'Jambi', 'Staf', 2000)
+    table.rows_changed([10, 5], {row_id for row_id in (10, 5) if table.has_row(row_id)})
+    assert rendered_ids(table) == [1, 5, 11, 12, 13, 14, 15, 16, 17, 18]
+    assert table.total == 13